@@ -0,0 +1,91 @@
+"""
+Benchmark of simulating worlds with many obstacles. Worlds are generated with a growing number of blocks, rocks that
+do not move, between bottles that do and lakes, around the robot of the large world. The robot drives in circles
+while all its sensors are read every frame, with the shapes indexed in bounding box trees and in a spatial hash.
+
+Usage, with ev3dev2simulator installed:
+
+    python benchmarks/bench_obstacles.py [number of frames]
+"""
+
+import random
+import sys
+import time
+
+from ev3dev2simulator.config.config import load_config, get_world_config, get_simulation_settings
+from ev3dev2simulator.state.world_simulator import WorldSimulator
+from ev3dev2simulator.state.world_state import WorldState
+
+BLOCKS = (0, 100, 500, 1000, 2000)
+
+
+def generate_world(blocks: int, seed: int = 0) -> dict:
+    """
+    Generate a world like the large world with the given number of blocks at random places, and a tenth as many
+    bottles and a twentieth as many lakes. The middle of the board, where the robot drives, is kept free.
+    :param blocks: the number of rocks that do not move.
+    :param seed: of the random places, the same seed gives the same world.
+    :return: the configuration of the world.
+    """
+    load_config('config_large')
+    config = dict(get_world_config())
+    width, height = config['board_width'], config['board_height']
+    rand = random.Random(seed)
+
+    def place(size: float) -> (float, float):
+        while True:
+            x, y = rand.uniform(size, width - size), rand.uniform(size, height - size)
+            if abs(x - width / 2) > 300 or abs(y - height / 2) > 300:
+                return x, y
+
+    obstacles = [{'type': 'border', 'color': [255, 255, 255], 'depth': 15, 'outer_spacing': 23}]
+    for _ in range(blocks):
+        x, y = place(20)
+        obstacles.append({'type': 'rock', 'x': x, 'y': y, 'width': 40, 'height': 40, 'color': [169, 169, 169],
+                          'angle': rand.uniform(0, 90), 'movable': False})
+    for _ in range(blocks // 10):
+        x, y = place(30)
+        obstacles.append({'type': 'bottle', 'x': x, 'y': y, 'radius': 30, 'color': [85, 107, 47]})
+    for _ in range(blocks // 20):
+        x, y = place(70)
+        obstacles.append({'type': 'lake', 'x': x, 'y': y, 'inner_radius': 38, 'border_width': 29,
+                          'color': [rand.randrange(256) for _ in range(3)], 'hole': rand.random() < 0.5})
+    config['obstacles'] = obstacles
+    for robot in config['robots']:
+        robot.update(center_x=width / 2, center_y=height / 2)
+    return config
+
+
+def measure(blocks: int, use_spatial_hash: bool, frames: int) -> (float, float):
+    """
+    Measure the time to set up a generated world with the given number of blocks and the mean time of a frame.
+    """
+    get_simulation_settings()['exec_settings']['use_spatial_hash'] = use_spatial_hash
+    world_state = WorldState(generate_world(blocks))
+    start = time.perf_counter()
+    world_state.setup_pymunk_shapes()
+    setup = time.perf_counter() - start
+    world_simulator = WorldSimulator(world_state)
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        for robot in world_state.robots:
+            robot.execute_movement(6, 4)
+        world_simulator.update()
+        for robot in world_state.robots:
+            robot.get_values()
+    return setup, (time.perf_counter() - start) / frames
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    print(f'{frames} frames per world')
+    for blocks in BLOCKS:
+        tree_setup, tree = measure(blocks, False, frames)
+        hash_setup, spatial_hash = measure(blocks, True, frames)
+        print(f'{blocks:>5} blocks {tree * 1e3:7.2f} ms per frame with trees {spatial_hash * 1e3:7.2f} ms with a '
+              f'spatial hash, set up in {tree_setup * 1e3:.0f} and {hash_setup * 1e3:.0f} ms')
+
+
+if __name__ == '__main__':
+    main()
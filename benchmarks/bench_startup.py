@@ -0,0 +1,85 @@
+"""
+Benchmark of the startup of a robot program. A headless simulator runs in this process, while a client process is
+started for every run, like a robot program. The client measures the time spent importing the ev3dev2 API and the
+time until its first sensor read is answered, both counted from the moment the process was started.
+
+Usage, with ev3dev2simulator installed:
+
+    python benchmarks/bench_startup.py [number of runs]
+"""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from ev3dev2simulator.config.config import load_config, get_world_config
+from ev3dev2simulator.connection.client_socket import PORT_ENVIRONMENT_VARIABLE
+from ev3dev2simulator.connection.server_sockets import ServerSockets
+from ev3dev2simulator.headless_runner import HeadlessRunner
+from ev3dev2simulator.state.world_simulator import WorldSimulator
+from ev3dev2simulator.state.world_state import WorldState
+
+
+def start_simulator() -> ServerSockets:
+    """
+    Simulate the small world and listen for its single brick. The world is reset after every run, as it is by
+    the simulator, so the simulation has to run.
+    """
+    load_config('config_small')
+    world_state = WorldState(get_world_config())
+    world_simulator = WorldSimulator(world_state)
+    runner = HeadlessRunner(world_simulator, world_state)
+    runner.setup()
+    threading.Thread(target=runner.run, daemon=True).start()
+
+    server = ServerSockets(world_simulator, port=0)
+    server.resume_timeout = 0
+    server.daemon = True
+    server.start()
+    server.is_listening.wait()
+    return server
+
+
+def measure(start: float):
+    """
+    Import the API and read a sensor, printing the seconds both took since the process was started.
+    """
+    # pylint: disable=import-outside-toplevel
+    from ev3dev2._platform.ev3 import INPUT_2
+    from ev3dev2.sensor.lego import ColorSensor
+    imported = time.time()
+
+    ColorSensor(INPUT_2).reflected_light_intensity
+    answered = time.time()
+    print(f'{imported - start} {answered - start}')
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    server = start_simulator()
+
+    env = dict(os.environ)
+    env[PORT_ENVIRONMENT_VARIABLE] = str(server.port)
+    imports, answers = [], []
+    for _ in range(runs):
+        # wait until the simulator accepts a connection again
+        while any(sock.is_connected for sock in server.brick_sockets.values()):
+            time.sleep(0.01)
+        output = subprocess.run([sys.executable, __file__, '--client', str(time.time())], env=env, check=True,
+                                stdout=subprocess.PIPE, universal_newlines=True).stdout
+        imported, answered = map(float, output.split()[-2:])
+        imports.append(imported)
+        answers.append(answered)
+
+    print(f'{runs} runs')
+    print(f'{"import":<15} {sum(imports) / runs * 1e3:8.1f} ms')
+    print(f'{"first read":<15} {sum(answers) / runs * 1e3:8.1f} ms')
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--client']:
+        measure(float(sys.argv[2]))
+    else:
+        main()
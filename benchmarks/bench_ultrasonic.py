@@ -0,0 +1,91 @@
+"""
+Benchmark of the ultrasonic sensor. The front ultrasonic sensor of the robot of the large world measures the distance
+to the obstacles around it with a cone of 20 degrees and a growing number of rays per eye, turning a little between
+measurements so it sees different obstacles.
+
+Usage, with ev3dev2simulator installed:
+
+    python benchmarks/bench_ultrasonic.py [number of measurements]
+"""
+
+import math
+import random
+import sys
+import time
+
+import pymunk
+
+from ev3dev2simulator.config.config import load_config, get_world_config
+from ev3dev2simulator.robotpart.ultrasonic_sensor_top import UltrasonicSensor
+from ev3dev2simulator.state.world_state import WorldState
+
+RAYS = (1, 2, 4, 8, 16, 32, 64)
+ROCKS = (0, 100, 1000, 5000)
+
+
+def measure(sensor: UltrasonicSensor, rays: int, measurements: int) -> float:
+    """
+    Measure the mean time of a measurement of the sensor with the given number of rays per eye.
+    """
+    sensor.cone_angle = 20 if rays > 1 else 0
+    sensor.rays = rays
+    body = sensor.shape.body
+    space = sensor.shape.space
+
+    start = time.perf_counter()
+    for measurement in range(measurements):
+        body.angle = 2 * math.pi * measurement / measurements
+        sensor.distance(space)
+    return (time.perf_counter() - start) / measurements
+
+
+def add_rocks(world_state: WorldState, sensor: UltrasonicSensor, rocks: int) -> list:
+    """
+    Add rocks that do not move at random places on the board, but not on the robot, and return their shapes.
+    """
+    rand = random.Random(rocks)
+    shapes = []
+    while len(shapes) < rocks:
+        position = (rand.uniform(0, world_state.board_width), rand.uniform(0, world_state.board_height))
+        if sensor.shape.body.position.get_distance(position) < 250:
+            continue
+        body = pymunk.Body(body_type=pymunk.Body.KINEMATIC)
+        body.position = position
+        shape = pymunk.Poly.create_box(body, (20, 20))
+        world_state.space.add(body, shape)
+        shapes.append(shape)
+    return shapes
+
+
+def main():
+    measurements = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    load_config('config_large')
+    world_state = WorldState(get_world_config())
+    world_state.setup_pymunk_shapes()
+    robot = world_state.robots[0]
+    sensor = next(sensor for sensor in robot.get_sensors() if isinstance(sensor, UltrasonicSensor))
+
+    print(f'{measurements} measurements per number of rays')
+    for rays in RAYS:
+        duration = measure(sensor, rays, measurements)
+        print(f'{rays:>3} rays per eye {duration * 1e6:8.1f} us per sensor {duration * 1e6 / (2 * rays):6.1f} us per ray')
+
+    static_shapes = list(world_state.distance_field.shapes)
+    for rocks in ROCKS:
+        shapes = add_rocks(world_state, sensor, rocks)
+        world_state.distance_field.shapes = static_shapes + shapes
+        world_state.distance_field.invalidate()
+        start = time.perf_counter()
+        sensor.distance(world_state.space)
+        calculation = time.perf_counter() - start
+        field = measure(sensor, 1, measurements)
+        sensor.set_distance_field(None)
+        shapes_only = measure(sensor, 1, measurements)
+        sensor.set_distance_field(world_state.distance_field)
+        world_state.space.remove(*shapes, *(shape.body for shape in shapes))
+        print(f'{rocks:>5} rocks {field * 1e6:8.1f} us with distance field {shapes_only * 1e6:8.1f} us without, '
+              f'field calculated in {calculation * 1e3:.0f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark of the wire protocols between the ev3dev2 API and the simulator. A headless simulator listens on a free
+port in this process, while a client process connects to it once per protocol and measures the round-trip latency
+of a single thread and the throughput of several threads sharing the connection.
+
+Usage, with ev3dev2simulator installed:
+
+    python benchmarks/bench_wire_protocol.py [number of round trips] [number of threads]
+"""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from ev3dev2simulator.config.config import load_config, get_world_config
+from ev3dev2simulator.connection.client_socket import ClientSocket, PORT_ENVIRONMENT_VARIABLE
+from ev3dev2simulator.connection.message.data_request import DataRequest
+from ev3dev2simulator.connection.message.rotate_command import RotateCommand
+from ev3dev2simulator.connection.message.snapshot_request import SnapshotRequest
+from ev3dev2simulator.connection.server_sockets import ServerSockets
+from ev3dev2simulator.state.world_simulator import WorldSimulator
+from ev3dev2simulator.state.world_state import WorldState
+
+
+def start_simulator() -> ServerSockets:
+    """
+    Start listening for the single brick of the small world without simulating any frames,
+    so only the connection is measured.
+    """
+    load_config('config_small')
+    world_state = WorldState(get_world_config())
+    world_simulator = WorldSimulator(world_state)
+    server = ServerSockets(world_simulator, port=0)
+    server.daemon = True
+    server.start()
+    server.is_listening.wait()
+    return server
+
+
+def measure(protocol: str, round_trips: int, threads: int, sensor_address: str, motor_address: str):
+    """
+    Connect with the given protocol and measure the mean round-trip time of sensor reads, motor commands and,
+    when supported, snapshots of all sensors, followed by the time per sensor read when several threads read
+    at the same time.
+    """
+    connection = ClientSocket(protocols=(protocol,))
+    assert connection.protocol.name == protocol
+
+    commands = [('DataRequest', DataRequest(sensor_address)),
+                ('RotateCommand', RotateCommand(motor_address, 500.0, 1000.0, 'hold'))]
+    if connection.protocol.framed:
+        # the values of all sensors in a single response
+        commands.append(('SnapshotRequest', SnapshotRequest()))
+    for name, command in commands:
+        start = time.perf_counter()
+        for _ in range(round_trips):
+            connection.send_command(command, True)
+        print_result(protocol, name, (time.perf_counter() - start) / round_trips)
+
+    def read_sensor():
+        for _ in range(round_trips // threads):
+            connection.send_command(DataRequest(sensor_address), True)
+
+    workers = [threading.Thread(target=read_sensor) for _ in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    print_result(protocol, f'{threads} threads', (time.perf_counter() - start) / (round_trips // threads * threads))
+    connection.close()
+
+
+def print_result(protocol: str, name: str, latency: float):
+    print(f'{protocol:>6} {name:<15} {latency * 1e6:8.1f} us')
+
+
+def main():
+    round_trips = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    server = start_simulator()
+
+    robot = server.world_simulator.robot_simulators[0].robot
+    sensor_address = next(address for (_, address) in robot.get_values())
+    motor_address = next(actuator.address for actuator in robot.get_actuators() if actuator.ev3type == 'motor')
+
+    print(f'{round_trips} round trips per measurement')
+    env = dict(os.environ)
+    env[PORT_ENVIRONMENT_VARIABLE] = str(server.port)
+    for protocol in ('json', 'binary'):
+        # the client runs in its own process, like a robot program
+        subprocess.run([sys.executable, __file__, '--client', protocol, str(round_trips), str(threads),
+                        sensor_address, motor_address], env=env, check=True)
+        # wait until the simulator accepts a connection again
+        while any(sock.is_connected for sock in server.brick_sockets.values()):
+            time.sleep(0.1)
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--client']:
+        measure(sys.argv[2], int(sys.argv[3]), int(sys.argv[4]), sys.argv[5], sys.argv[6])
+    else:
+        main()
@@ -24,13 +24,15 @@
 # -----------------------------------------------------------------------------
 import _thread
 from collections import OrderedDict
-from time import sleep
 
 from ev3dev2 import Device
 from ev3dev2._platform.ev3 import LEDS, LED_GROUPS, LED_COLORS, LED_DEFAULT_COLOR
+from ev3dev2simulator.connector.clock_connector import get_clock_connector
 from ev3dev2simulator.connector.led_connector import LedConnector
 from ev3dev2.stopwatch import StopWatch
 
+clock = get_clock_connector()
+
 
 class Led(Device):
     """
@@ -356,7 +358,7 @@ class Leds(object):
                     break
 
                 even = not even
-                sleep(sleeptime)
+                clock.sleep(sleeptime)
 
             self.animate_thread_stop = False
             self.animate_thread_id = None
@@ -403,7 +405,7 @@ class Leds(object):
                     break
 
                 even = not even
-                sleep(sleeptime)
+                clock.sleep(sleeptime)
 
             self.animate_thread_stop = False
             self.animate_thread_id = None
@@ -453,7 +455,7 @@ class Leds(object):
                 if self.animate_thread_stop or stopwatch.value_ms >= duration_ms:
                     break
 
-                sleep(sleeptime)
+                clock.sleep(sleeptime)
 
             self.animate_thread_stop = False
             self.animate_thread_id = None
@@ -532,7 +534,7 @@ class Leds(object):
                 if self.animate_thread_stop or stopwatch.value_ms >= duration_ms:
                     break
 
-                sleep(sleeptime)
+                clock.sleep(sleeptime)
 
             self.animate_thread_stop = False
             self.animate_thread_id = None
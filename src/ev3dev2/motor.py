@@ -21,11 +21,11 @@
 # -----------------------------------------------------------------------------
 import _thread
 import sys
-import time
 import math
 from collections import OrderedDict
 
 from ev3dev2 import Device
+from ev3dev2simulator.connector.clock_connector import get_clock_connector
 from ev3dev2simulator.connector.motor_connector import MotorConnector
 
 if sys.version_info < (3, 4):
@@ -37,6 +37,9 @@ from ev3dev2._platform.ev3 import OUTPUT_A, OUTPUT_B, OUTPUT_C, OUTPUT_D
 
 log = getLogger(__name__)
 
+# the simulator clock replaces time.time() and time.sleep(), so programs can run faster than real time
+clock = get_clock_connector()
+
 # The number of milliseconds we wait for the state of a motor to
 # update to 'running' in the "on_for_XYZ" methods of the Motor class
 WAIT_RUNNING_TIMEOUT = 100
@@ -411,7 +414,7 @@ class Motor(Device):
         self.max_dpm = self.max_rpm * 360
 
         self.connector = MotorConnector(self.address, self.max_speed)
-        self.running_until = time.time()
+        self.running_until = clock.time()
 
 
     @property
@@ -753,7 +756,7 @@ class Motor(Device):
         `running`, `ramping`, `holding`, `overloaded` and `stalled`.
         """
 
-        if time.time() < self.running_until:
+        if clock.time() < self.running_until:
             return Motor.STATE_RUNNING
         else:
             return Motor.STATE_HOLDING
@@ -820,7 +823,7 @@ class Motor(Device):
         self.command = self.COMMAND_RUN_FOREVER
 
         run_time = self.connector.run_forever()
-        self.running_until = time.time() + run_time
+        self.running_until = clock.time() + run_time
 
 
     def run_to_abs_pos(self):
@@ -832,7 +835,7 @@ class Motor(Device):
         self._command = self.COMMAND_RUN_TO_ABS_POS
 
         run_time = self.connector.run_to_rel_pos()
-        self.running_until = time.time() + run_time
+        self.running_until = clock.time() + run_time
 
 
     def run_to_rel_pos(self):
@@ -846,7 +849,7 @@ class Motor(Device):
         self.command = self.COMMAND_RUN_TO_REL_POS
 
         run_time = self.connector.run_to_rel_pos()
-        self.running_until = time.time() + run_time
+        self.running_until = clock.time() + run_time
 
 
     def run_timed(self):
@@ -858,7 +861,7 @@ class Motor(Device):
         self.command = self.COMMAND_RUN_TIMED
 
         run_time = self.connector.run_timed()
-        self.running_until = time.time() + run_time
+        self.running_until = clock.time() + run_time
 
 
     def run_direct(self):
@@ -871,7 +874,7 @@ class Motor(Device):
         self.command = self.COMMAND_RUN_DIRECT
 
         run_time = self.connector.run_direct()
-        self.running_until = time.time() + run_time
+        self.running_until = clock.time() + run_time
 
 
     def stop(self):
@@ -883,7 +886,7 @@ class Motor(Device):
         self.command = self.COMMAND_STOP
 
         run_time = self.connector.stop()
-        self.running_until = time.time() + run_time
+        self.running_until = clock.time() + run_time
 
 
     def reset(self):
@@ -895,7 +898,7 @@ class Motor(Device):
         self.command = self.COMMAND_RESET
 
         run_time = self.connector.stop()
-        self.running_until = time.time() + run_time
+        self.running_until = clock.time() + run_time
 
 
     @property
@@ -904,7 +907,7 @@ class Motor(Device):
         Power is being sent to the motor.
         """
 
-        return time.time() < self.running_until
+        return clock.time() < self.running_until
 
 
     @property
@@ -921,7 +924,7 @@ class Motor(Device):
         The motor is not turning, but rather attempting to hold a fixed position.
         """
 
-        return time.time() > self.running_until
+        return clock.time() > self.running_until
 
 
     @property
@@ -949,7 +952,7 @@ class Motor(Device):
         is reached.
         """
 
-        start = time.time()
+        start = clock.time()
 
         if timeout:
             sleep_time = min(timeout, 0.1)
@@ -957,14 +960,18 @@ class Motor(Device):
             sleep_time = 0.1
 
         while True:
-            now = time.time()
+            now = clock.time()
 
             if cond(now):
                 return True
 
-            time.sleep(sleep_time)
+            # do not oversleep the end of the current run, so waiting ends at the frame the motor stops
+            if self.running_until is not None and now < self.running_until:
+                clock.sleep(min(sleep_time, self.running_until - now))
+            else:
+                clock.sleep(sleep_time)
 
-            if timeout is not None and time.time() >= start + timeout / 1000:
+            if timeout is not None and clock.time() >= start + timeout / 1000:
                 # Final check when user timeout is reached
                 return cond(now)
 
@@ -981,7 +988,7 @@ class Motor(Device):
             m.wait_until_not_moving()
         """
 
-        l = lambda now: True if self.running_until is None else self.running_until < now
+        l = lambda now: True if self.running_until is None else self.running_until <= now
         return self.wait(l, timeout)
 
 
@@ -1011,7 +1018,7 @@ class Motor(Device):
             m.wait_while('running')
         """
 
-        l = lambda now: True if self.running_until is None else self.running_until < now
+        l = lambda now: True if self.running_until is None else self.running_until <= now
         return self.wait(l, timeout)
 
 
@@ -1679,7 +1686,7 @@ class MoveTank(MotorSet):
                 off_line_count = 0
 
             if sleep_time:
-                time.sleep(sleep_time)
+                clock.sleep(sleep_time)
 
             self.on(left_speed, right_speed)
 
@@ -1996,7 +2003,7 @@ class MoveDifferential(MoveTank):
                 # Have we moved?
                 if not left_ticks and not right_ticks:
                     if sleep_time:
-                        time.sleep(sleep_time)
+                        clock.sleep(sleep_time)
                     continue
 
                 # log.debug("%s: left_ticks %s (from %s to %s)" %
@@ -2030,7 +2037,7 @@ class MoveDifferential(MoveTank):
                 self.y_pos_mm += mm * math.sin(self.theta)
 
                 if sleep_time:
-                    time.sleep(sleep_time)
+                    clock.sleep(sleep_time)
 
             self.odometry_thread_id = None
 
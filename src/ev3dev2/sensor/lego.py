@@ -22,13 +22,14 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 # -----------------------------------------------------------------------------
-import time
-
 from ev3dev2.button import ButtonBase
 from ev3dev2.sensor import Sensor
+from ev3dev2simulator.connector.clock_connector import get_clock_connector
 from ev3dev2simulator.connector.sensor_connector import SensorConnector
 from ev3dev2simulator.util.util import get_cm_multiplier, get_inch_multiplier
 
+clock = get_clock_connector()
+
 
 class TouchSensor(Sensor):
     """
@@ -66,7 +67,7 @@ class TouchSensor(Sensor):
 
 
     def _wait(self, wait_for_press, timeout_ms, sleep_ms):
-        tic = time.time()
+        tic = clock.time()
 
         if sleep_ms:
             sleep_ms = float(sleep_ms / 1000)
@@ -78,11 +79,11 @@ class TouchSensor(Sensor):
             if self.is_pressed == wait_for_press:
                 return True
 
-            if timeout_ms is not None and time.time() >= tic + timeout_ms / 1000:
+            if timeout_ms is not None and clock.time() >= tic + timeout_ms / 1000:
                 return False
 
             if sleep_ms:
-                time.sleep(sleep_ms)
+                clock.sleep(sleep_ms)
 
 
     def wait_for_pressed(self, timeout_ms=None, sleep_ms=10):
@@ -106,14 +107,28 @@ class TouchSensor(Sensor):
         Wait for the touch sensor to be pressed down and then released.
         Both actions must happen within timeout_ms.
         """
-        start_time = time.time()
+        tic = clock.time()
+
+        if sleep_ms:
+            sleep_ms = float(sleep_ms / 1000)
 
-        if self.wait_for_pressed(timeout_ms, sleep_ms):
-            if timeout_ms is not None:
-                timeout_ms -= int((time.time() - start_time) * 1000)
-            return self.wait_for_released(timeout_ms, sleep_ms)
+        # the simulator keeps the presses and releases, so a bump between two checks is not missed
+        self._ensure_mode(self.MODE_TOUCH)
+        response = self.connector.get_events(-1)
+        is_pressed = bool(response['events']) and response['events'][-1][1]
+        while True:
+            response = self.connector.get_events(response['frame'])
+            for _, is_event_press in response['events']:
+                if is_event_press:
+                    is_pressed = True
+                elif is_pressed:
+                    return True
+
+            if timeout_ms is not None and clock.time() >= tic + timeout_ms / 1000:
+                return False
 
-        return False
+            if sleep_ms:
+                clock.sleep(sleep_ms)
 
 
     def value(self, n=0):
@@ -263,7 +278,8 @@ class ColorSensor(Sensor):
         values in the 250-400 range.
         """
         self._ensure_mode(self.MODE_RGB_RAW)
-        return self.value(0), self.value(1), self.value(2)
+        # a single request, so the components belong to the same color
+        return tuple(self.connector.get_mode_values(self.MODE_RGB_RAW))
 
 
     def calibrate_white(self):
@@ -458,24 +474,11 @@ class ColorSensor(Sensor):
         an error. The values are fixed point numbers, so check decimals to see
         if you need to divide to get the actual value.
         """
-        color_to_rgb = [
-            (0, 0, 0),  # 0: No color
-            (0, 0, 0),  # 1: Black
-            (0, 0, 255),  # 2: Blue
-            (0, 255, 0),  # 3: Green
-            (255, 255, 0),  # 4: Yellow
-            (255, 0, 0),  # 5: Red
-            (255, 255, 255),  # 6: White
-            (165, 42, 42)  # 7: Brown
-        ]
-
         if self.mode == self.MODE_COL_COLOR:
             return self.connector.get_value()
-        elif self.mode == self.MODE_RGB_RAW:
-            return color_to_rgb[self.connector.get_value()][n]
-        elif self.mode == self.MODE_COL_REFLECT:
-            total_light = sum(color_to_rgb[self.connector.get_value()])
-            return total_light / (255 * 3) * 100  # percentage of light
+        elif self.mode in (self.MODE_RGB_RAW, self.MODE_COL_REFLECT):
+            # the simulator senses the color of the world below the sensor
+            return self.connector.get_mode_values(self.mode)[n]
 
         else:
             print(f'Mode {self.mode} not supported')
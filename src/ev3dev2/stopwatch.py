@@ -7,14 +7,15 @@ from ev3dev2 import is_micropython
 if is_micropython():
     import utime
 else:
-    import datetime as dt
+    from ev3dev2simulator.connector.clock_connector import get_clock_connector
 
 
 def get_ticks_ms():
     if is_micropython():
         return utime.ticks_ms()
     else:
-        return int(dt.datetime.timestamp(dt.datetime.now()) * 1000)
+        # the simulator clock, which is the wall clock unless the simulator runs with a virtual clock
+        return int(get_clock_connector().time() * 1000)
 
 
 class StopWatch(object):
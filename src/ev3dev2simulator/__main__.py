@@ -2,6 +2,8 @@
 Main file of the ev3dev2simulator. Used when the ev3dev2simulator module is run.
 The main goal of the main function is to change the working directory to the simulator source code directory.
 This helps with loading all the assets used in visualisation.
+
+Run with --headless to simulate without a window: then arcade/pyglet are never imported and no display is needed.
 """
 
 import sys
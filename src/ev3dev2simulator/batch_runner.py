@@ -0,0 +1,324 @@
+"""
+The batch_runner module runs many robot programs against many worlds in parallel, for example to grade the programs
+of a whole class at once. Every run gets its own headless simulator in a separate worker process, listening on its own
+port, so all cores of the machine can be used.
+
+Usage from the command line:
+
+    python -m ev3dev2simulator.batch_runner -p student1.py student2.py -w config_small config_large -o report.json
+
+or from Python:
+
+    results = run_batch(['student1.py', 'student2.py'], ['config_small', 'config_large'])
+    write_report(results, 'report.json')
+"""
+
+import argparse
+import contextlib
+import functools
+import io
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass, field, asdict
+from typing import List, Optional, Tuple
+
+from ev3dev2simulator.config.config import load_config, get_world_config
+from ev3dev2simulator.connection.client_socket import PORT_ENVIRONMENT_VARIABLE
+from ev3dev2simulator.connection.server_sockets import ServerSockets
+from ev3dev2simulator.headless_runner import HeadlessRunner
+from ev3dev2simulator.state.world_simulator import WorldSimulator
+from ev3dev2simulator.state.world_state import WorldState
+
+PACKAGES_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_TIMEOUT = 120
+DEFAULT_MAX_SIM_TIME = 300
+DEFAULT_TRACE_PERIOD = 0.1
+
+
+@dataclass
+class RobotResult:
+    """
+    The state of a robot at the end of a run.
+    """
+    name: str
+    x: float
+    y: float
+    angle: float
+    fallen_at: Optional[float]
+
+
+@dataclass
+class RunResult:
+    """
+    The result of running a single program in a single world. Times are in simulated seconds, except for wall_time.
+    """
+    program: str
+    world: str
+    exit_status: Optional[int] = None
+    timed_out: bool = False
+    wall_time: float = 0
+    sim_time: float = 0
+    robots: List[RobotResult] = field(default_factory=list)
+    collisions: List[dict] = field(default_factory=list)
+    sensor_traces: dict = field(default_factory=dict)
+    stdout: str = ''
+    stderr: str = ''
+    error: Optional[str] = None
+
+
+class RunRecorder:
+    """
+    Records the collisions, falls and sensor values of the robots during a run.
+    """
+
+    def __init__(self, world_simulator: WorldSimulator, trace_period: float):
+        self.world_simulator = world_simulator
+        self.clock = world_simulator.clock
+        self.trace_interval = max(1, int(round(trace_period / self.clock.frame_time)))
+        self.last_frame = None
+
+        world_state = world_simulator.world_state
+        self.robots = world_state.robots
+        self.robot_names = {robot.body: robot.name for robot in self.robots}
+        self.obstacle_names = {obstacle.body: type(obstacle).__name__.lower() for obstacle in world_state.obstacles}
+
+        self.collisions = []
+        self.fallen_at = {robot.name: None for robot in self.robots}
+        self.sensor_traces = {robot.name: {} for robot in self.robots}
+
+        # the touch sensors of the robots collide through their own handlers instead of the default one
+        for handler in [world_state.space.add_default_collision_handler()] + world_state.touch_handlers:
+            handler.begin = functools.partial(self._on_collision, handler.begin)
+
+    def _on_collision(self, begin, arbiter, space, data) -> bool:
+        """
+        Record the start of a collision between a robot and an obstacle or another robot, before calling the begin
+        callback the handler of the collision had before.
+        :param begin: callback of the handler that was replaced, or None if it had none.
+        :return: the result of that callback, whether the collision should be processed.
+        """
+        body_a, body_b = (shape.body for shape in arbiter.shapes)
+        for robot_body, other_body in ((body_a, body_b), (body_b, body_a)):
+            if robot_body in self.robot_names:
+                other = self.robot_names.get(other_body) or self.obstacle_names.get(other_body, 'unknown')
+                self.collisions.append({'time': self.clock.get_time(),
+                                        'robot': self.robot_names[robot_body],
+                                        'other': other})
+                break
+        return begin(arbiter, space, data) if begin is not None else True
+
+    def record(self):
+        """
+        Record the state of the robots, once for every simulated frame.
+        """
+        if self.clock.frame == self.last_frame:
+            return
+        self.last_frame = self.clock.frame
+        now = self.clock.get_time()
+
+        for robot in self.robots:
+            if self.fallen_at[robot.name] is None and robot.is_falling():
+                self.fallen_at[robot.name] = now
+
+            if self.clock.frame % self.trace_interval == 0:
+                traces = self.sensor_traces[robot.name]
+                for (brick, address), value in robot.get_values().items():
+                    traces.setdefault(f'{brick}:{address}', []).append((now, value))
+
+    def get_robot_results(self) -> List[RobotResult]:
+        """
+        Get the final pose of all robots, in millimeters and degrees.
+        """
+        return [RobotResult(robot.name,
+                            robot.body.position.x,
+                            robot.body.position.y,
+                            math.degrees(robot.body.angle),
+                            self.fallen_at[robot.name])
+                for robot in self.robots]
+
+
+def _config_location(world: str) -> Tuple[str, str]:
+    """
+    Split a world configuration in the name and directory used by load_config.
+    Names of the worlds shipped with the simulator are used as is.
+    """
+    path = os.path.abspath(world)
+    if os.path.isfile(path):
+        return os.path.basename(path), os.path.dirname(path)
+    return world, os.getcwd()
+
+
+def simulate(program: str, world: str, timeout: float = DEFAULT_TIMEOUT, max_sim_time: float = DEFAULT_MAX_SIM_TIME,
+             trace_period: float = DEFAULT_TRACE_PERIOD) -> RunResult:
+    """
+    Run the given program in the given world with a headless simulator in lock-step turbo mode.
+    The simulator listens on a free port, which is passed to the program.
+    :param program: path of the robot program.
+    :param world: name or path of the world configuration.
+    :param timeout: maximum number of seconds of wall time the run may take.
+    :param max_sim_time: maximum number of seconds of simulated time the run may take.
+    :param trace_period: number of simulated seconds between samples of the sensor values.
+    :return: the result of the run.
+    """
+    result = RunResult(program, world)
+    # the simulator prints instructions to connect bricks, which are of no use here
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            load_config(*_config_location(world))
+            world_state = WorldState(get_world_config())
+            world_simulator = WorldSimulator(world_state)
+            world_simulator.enable_lock_step()
+
+            runner = HeadlessRunner(world_simulator, world_state, turbo=True)
+            runner.setup()
+            recorder = RunRecorder(world_simulator, trace_period)
+
+            server = ServerSockets(world_simulator, port=0)
+            server.daemon = True
+            server.start()
+            server.is_listening.wait()
+        except Exception as error:  # pylint: disable=broad-except
+            result.error = f'{type(error).__name__}: {error}'
+            return result
+
+        def update():
+            recorder.record()
+            if world_simulator.clock.get_time() >= max_sim_time:
+                runner.stop()
+
+        env = dict(os.environ)
+        env[PORT_ENVIRONMENT_VARIABLE] = str(server.port)
+        # let the program use the ev3dev2 API next to this simulator, also when it is not installed
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [PACKAGES_DIR, env.get('PYTHONPATH')]))
+        start = time.perf_counter()
+        process = subprocess.Popen([sys.executable, os.path.abspath(program)],
+                                   cwd=os.path.dirname(os.path.abspath(program)), env=env,
+                                   stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+
+        simulation = threading.Thread(target=runner.run, kwargs={'on_update': update})
+        simulation.start()
+        try:
+            deadline = start + timeout
+            while True:
+                # the output is read while waiting, so a program printing a lot does not block on a full pipe
+                try:
+                    result.stdout, result.stderr = process.communicate(timeout=0.01)
+                    break
+                except subprocess.TimeoutExpired:
+                    if not runner.is_running or time.perf_counter() >= deadline:
+                        result.timed_out = True
+                        process.kill()
+                        result.stdout, result.stderr = process.communicate()
+                        break
+            result.exit_status = process.returncode
+        finally:
+            result.wall_time = time.perf_counter() - start
+            runner.stop()
+            simulation.join()
+
+    result.sim_time = world_simulator.clock.get_time()
+    result.robots = recorder.get_robot_results()
+    result.collisions = recorder.collisions
+    result.sensor_traces = recorder.sensor_traces
+    return result
+
+
+def _simulate_run(args) -> RunResult:
+    """
+    Run a single simulation in a worker process.
+    """
+    return simulate(*args)
+
+
+def run_batch(programs: List[str], worlds: List[str], processes: int = None, timeout: float = DEFAULT_TIMEOUT,
+              max_sim_time: float = DEFAULT_MAX_SIM_TIME,
+              trace_period: float = DEFAULT_TRACE_PERIOD) -> List[RunResult]:
+    """
+    Run every program in every world, using a pool of worker processes.
+    Every run gets a fresh worker process, so the runs are fully independent.
+    :param programs: paths of the robot programs.
+    :param worlds: names or paths of the world configurations.
+    :param processes: number of runs in parallel, defaults to the number of cores.
+    :param timeout: maximum number of seconds of wall time a single run may take.
+    :param max_sim_time: maximum number of seconds of simulated time a single run may take.
+    :param trace_period: number of simulated seconds between samples of the sensor values.
+    :return: the results of all runs, ordered by program and then by world.
+    """
+    runs = [(program, world, timeout, max_sim_time, trace_period)
+            for program, world in itertools.product(programs, worlds)]
+    with multiprocessing.Pool(processes or os.cpu_count(), maxtasksperchild=1) as pool:
+        return pool.map(_simulate_run, runs, chunksize=1)
+
+
+def write_report(results: List[RunResult], file_name: str):
+    """
+    Write the results of a batch run to a JSON file.
+    :param results: to write.
+    :param file_name: of the report.
+    """
+    with open(file_name, 'w') as report:
+        json.dump([asdict(result) for result in results], report, indent=2)
+
+
+def parse_args(args):
+    """
+    Parses the arguments given to the batch runner.
+    :param args: list of parameters given to program
+    :return: list of parsed values based on parameters
+    """
+    parser = argparse.ArgumentParser(description='Run robot programs in many worlds in parallel')
+    parser.add_argument("-p", "--programs",
+                        nargs='+',
+                        required=True,
+                        help="Paths of the robot programs to run")
+    parser.add_argument("-w", "--worlds",
+                        nargs='+',
+                        default=['config_small'],
+                        help="Names or paths of the world configurations. Defaults to config_small")
+    parser.add_argument("-j", "--jobs",
+                        type=int,
+                        default=None,
+                        help="Number of runs in parallel. Defaults to the number of cores")
+    parser.add_argument("--timeout",
+                        type=float,
+                        default=DEFAULT_TIMEOUT,
+                        help="Maximum wall time of a run in seconds")
+    parser.add_argument("--max-sim-time",
+                        type=float,
+                        default=DEFAULT_MAX_SIM_TIME,
+                        help="Maximum simulated time of a run in seconds")
+    parser.add_argument("--trace-period",
+                        type=float,
+                        default=DEFAULT_TRACE_PERIOD,
+                        help="Simulated seconds between samples of the sensor values")
+    parser.add_argument("-o", "--output",
+                        default='report.json',
+                        help="File to write the report to. Defaults to report.json")
+    return parser.parse_args(args)
+
+
+def main():
+    """
+    Run the batch given by the command line arguments and write the report.
+    """
+    args = parse_args(sys.argv[1:])
+    results = run_batch(args.programs, args.worlds, args.jobs, args.timeout, args.max_sim_time, args.trace_period)
+    write_report(results, args.output)
+
+    for result in results:
+        status = 'timeout' if result.timed_out else (result.error or f'exit {result.exit_status}')
+        print(f'{result.program} in {result.world}: {status}, '
+              f'{result.sim_time:.1f} s simulated in {result.wall_time:.1f} s')
+    print(f'Report written to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
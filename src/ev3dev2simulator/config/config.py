@@ -23,6 +23,7 @@ class Config:
     def __init__(self, world_config_file_name, orig_path=None):
         self.orig_path = orig_path
         self.rel_world_config_path = None
+        self.world_config_dir = None
         world_config_yaml = self._load_world_config(world_config_file_name)
         ConfigChecker.check_world_config(world_config_yaml)
         self.world_config = world_config_yaml.data
@@ -34,6 +35,7 @@ class Config:
         if os.path.dirname(file_name) != '':
             self.rel_world_config_path = os.path.dirname(file_name)
         world_schema = ConfigChecker.get_world_schema()
+        self.world_config_dir = os.path.dirname(self._get_yaml_path('world_configurations', file_name, self.orig_path))
         return self._load_yaml_file('world_configurations', file_name, self.orig_path, world_schema)
 
     def load_robot_config(self, file_name: str):
@@ -56,18 +58,33 @@ class Config:
         Load config data from the correct config yaml file. The file to load from depends on the simulation type.
         :return: the config data.
         """
-        my_path = f'{Config.get_project_root()}/{prefix}/'
-        global_files = [f.replace('.yaml', '') for f in listdir(my_path) if isfile(join(my_path, f))]
-        if file_url not in global_files:
-            path = f'{orig_path}/{file_url}'
-        else:
-            path = f'{Config.get_project_root()}/{prefix}/{file_url}.yaml'
+        path = Config._get_yaml_path(prefix, file_url, orig_path)
         try:
             with open(path) as stream:
                 return load(stream.read(), schema, path)
         except FileNotFoundError:
             raise FileNotFoundError(f'The configuration {path} could not be found')
 
+    @staticmethod
+    def _get_yaml_path(prefix: str, file_url: str, orig_path: str = None) -> str:
+        """
+        Get the path of a config yaml file, which is one of the files of the simulator or a file of the user.
+        :return: the path.
+        """
+        my_path = f'{Config.get_project_root()}/{prefix}/'
+        global_files = [f.replace('.yaml', '') for f in listdir(my_path) if isfile(join(my_path, f))]
+        if file_url not in global_files:
+            return f'{orig_path}/{file_url}'
+        return f'{Config.get_project_root()}/{prefix}/{file_url}.yaml'
+
+    def get_world_file_path(self, file_name: str) -> str:
+        """
+        Get the path of a file used by the world config, such as an image.
+        @param file_name: of the file, relative to the directory of the world config.
+        @return: the path.
+        """
+        return os.path.join(self.world_config_dir, file_name)
+
     @staticmethod
     def get_project_root() -> str:
         """
@@ -104,6 +121,13 @@ def get_robot_config(file_name):
     return THIS.CONFIG.load_robot_config(file_name)
 
 
+def get_world_file_path(file_name):
+    """
+    Gets the path of a file used by the current world config.
+    """
+    return THIS.CONFIG.get_world_file_path(file_name)
+
+
 def get_world_config():
     """
     Get the current world config
@@ -49,6 +49,7 @@ class ConfigChecker:
             Optional('port'): Regex('ev3-ports:(in[1-4]|out[A-D])'),
             Optional('side'): Regex('left|right|rear'),
             Optional('direction'): Regex('bottom|front'),
+            Optional('sample_rate_hz'): Float(),
         })
 
     @staticmethod
@@ -88,6 +89,7 @@ class ConfigChecker:
                     Optional('movable'): Bool(),
                     Optional('hole'): Bool(),
                     Optional('radius'): Int(),
+                    Optional('image'): Str(),
                 })
             ),
         })
@@ -143,15 +145,32 @@ class ConfigChecker:
                 'ultrasonic_sensor_top': Map({'width': Int(), 'height': Int()}),
                 'wheel': Map({'width': Int(), 'height': Int()}),
             }),
+            # settings added later are optional, with the defaults of the shipped settings, so older settings still pass
             'exec_settings': Map({
                 'frames_per_second': Int(),
+                Optional('physics_substeps', default=1): Int(),
+                Optional('max_catch_up_frames', default=5): Int(),
+                Optional('physics_thread', default=True): Bool(),
                 'socket_port': Int(),
                 'bluetooth_port': Int(),
-                'message_size': Int()
+                'message_size': Int(),
+                Optional('lock_step_requests_per_frame', default=10): Int(),
+                Optional('resume_timeout', default=1.0): Float(),
+                Optional('color_map_cell_size', default=1.0): Float(),
+                Optional('distance_field_cell_size', default=5.0): Float(),
+                Optional('use_spatial_hash', default=False): Bool(),
+                Optional('eager_sensors', default=False): Bool()
             }),
             'motor_settings': Map({
                 'distance_coasting_subtraction': Float(),
                 'degree_coasting_subtraction': Float()
             }),
-            'wheel_settings': Map({'circumference': Float()})
+            'wheel_settings': Map({'circumference': Float()}),
+            Optional('color_sensor_settings', default={'footprint': 8.0}): Map({
+                Optional('footprint', default=8.0): Float()
+            }),
+            Optional('ultrasonic_sensor_settings', default={'cone_angle': 0.0, 'rays': 1}): Map({
+                Optional('cone_angle', default=0.0): Float(),
+                Optional('rays', default=1): Int()
+            })
         })
@@ -2,28 +2,69 @@
 Singleton module client_sockets contains the class ClientSocket and the function get_client_socket to get the instance.
 """
 
-import json
+import itertools
+import os
 import socket
 import threading
-import time
 import sys
-from json import JSONDecodeError
-from typing import Any, Optional
+from typing import Any, Callable, Optional, Sequence
 from ev3dev2simulator.config.config import get_simulation_settings, load_config
 from ev3dev2simulator.connection.message.command import Command
+from ev3dev2simulator.connection.message.hello_request import HelloRequest
+from ev3dev2simulator.connection.message.protocol_request import ProtocolRequest
+from ev3dev2simulator.connection.wire_protocol import JsonProtocol, PROTOCOL_NAMES, PUSH_REQUEST_ID, create_protocol
 
 THIS = sys.modules[__name__]
 
+# environment variable to connect to a simulator listening on another port than configured, e.g. in a batch run
+PORT_ENVIRONMENT_VARIABLE = 'EV3DEV2SIMULATOR_PORT'
+# environment variables naming the robot and brick to connect as, so the bricks of a robot connect in any order
+ROBOT_ENVIRONMENT_VARIABLE = 'EV3DEV2SIMULATOR_ROBOT'
+BRICK_ENVIRONMENT_VARIABLE = 'EV3DEV2SIMULATOR_BRICK'
+# environment variable to resume the run of a brick that reconnects, instead of starting with a fresh world
+RESUME_ENVIRONMENT_VARIABLE = 'EV3DEV2SIMULATOR_RESUME'
+
+# seconds to wait for the simulator to choose a protocol, simulators without protocol negotiation never answer
+NEGOTIATION_TIMEOUT = 1
+# seconds to wait for a response, which the simulator may hold until the next frame or answer after other requests
+RESPONSE_TIMEOUT = 10
+
+
+class ResponseFuture:
+    """
+    The future response of a request in flight on a multiplexed connection. This is a lightweight alternative to
+    concurrent.futures.Future, as one is created for every request.
+    """
+    __slots__ = ('done', 'value')
+
+    def __init__(self):
+        self.done = False
+        self.value = None
+
+    def set_result(self, value: Any):
+        """
+        Set the value of the response.
+        """
+        self.value = value
+        self.done = True
+
 
 class ClientSocket:
     """
     Class responsible for the sending request from the emulated ev3dev2 API with the simulator using a socket connection.
     This connection is a TCP stream.
+
+    When the negotiated protocol is multiplexed, every request gets an id and the responses are handed to the futures
+    of the threads waiting for them. Threads of the program then only share the socket while sending, so a thread
+    waiting for a response does not hold up the requests of other threads.
     """
 
-    def __init__(self):
+    def __init__(self, protocols: Sequence[str] = PROTOCOL_NAMES):
         load_config(None)
-        port = int(get_simulation_settings()['exec_settings']['socket_port'])
+        port = int(os.environ.get(PORT_ENVIRONMENT_VARIABLE, get_simulation_settings()['exec_settings']['socket_port']))
+        robot = os.environ.get(ROBOT_ENVIRONMENT_VARIABLE)
+        brick = os.environ.get(BRICK_ENVIRONMENT_VARIABLE)
+        resume = os.environ.get(RESUME_ENVIRONMENT_VARIABLE, '') not in ('', '0')
 
         self.client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
 
@@ -39,7 +80,67 @@ class ClientSocket:
         # To prevent race conditions between them, they need to require a mutex.
         self.lock = threading.Lock()
 
-        time.sleep(1)
+        # the responses to the hello and the protocol request tell that the simulator is ready, no need to wait;
+        # requests send before the brick has been chosen are handled once it has been
+        if robot is not None or brick is not None or resume:
+            self._say_hello(HelloRequest(robot, brick, resume))
+        self.protocol = self._negotiate_protocol(protocols)
+
+        # futures of the requests waiting for a response by request id
+        self.pending = {}
+        self.request_ids = itertools.count(1)
+        # one of the waiting threads receives the responses for all of them, the others wait for the condition
+        self.receive_lock = threading.Lock()
+        self.response_condition = threading.Condition()
+        # values pushed by the simulator are only received by a receiver thread
+        self.receiver = None
+        self.push_handler = None
+        # other requests may be answered first on a multiplexed connection, and with a virtual clock or in lock-step
+        # mode the simulator holds requests until the frame they belong to, on any connection
+        self.client.settimeout(RESPONSE_TIMEOUT)
+
+    def _say_hello(self, hello: HelloRequest):
+        """
+        Tell the simulator which brick of which robot is connecting. Without a hello, the simulator connects to the
+        first brick that is not connected yet. A simulator that does not know about hellos does not respond.
+        :param hello: the request naming the brick.
+        """
+        json_protocol = JsonProtocol()
+        self.client.send(json_protocol.encode_message(hello.serialize()))
+        timeout = self.client.gettimeout()
+        self.client.settimeout(NEGOTIATION_TIMEOUT)
+        try:
+            _, accepted = json_protocol.receive_response(self.client)
+        except socket.timeout:
+            accepted = True
+        finally:
+            self.client.settimeout(timeout)
+        if not accepted:
+            print(f"EXIT(1): BRICK NOT AVAILABLE IN SIMULATOR (robot: {hello.robot}, brick: {hello.brick})")
+            exit(1)
+
+    def _negotiate_protocol(self, protocols: Sequence[str]):
+        """
+        Ask the simulator which of the given protocols to use for the rest of the connection. The request is send
+        with the JSON protocol. A simulator that does not know about protocols does not respond, in which case the
+        JSON protocol is used.
+        :param protocols: names of the protocols in order of preference.
+        :return: the protocol to use.
+        """
+        json_protocol = JsonProtocol()
+        if list(protocols) == [JsonProtocol.name]:
+            return json_protocol
+
+        self.client.send(json_protocol.encode_message(ProtocolRequest(list(protocols)).serialize()))
+        timeout = self.client.gettimeout()
+        self.client.settimeout(NEGOTIATION_TIMEOUT)
+        try:
+            _, name = json_protocol.receive_response(self.client)
+        except socket.timeout:
+            name = JsonProtocol.name
+        finally:
+            self.client.settimeout(timeout)
+        return create_protocol(name)
 
     def send_command(self, command: Command, wait_for_response=False) -> Optional[object]:
         """
@@ -47,52 +148,149 @@ class ClientSocket:
         :param command: to send.
         :param wait_for_response: set to True if you expect a result and want to wait for it blocking.
         """
+        if self.protocol.multiplexed:
+            return self._send_multiplexed_command(command, wait_for_response)
+
         self.lock.acquire()
-        jsn = self.serialize(command)
+        data = self.protocol.encode_message(command.serialize())
 
         des = None
         try:
-            self.client.send(jsn)
+            self.client.sendall(data)
             if wait_for_response:
-                data = self.client.recv(32)
-                des = self.deserialize(data)
+                _, des = self.protocol.receive_response(self.client)
         except:
             import __main__
             print("EXIT(1): SIMULATOR CONNECTION LOST ",__main__.__file__)
             # exit and kill all threads
-            import os
             os._exit(1)
         finally:
             self.lock.release()
         return des
 
+    def _send_multiplexed_command(self, command: Command, wait_for_response: bool) -> Optional[object]:
+        """
+        Send the given Command with a new request id and wait for the response with that id, if requested.
+        The socket is only locked while sending.
+        """
+        future = ResponseFuture()
+        try:
+            with self.lock:
+                request_id = next(self.request_ids)
+                if wait_for_response:
+                    self.pending[request_id] = future
+                self.client.sendall(self.protocol.encode_message(command.serialize(), request_id))
+            if wait_for_response:
+                return self._wait_for_response(future)
+        except:
+            import __main__
+            print("EXIT(1): SIMULATOR CONNECTION LOST ",__main__.__file__)
+            # exit and kill all threads
+            os._exit(1)
+        return None
+
+    def _wait_for_response(self, future: ResponseFuture) -> Any:
+        """
+        Wait for the response of a request. Instead of a separate receiver thread, one of the waiting threads receives
+        the responses and hands them to the futures of the others until its own response has arrived, after which
+        another waiting thread takes over. A program with a single thread receives its responses directly.
+        :param future: of the request.
+        :return: the value of the response.
+        """
+        while not future.done:
+            if self.receive_lock.acquire(blocking=False):
+                try:
+                    self._receive_responses(future)
+                finally:
+                    self.receive_lock.release()
+                    if self.pending:
+                        with self.response_condition:
+                            self.response_condition.notify_all()
+            else:
+                with self.response_condition:
+                    self.response_condition.wait_for(lambda: future.done or not self.receive_lock.locked())
+        return future.value
+
+    def start_receiver(self, push_handler: Callable[[Any], None]):
+        """
+        Start a thread that receives all responses from now on, including the values pushed by the simulator.
+        Values are pushed at any time, so they cannot wait until a thread of the program waits for a response.
+        :param push_handler: function called with every pushed value by the receiver thread.
+        """
+        if not self.protocol.multiplexed:
+            raise RuntimeError('values can only be pushed on a multiplexed connection')
+        with self.lock:
+            if self.receiver is not None:
+                return
+            self.push_handler = push_handler
+            self.receiver = threading.Thread(target=self._run_receiver, daemon=True)
+            self.receiver.start()
+
+    def _run_receiver(self):
+        """
+        Receive responses until the connection is lost. Other threads wait for their future in the meantime.
+        """
+        try:
+            with self.receive_lock:
+                # nothing may arrive for a long time when no values change and no requests are send
+                self.client.settimeout(None)
+                self._receive_responses(ResponseFuture())
+        except (OSError, ValueError):
+            pass
+        finally:
+            # a waiting thread takes over and notices the lost connection
+            with self.response_condition:
+                self.response_condition.notify_all()
+
+    def _receive_responses(self, future: ResponseFuture):
+        """
+        Receive responses and hand them to their futures until the given future is done.
+        :param future: of the request of the receiving thread.
+        """
+        while not future.done:
+            request_id, value = self.protocol.receive_response(self.client)
+            if request_id == PUSH_REQUEST_ID:
+                if self.push_handler is not None:
+                    self.push_handler(value)
+                continue
+            # responses to requests nobody waits for are dropped
+            waiting = self.pending.pop(request_id, None)
+            if waiting is not None:
+                waiting.set_result(value)
+                if waiting is not future:
+                    with self.response_condition:
+                        self.response_condition.notify_all()
+
+    def close(self):
+        """
+        Close the connection with the simulator. Shutting the socket down first also wakes up a thread waiting
+        for a response.
+        """
+        try:
+            self.client.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.client.close()
+
     @staticmethod
     def serialize(message: Any) -> bytes:
         """
-        Serialize the given message so it can be send via a stream channel.
+        Serialize the given message with the JSON protocol so it can be send via a stream channel.
         :param message: to be serialized.
         :return: bytes representing the message.
         """
 
-        obj_dict = message.serialize()
-
-        jsn = json.dumps(obj_dict)
-        jsn = jsn.ljust(int(get_simulation_settings()['exec_settings']['message_size']), '#')
-
-        return str.encode(jsn)
+        return JsonProtocol().encode_message(message.serialize())
 
     @staticmethod
     def deserialize(data: bytes) -> Any:
         """
-        Deserialize the given data.
+        Deserialize the given data of a response in the JSON protocol.
         :param data: to be deserialized.
         :return: any type representing value inside the data.
         """
 
-        val = data.decode()
-        obj_dict = json.loads(val)
-
-        return obj_dict['value']
+        return JsonProtocol.decode_response(data)
 
 
 THIS.CLIENT_SOCKET = None
@@ -105,3 +303,4 @@ def get_client_socket() -> ClientSocket:
     if not THIS.CLIENT_SOCKET:
         THIS.CLIENT_SOCKET = ClientSocket()
     return THIS.CLIENT_SOCKET
+
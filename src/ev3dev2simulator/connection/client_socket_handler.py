@@ -2,51 +2,205 @@
 The client_socket_handler is used to communicate with a client opened by robot code.
 """
 
-import socket
-import threading
-from time import sleep
+import asyncio
+import queue
+from typing import Callable, Optional
 
-from ev3dev2simulator.config.config import get_simulation_settings
 from ev3dev2simulator.connection.message_handler import MessageHandler
+from ev3dev2simulator.connection.wire_protocol import JsonProtocol, PUSH_REQUEST_ID
+from ev3dev2simulator.state.lock_step import LockStep
 from ev3dev2simulator.state.message_processor import MessageProcessor
 from ev3dev2simulator.state.robot_simulator import RobotSimulator
+from ev3dev2simulator.state.simulation_clock import SimulationClock
 
-class ClientSocketHandler(threading.Thread):
+# requests that block until the next frame, which are answered out of order on multiplexed connections
+BLOCKING_REQUESTS = ('WaitRequest',)
+# maximum number of blocking requests of a single brick processed at the same time
+MAX_BLOCKING_REQUESTS = 8
+
+
+class ClientSocketHandler(asyncio.Protocol):
     """
     Class responsible for handling request from the emulated ev3dev2 API to the simulator using a socket connection.
+    The handler is the asyncio protocol of the connection of its brick, so its requests are handled by the event loop
+    of the server, which processes most requests right away. Requests that block, and in lock-step mode all requests,
+    are processed by an executor; when the protocol of the connection is multiplexed, the requests of other threads
+    of the program are answered in the meantime. The values of the sensors the brick subscribed to are pushed at the
+    end of every frame, as is the state of the brick in its shared memory table when the brick requested one.
     """
 
-    def __init__(self, robot_sim: RobotSimulator, brick_id: int, brick_name: str):
-        threading.Thread.__init__(self)
-        self.message_handler = MessageHandler(MessageProcessor(brick_id, robot_sim))
-        self.client = None
+    def __init__(self, robot_sim: RobotSimulator, brick_id: int, brick_name: str, clock: SimulationClock = None,
+                 lock_step: LockStep = None, shared_state: bool = False, command_queue: queue.SimpleQueue = None):
+        self.message_processor = MessageProcessor(brick_id, robot_sim, clock, lock_step, shared_state, command_queue)
+        self.message_handler = MessageHandler(self.message_processor)
+        self.lock_step = lock_step
         self.brick_id = brick_id
-        self.is_running = True
         self.is_connected = False
         self.brick_name = brick_name
         self.robot_sim = robot_sim
-        self.message_size = int(get_simulation_settings()['exec_settings']['message_size'])
 
-    def run(self):
+        self.loop = None
+        self.transport = None
+        # bytes received that do not form a complete request yet, or that wait for a request to be answered
+        self.buffer = bytearray()
+        # whether a request is processed by the executor that has to be answered before the next request
+        self.is_busy = False
+        # blocking requests being processed at the same time, which are cancelled when the connection is lost
+        self.blocking_requests = set()
+        # executor processing the requests that block, the default executor of the loop when None
+        self.executor = None
+        # called by the event loop after the connection has been lost
+        self.on_disconnect: Optional[Callable[[], None]] = None
+
+        if clock is not None:
+            clock.add_tick_listener(self.push_sensor_updates)
+            clock.add_tick_listener(self.message_processor.publish_shared_state)
+
+    def connection_made(self, transport: asyncio.Transport):
+        """
+        Start handling the requests of a new connection of the brick. Called by the event loop.
+        :param transport: the transport of the connection.
+        """
+        if self.lock_step is not None:
+            self.lock_step.connect(self.message_processor.brick_key)
+        # a new connection negotiates its own protocol and subscription
+        self.message_handler.protocol = JsonProtocol()
+        self.message_processor.reset_subscription()
+        self.loop = asyncio.get_running_loop()
+        self.transport = transport
+        self.buffer.clear()
+        self.is_busy = False
+        self.is_connected = True
+
+    def connection_lost(self, exc: Optional[Exception]):
+        """
+        Stop handling requests, the brick is not connected anymore. Called by the event loop.
+        :param exc: the error that caused the connection to be lost, None when the brick closed the connection.
+        """
+        self.disconnect()
+        for request in self.blocking_requests:
+            request.cancel()
+        if exc is not None:
+            self.message_processor.reset_actuators()
+            print(f'Closing connection from \"{self.brick_name}\" (id: {self.brick_id}) from robot '
+                  f'\"{self.robot_sim.robot.name}\"')
+        self.transport = None
+        if self.on_disconnect is not None:
+            self.on_disconnect()
+
+    def disconnect(self):
         """
-        Manage the socket connection.
+        Stop handling requests, the brick is not connected anymore.
+        """
+        self.is_connected = False
+        self.message_processor.close_shared_state()
+        if self.lock_step is not None:
+            self.lock_step.disconnect(self.message_processor.brick_key)
+
+    def data_received(self, data: bytes):
+        """
+        Handle the requests in the received bytes. Called by the event loop.
+        :param data: the bytes received.
+        """
+        self.buffer += data
+        self._handle_requests()
+
+    def process(self, obj_dict: dict) -> bytes:
+        """
+        Process the given request. In lock-step mode, the request is processed in the frame the brick is allowed to.
+        Negotiating the protocol does not count as a request, so the protocol does not influence the simulation.
+        :param obj_dict: the request received, decoded by the protocol of the connection.
+        :return: a possible response in bytes when the request requires it.
+        """
+        if self.lock_step is None or obj_dict['type'] == 'ProtocolRequest':
+            return self.message_handler.process_message(obj_dict)
+
+        self.lock_step.start_request(self.message_processor.brick_key)
+        try:
+            return self.message_handler.process_message(obj_dict)
+        finally:
+            self.lock_step.end_request(self.message_processor.brick_key)
+
+    def _handle_requests(self):
         """
-        while self.is_running:
-            if not self.is_connected:
-                sleep(0.1)
+        Handle the complete requests in the buffer, until a request has to be answered before the next one.
+        """
+        while self.transport is not None and not self.is_busy:
+            # a protocol request switches to another protocol, but is answered with the current one
+            protocol = self.message_handler.protocol
+            message = protocol.next_message(self.buffer)
+            if message is None:
+                return
+
+            request_id, obj_dict = message
+            tpe = obj_dict['type']
+            if tpe not in BLOCKING_REQUESTS and (self.lock_step is None or tpe == 'ProtocolRequest'):
+                self._send(self.transport, protocol, request_id, self.process(obj_dict))
+            elif protocol.multiplexed and self.lock_step is None \
+                    and len(self.blocking_requests) < MAX_BLOCKING_REQUESTS:
+                self._respond_blocking(protocol, request_id, obj_dict)
             else:
-                try:
-                    data = self.client.recv(self.message_size)
-                    if data:
-                        val = self.message_handler.process(data)
-                        if val:
-                            self.client.send(val)
-                    else:
-                        self.is_connected = False
-                except socket.error:
-                    self.is_connected = False
-                    # TODO: abstract simulator details here-> just call something as  self.robot_sim.disconnect(self.brick_id)
-                    self.robot_sim.reset_queues_of_brick(self.brick_id)
-                    print(f'Closing connection from \"{self.brick_name}\" (id: {self.brick_id}) from robot '
-                          f'\"{self.robot_sim.robot.name}\"')
-                    self.client.close()
+                # in lock-step mode the requests are processed in order, to keep the simulation deterministic
+                self._respond_in_order(protocol, request_id, obj_dict)
+
+    def _respond_blocking(self, protocol, request_id: int, obj_dict: dict):
+        """
+        Process a blocking request by the executor and answer it once processed, while other requests are handled.
+        """
+        transport = self.transport
+        future = self.loop.run_in_executor(self.executor, self.process, obj_dict)
+        self.blocking_requests.add(future)
+
+        def respond(done: asyncio.Future):
+            self.blocking_requests.discard(done)
+            if not done.cancelled() and done.exception() is None:
+                self._send(transport, protocol, request_id, done.result())
+
+        future.add_done_callback(respond)
+
+    def _respond_in_order(self, protocol, request_id: int, obj_dict: dict):
+        """
+        Process a request by the executor and only handle the next request once it has been answered.
+        """
+        transport = self.transport
+        self.is_busy = True
+        future = self.loop.run_in_executor(self.executor, self.process, obj_dict)
+
+        def respond(done: asyncio.Future):
+            if transport is not self.transport:
+                # the connection has been lost in the meantime
+                return
+            self.is_busy = False
+            try:
+                self._send(transport, protocol, request_id, done.result())
+            finally:
+                self._handle_requests()
+
+        future.add_done_callback(respond)
+
+    @staticmethod
+    def _send(transport: Optional[asyncio.Transport], protocol, request_id: int, response: Optional[bytes]):
+        """
+        Send the response, if any, with the id of the request it belongs to. Must be called by the event loop.
+        :param transport: the transport of the connection the request was received on.
+        :param protocol: the protocol the request was received with, which is used for the response as well.
+        :param request_id: id of the request, which the client uses to match the response.
+        :param response: the encoded response.
+        """
+        if response and transport is not None and not transport.is_closing():
+            transport.write(protocol.frame(response, request_id))
+
+    def push_sensor_updates(self):
+        """
+        Push the changed values of the sensors the brick subscribed to. This is called by the thread simulating
+        the world at the end of every frame, so the values are written by the event loop.
+        """
+        if not self.is_connected:
+            return
+        updates = self.message_processor.get_sensor_updates()
+        if not updates or not updates['values']:
+            return
+
+        protocol = self.message_handler.protocol
+        self.loop.call_soon_threadsafe(self._send, self.transport, protocol, PUSH_REQUEST_ID,
+                                       protocol.encode_response(updates))
@@ -11,9 +11,13 @@ from ev3dev2simulator.connection.message.command import Command
 class DataRequest(Command):
     """
     DataRequest object are used to request the latest value of a sensor attached to the given address.
+    With with_frame the frame in which the sensor took the value is returned as well.
     """
-    def __init__(self, address: str):
+    def __init__(self, address: str, with_frame: bool = False):
         self.address = address
+        self.with_frame = with_frame
 
     def serialize(self) -> dict:
+        if self.with_frame:
+            return {'type': 'DataRequest', 'address': self.address, 'with_frame': True}
         return {'type': 'DataRequest', 'address': self.address}
@@ -0,0 +1,21 @@
+"""
+The module events_request contains the dataclass EventsRequest.
+"""
+
+from dataclasses import dataclass
+
+from ev3dev2simulator.connection.message.command import Command
+
+
+@dataclass
+class EventsRequest(Command):
+    """
+    EventsRequest object are used to request the events of a sensor attached to the given address that happened
+    after the given frame, such as the presses and releases of a touch sensor.
+    """
+    def __init__(self, address: str, after_frame: int):
+        self.address = address
+        self.after_frame = after_frame
+
+    def serialize(self) -> dict:
+        return {'type': 'EventsRequest', 'address': self.address, 'after_frame': self.after_frame}
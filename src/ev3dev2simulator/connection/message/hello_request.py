@@ -0,0 +1,26 @@
+"""
+The hello_request module contains the class HelloRequest.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+from ev3dev2simulator.connection.message.command import Command
+
+
+@dataclass
+class HelloRequest(Command):
+    """
+    HelloRequest objects are send once as the first message of a connection to tell the simulator which brick
+    of which robot is connecting, so bricks can connect in any order. A brick that resumes after its connection
+    was lost keeps the state of the world. The request and its response always use the JSON protocol.
+    The simulator responds with the names of the robot and brick the connection belongs to,
+    or with None when that brick does not exist or is connected already.
+    """
+    def __init__(self, robot: Optional[str], brick: Optional[str], resume: bool = False):
+        self.robot = robot
+        self.brick = brick
+        self.resume = resume
+
+    def serialize(self) -> dict:
+        return {'type': 'HelloRequest', 'robot': self.robot, 'brick': self.brick, 'resume': self.resume}
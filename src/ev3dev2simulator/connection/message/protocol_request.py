@@ -0,0 +1,22 @@
+"""
+The protocol_request module contains the class ProtocolRequest.
+"""
+
+from dataclasses import dataclass
+from typing import List
+
+from ev3dev2simulator.connection.message.command import Command
+
+
+@dataclass
+class ProtocolRequest(Command):
+    """
+    ProtocolRequest objects are send once when connecting to negotiate the wire protocol of the connection.
+    The simulator responds with the first of the given protocols it supports. The request and its response always
+    use the JSON protocol, after the response both sides switch to the chosen protocol.
+    """
+    def __init__(self, protocols: List[str]):
+        self.protocols = protocols
+
+    def serialize(self) -> dict:
+        return {'type': 'ProtocolRequest', 'protocols': self.protocols}
@@ -0,0 +1,19 @@
+"""
+The shared_state_request module contains the class SharedStateRequest.
+"""
+
+from dataclasses import dataclass
+
+from ev3dev2simulator.connection.message.command import Command
+
+
+@dataclass
+class SharedStateRequest(Command):
+    """
+    SharedStateRequest objects are used to request the shared memory table in which the simulator publishes
+    the state of the brick every frame. The simulator responds with the name of the table and the addresses
+    of its layout, or with None when it does not share memory.
+    """
+
+    def serialize(self) -> dict:
+        return {'type': 'SharedStateRequest'}
@@ -0,0 +1,18 @@
+"""
+The snapshot_request module contains the class SnapshotRequest.
+"""
+
+from dataclasses import dataclass
+
+from ev3dev2simulator.connection.message.command import Command
+
+
+@dataclass
+class SnapshotRequest(Command):
+    """
+    SnapshotRequest objects are used to request the latest values of all sensors of the brick at once.
+    The simulator responds with the values by address and the number of the frame they belong to.
+    """
+
+    def serialize(self) -> dict:
+        return {'type': 'SnapshotRequest'}
@@ -0,0 +1,22 @@
+"""
+The subscribe_request module contains the class SubscribeRequest.
+"""
+
+from dataclasses import dataclass
+from typing import List
+
+from ev3dev2simulator.connection.message.command import Command
+
+
+@dataclass
+class SubscribeRequest(Command):
+    """
+    SubscribeRequest objects are used to subscribe to the values of the sensors at the given addresses, replacing
+    any earlier subscription. The simulator responds with the current values and from then on pushes the values
+    that changed at the end of every frame.
+    """
+    def __init__(self, addresses: List[str]):
+        self.addresses = addresses
+
+    def serialize(self) -> dict:
+        return {'type': 'SubscribeRequest', 'addresses': self.addresses}
@@ -0,0 +1,18 @@
+"""
+The time_request module contains the class TimeRequest.
+"""
+
+from dataclasses import dataclass
+
+from ev3dev2simulator.connection.message.command import Command
+
+
+@dataclass
+class TimeRequest(Command):
+    """
+    TimeRequest objects are used to request the time of the simulation clock.
+    The simulator responds with None when the simulation runs in real time and the wall clock should be used.
+    """
+
+    def serialize(self) -> dict:
+        return {'type': 'TimeRequest'}
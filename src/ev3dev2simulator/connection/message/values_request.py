@@ -0,0 +1,21 @@
+"""
+The module values_request contains the dataclass ValuesRequest.
+"""
+
+from dataclasses import dataclass
+
+from ev3dev2simulator.connection.message.command import Command
+
+
+@dataclass
+class ValuesRequest(Command):
+    """
+    ValuesRequest object are used to request the latest values of a sensor attached to the given address in the given
+    mode, for sensors of which the values depend on their mode.
+    """
+    def __init__(self, address: str, mode: str):
+        self.address = address
+        self.mode = mode
+
+    def serialize(self) -> dict:
+        return {'type': 'ValuesRequest', 'address': self.address, 'mode': self.mode}
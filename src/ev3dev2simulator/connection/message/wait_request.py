@@ -0,0 +1,20 @@
+"""
+The wait_request module contains the class WaitRequest.
+"""
+
+from dataclasses import dataclass
+
+from ev3dev2simulator.connection.message.command import Command
+
+
+@dataclass
+class WaitRequest(Command):
+    """
+    WaitRequest objects are used to wait until the simulation clock reaches the given time.
+    The simulator responds with the simulated time after at most a single frame.
+    """
+    def __init__(self, until: float):
+        self.until = until
+
+    def serialize(self) -> dict:
+        return {'type': 'WaitRequest', 'until': self.until}
@@ -2,17 +2,23 @@
 The message_handler module contains the MessageHandler class.
 """
 
-import json
 from logging import warning
 from typing import Any
 
 from ev3dev2simulator.connection.message.config_request import ConfigRequest
 from ev3dev2simulator.state.message_processor import MessageProcessor
 from ev3dev2simulator.connection.message.data_request import DataRequest
+from ev3dev2simulator.connection.message.events_request import EventsRequest
 from ev3dev2simulator.connection.message.led_command import LedCommand
+from ev3dev2simulator.connection.message.shared_state_request import SharedStateRequest
+from ev3dev2simulator.connection.message.snapshot_request import SnapshotRequest
+from ev3dev2simulator.connection.message.subscribe_request import SubscribeRequest
 from ev3dev2simulator.connection.message.rotate_command import RotateCommand
 from ev3dev2simulator.connection.message.sound_command import SoundCommand
 from ev3dev2simulator.connection.message.stop_command import StopCommand
+from ev3dev2simulator.connection.message.values_request import ValuesRequest
+from ev3dev2simulator.connection.message.wait_request import WaitRequest
+from ev3dev2simulator.connection.wire_protocol import JsonProtocol, PROTOCOL_NAMES, create_protocol
 
 
 class MessageHandler:
@@ -21,6 +27,8 @@ class MessageHandler:
     """
     def __init__(self, message_processor: MessageProcessor):
         self.message_processor = message_processor
+        # every connection starts with the JSON protocol, until another protocol has been negotiated
+        self.protocol = JsonProtocol()
 
     def process(self, data: bytes) -> bytes:
         """
@@ -28,11 +36,14 @@ class MessageHandler:
         :param data: to process.
         :return: a possible response in bytes when the incoming message requires it.
         """
+        return self.process_message(self.protocol.decode_message(data))
 
-        jsn = data.decode()
-        jsn = jsn.replace('#', '')
-
-        obj_dict = json.loads(jsn)
+    def process_message(self, obj_dict: dict) -> bytes:
+        """
+        Process an incoming message that has already been decoded by the protocol of the connection.
+        :param obj_dict: the message serialized into a dictionary.
+        :return: a possible response in bytes when the incoming message requires it.
+        """
 
         tpe = obj_dict['type']
 
@@ -53,8 +64,24 @@ class MessageHandler:
         # handling any data or config requests.
         if tpe == 'DataRequest':
             return self._process_data_request(obj_dict)
+        if tpe == 'ValuesRequest':
+            return self._process_values_request(obj_dict)
+        if tpe == 'EventsRequest':
+            return self._process_events_request(obj_dict)
+        if tpe == 'SnapshotRequest':
+            return self._process_snapshot_request()
+        if tpe == 'SubscribeRequest':
+            return self._process_subscribe_request(obj_dict)
+        if tpe == 'SharedStateRequest':
+            return self._process_shared_state_request()
         if tpe == 'ConfigRequest':
             return self._process_config_request(obj_dict)
+        if tpe == 'TimeRequest':
+            return self._process_time_request()
+        if tpe == 'WaitRequest':
+            return self._process_wait_request(obj_dict)
+        if tpe == 'ProtocolRequest':
+            return self._process_protocol_request(obj_dict)
 
         warning(f'Unknown command type {tpe}')
         return bytes()
@@ -106,11 +133,70 @@ class MessageHandler:
         :param command_dict: to process.
         :return: a bytes object representing the serialized response.
         """
-        request = DataRequest(command_dict['address'])
+        request = DataRequest(command_dict['address'], command_dict.get('with_frame', False))
         value = self.message_processor.process_data_request(request)
 
         return self.serialize_response(value)
 
+    def _process_values_request(self, command_dict: dict) -> bytes:
+        """
+        Deserialize the given dictionary into a ValuesRequest and send it to the MessageProcessor.
+        Return a serialized response with the requested values.
+        :param command_dict: to process.
+        :return: a bytes object representing the serialized response.
+        """
+        request = ValuesRequest(command_dict['address'], command_dict['mode'])
+        value = self.message_processor.process_values_request(request)
+
+        return self.serialize_response(value)
+
+    def _process_events_request(self, command_dict: dict) -> bytes:
+        """
+        Deserialize the given dictionary into an EventsRequest and send it to the MessageProcessor.
+        Return a serialized response with the requested events.
+        :param command_dict: to process.
+        :return: a bytes object representing the serialized response.
+        """
+        request = EventsRequest(command_dict['address'], command_dict['after_frame'])
+        value = self.message_processor.process_events_request(request)
+
+        return self.serialize_response(value)
+
+    def _process_snapshot_request(self) -> bytes:
+        """
+        Send a SnapshotRequest to the MessageProcessor.
+        Return a serialized response with the values of all sensors of the brick.
+        :return: a bytes object representing the serialized response.
+        """
+        value = self.message_processor.process_snapshot_request(SnapshotRequest())
+
+        return self.serialize_response(value)
+
+    def _process_subscribe_request(self, command_dict: dict) -> bytes:
+        """
+        Deserialize the given dictionary into a SubscribeRequest and send it to the MessageProcessor.
+        Values can only be pushed on a multiplexed connection, otherwise None is returned.
+        :param command_dict: to process.
+        :return: a bytes object representing the serialized response with the current values.
+        """
+        if not self.protocol.multiplexed:
+            return self.serialize_response(None)
+
+        request = SubscribeRequest(command_dict['addresses'])
+        value = self.message_processor.process_subscribe_request(request)
+
+        return self.serialize_response(value)
+
+    def _process_shared_state_request(self) -> bytes:
+        """
+        Send a SharedStateRequest to the MessageProcessor.
+        Return a serialized response with the name and layout of the shared memory table of the brick.
+        :return: a bytes object representing the serialized response.
+        """
+        value = self.message_processor.process_shared_state_request(SharedStateRequest())
+
+        return self.serialize_response(value)
+
     def _process_config_request(self, command_dict: dict):
         """
         Deserialize the given dictionary into a ConfigRequest and send it to the MessageProcessor.
@@ -123,15 +209,45 @@ class MessageHandler:
 
         return self.serialize_response(value)
 
+    def _process_time_request(self) -> bytes:
+        """
+        Send a TimeRequest to the MessageProcessor.
+        Return a serialized response with the simulated time.
+        :return: a bytes object representing the serialized response.
+        """
+        value = self.message_processor.process_time_request()
+
+        return self.serialize_response(value)
 
-    @staticmethod
-    def serialize_response(value) -> bytes:
+    def _process_wait_request(self, command_dict: dict) -> bytes:
         """
-        Serialize the given value into a bytes object containing a dictionary.
-        :param value: to serialize.
+        Deserialize the given dictionary into a WaitRequest and send it to the MessageProcessor.
+        Return a serialized response with the simulated time after waiting.
+        :param command_dict: to process.
+        :return: a bytes object representing the serialized response.
         """
+        request = WaitRequest(command_dict['until'])
+        value = self.message_processor.process_wait_request(request)
 
-        command_dict = {'value': value}
+        return self.serialize_response(value)
+
+    def _process_protocol_request(self, command_dict: dict) -> bytes:
+        """
+        Choose the first protocol of the given ProtocolRequest that is supported and switch to it.
+        The response is still serialized with the protocol used so far.
+        :param command_dict: to process.
+        :return: a bytes object representing the serialized response with the name of the chosen protocol.
+        """
+        name = next((name for name in command_dict['protocols'] if name in PROTOCOL_NAMES), JsonProtocol.name)
+        response = self.serialize_response(name)
+        self.protocol = create_protocol(name)
+
+        return response
+
+    def serialize_response(self, value) -> bytes:
+        """
+        Serialize the given value with the protocol of the connection.
+        :param value: to serialize.
+        """
 
-        jsn = json.dumps(command_dict)
-        return str.encode(jsn)
+        return self.protocol.encode_response(value)
@@ -3,86 +3,238 @@ The server_sockets module contains the class ServerSockets, responsible for hand
 """
 
 
-import socket
+import asyncio
+import queue
 import threading
-import time
+from concurrent.futures import Executor, Future
+from typing import Optional
 
 from ev3dev2simulator.config.config import get_simulation_settings
-from ev3dev2simulator.connection.client_socket_handler import ClientSocketHandler
+from ev3dev2simulator.connection.client_socket_handler import ClientSocketHandler, MAX_BLOCKING_REQUESTS
+from ev3dev2simulator.connection.message.hello_request import HelloRequest
+from ev3dev2simulator.connection.wire_protocol import JsonProtocol
 from ev3dev2simulator.state.world_simulator import WorldSimulator
 
 
+class DaemonThreadPoolExecutor(Executor):
+    """
+    Executor running calls in a limited number of daemon threads, which are started when needed. Unlike the threads
+    of a ThreadPoolExecutor, these threads do not keep the simulator from exiting while they wait for a frame that
+    is never simulated anymore.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self.calls = queue.SimpleQueue()
+        self.threads = []
+        self.idle = threading.Semaphore(0)
+        self.lock = threading.Lock()
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future = Future()
+        self.calls.put((future, fn, args, kwargs))
+        if not self.idle.acquire(blocking=False):
+            with self.lock:
+                if len(self.threads) < self.max_workers:
+                    thread = threading.Thread(target=self._work, daemon=True)
+                    thread.start()
+                    self.threads.append(thread)
+        return future
+
+    def _work(self):
+        while True:
+            future, fn, args, kwargs = self.calls.get()
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(fn(*args, **kwargs))
+                except BaseException as error:  # pylint: disable=broad-except
+                    future.set_exception(error)
+            self.idle.release()
+
+
+class Handshake(asyncio.Protocol):
+    """
+    Protocol of a new connection until it is known which brick is connecting. When the first message is a
+    HelloRequest, the connection belongs to the brick it names, otherwise to the first brick that is not connected.
+    The connection is then handed over to the ClientSocketHandler of the brick, together with the bytes received
+    after the hello.
+    """
+
+    def __init__(self, server: 'ServerSockets'):
+        self.server = server
+        self.protocol = JsonProtocol()
+        self.transport = None
+        self.buffer = bytearray()
+        # the handler of the brick, once it has been chosen
+        self.handler = None
+
+    def connection_made(self, transport: asyncio.Transport):
+        self.transport = transport
+
+    def data_received(self, data: bytes):
+        self.buffer += data
+        if self.handler is not None or len(self.buffer) < self.protocol.message_size:
+            return
+
+        obj_dict = self.protocol.decode_message(bytes(self.buffer[:self.protocol.message_size]))
+        hello = None
+        if obj_dict['type'] == 'HelloRequest':
+            del self.buffer[:self.protocol.message_size]
+            hello = HelloRequest(obj_dict['robot'], obj_dict['brick'], obj_dict['resume'])
+
+        self.handler = self.server.connect_brick(hello)
+        if hello is not None:
+            self.transport.write(self.protocol.encode_response(self.handler is not None))
+        if self.handler is None:
+            self.transport.close()
+            return
+
+        if self.server.world_simulator.is_reset.is_set():
+            self._hand_over()
+        else:
+            # the brick may only send requests once the world it connects to has been reset
+            self.transport.pause_reading()
+            reset = asyncio.get_running_loop().run_in_executor(self.server.executor,
+                                                               self.server.world_simulator.wait_for_reset)
+            reset.add_done_callback(lambda _: self._hand_over())
+
+    def _hand_over(self):
+        """
+        Let the handler of the brick handle the connection from now on.
+        """
+        if self.transport.is_closing():
+            return
+        self.transport.set_protocol(self.handler)
+        self.handler.connection_made(self.transport)
+        self.transport.resume_reading()
+        if self.buffer:
+            self.handler.data_received(bytes(self.buffer))
+
+    def connection_lost(self, exc: Optional[Exception]):
+        if self.handler is not None:
+            # the connection was lost before it was handed over, so the brick is free again
+            self.handler.is_connected = False
+            self.server.handle_disconnect()
+
+
 class ServerSockets(threading.Thread):
     """
     Class responsible for listening to incoming socket connections from ev3dev2 mock processes.
+    All connections are handled by a single asyncio event loop running in this thread. Bricks that say which
+    brick they are can connect in any order, also at the same time.
     """
 
-    def __init__(self, world_simulator: WorldSimulator):
+    def __init__(self, world_simulator: WorldSimulator, port: int = None):
         threading.Thread.__init__(self)
         self.world_simulator = world_simulator
         self.brick_sockets = {}
         self.first_connected = False
 
+        # per brick create a ClientSocketHandler, which handles the connection of the brick once it connects
+        for robot_sim in self.world_simulator.robot_simulators:
+            for brick in robot_sim.robot.get_bricks():
+                self.brick_sockets[(robot_sim.robot.name, brick.name)] = ClientSocketHandler(
+                    robot_sim, brick.brick, brick.name, world_simulator.clock, world_simulator.lock_step,
+                    world_simulator.shared_state, world_simulator.command_queue)
+
+        # the configured socket port is used when no port is given, port 0 lets the OS pick a free port
+        self.port = port if port is not None else int(get_simulation_settings()['exec_settings']['socket_port'])
+        self.is_listening = threading.Event()
+
+        # seconds to wait for a brick to resume before resetting the world once all bricks are disconnected
+        self.resume_timeout = float(get_simulation_settings()['exec_settings']['resume_timeout'])
+        self.pending_reset = None
+        self.executor = None
+
     def run(self):
         """
-        Listen for incoming connections. When a connection is established spawn a ClientSocketHandler
-        to manage it. Multiple connections can be established at the same time.
+        Run the event loop listening for incoming connections.
         """
+        asyncio.run(self.serve())
+        print('Closing server')
 
-        port = int(get_simulation_settings()['exec_settings']['socket_port'])
+    async def serve(self):
+        """
+        Listen for incoming connections. Every connection is handled by the ClientSocketHandler of the brick it
+        belongs to. Multiple connections can be established at the same time.
+        """
+        # requests that block wait for the simulation in the executor, which needs a thread for each of them
+        self.executor = DaemonThreadPoolExecutor(max(1, len(self.brick_sockets)) * MAX_BLOCKING_REQUESTS)
+        for sock in self.brick_sockets.values():
+            sock.executor = self.executor
+            sock.on_disconnect = self.handle_disconnect
 
-        # per brick create a socket and let it be dealt with by a ClientSocketHandler thread
-        for robot_sim in self.world_simulator.robot_simulators:
-            for brick in robot_sim.robot.get_bricks():
-                sock = ClientSocketHandler(robot_sim, brick.brick, brick.name)
-                sock.daemon = True
-                sock.start()
-                self.brick_sockets[(robot_sim.robot.name, brick.name)] = sock
-
-        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        server.bind(('localhost', port))
-        server.listen(5)  # allows 5 unaccepted connections before refusing new connections
-        server.setblocking(False)
-        server.settimeout(1)
+        server = await asyncio.get_running_loop().create_server(lambda: Handshake(self), 'localhost', self.port,
+                                                                backlog=5)
+        self.port = server.sockets[0].getsockname()[1]
+        self.is_listening.set()
 
         print('Listening for connections...')
-        self.handle_sockets(server)
-        print('Closing server')
+        self.ask_to_connect()
+        async with server:
+            await server.serve_forever()
 
-    def handle_sockets(self, server):
+    def connect_brick(self, hello: Optional[HelloRequest]) -> Optional[ClientSocketHandler]:
         """
-        Checks if sockets are connected and find first socket that is not connected.
+        Reserve the brick a new connection belongs to. Called by the event loop.
+        :param hello: the HelloRequest naming the brick, None to take the first brick that is not connected.
+        :return: the ClientSocketHandler of the brick, None when there is no such brick or it is connected already.
         """
-        while True:
-            for (robot_name, brick_name), sock in self.brick_sockets.items():
-                if not sock.is_connected:
-                    if self.wait_for_brick_to_connect(robot_name, brick_name, sock, server):
-                        break
-            time.sleep(.1)
+        brick = next((key for key, sock in self.brick_sockets.items() if not sock.is_connected
+                      and (hello is None or hello.robot is None or hello.robot == key[0])
+                      and (hello is None or hello.brick is None or hello.brick == key[1])), None)
+        if brick is None:
+            if hello is None:
+                print('All bricks are connected already, refusing connection')
+            else:
+                print(f'No brick \"{hello.brick}\" from robot \"{hello.robot}\" to connect, refusing connection')
+            return None
+
+        resume = hello is not None and hello.resume
+        if self.pending_reset is not None:
+            self.pending_reset.cancel()
+            self.pending_reset = None
+            if not resume:
+                self.reset_world()
+
+        robot_name, brick_name = brick
+        sock = self.brick_sockets[brick]
+        # reserve the brick right away, the connection is handed over once the brick has been chosen
+        sock.is_connected = True
+        self.first_connected = True
+        print(f'Connection from \"{brick_name}\" from robot \"{robot_name}\" '
+              f'{"resumed" if resume else "accepted"}\n')
+        self.ask_to_connect()
+        return sock
 
-    def wait_for_brick_to_connect(self, robot_name, brick_name, sock, server):
+    def handle_disconnect(self):
         """
-        Wait for a specific brick to connect.
+        Reset the world once all bricks are disconnected and none of them resumed in time. Called by the event loop
+        when a connection is lost.
         """
-        print(f'Please connect brick "{brick_name}" from robot "{robot_name}"')
-        while True:
-            try:
-                (client, _) = server.accept()
-                self.first_connected = True
-                print(
-                    f'Connection from \"{brick_name}\" from robot \"{robot_name}\" '
-                    'accepted\n')
-                sock.client = client
-                sock.is_connected = True
-                return False  # should not restart connection procedure
-            except socket.timeout:
-                pass
-            if self.all_sockets_are_disconnected(self.brick_sockets.values()) and self.first_connected:
-                print('All bricks are disconnected. Resetting world.')
-                self.world_simulator.request_reset()
-                self.first_connected = False
-                return True  # should restart connection procedure
+        if self.all_sockets_are_disconnected(self.brick_sockets.values()) and self.first_connected:
+            if self.resume_timeout > 0:
+                self.pending_reset = asyncio.get_running_loop().call_later(self.resume_timeout, self.reset_world)
+            else:
+                self.reset_world()
+        self.ask_to_connect()
+
+    def reset_world(self):
+        """
+        Reset the world, all bricks are disconnected.
+        """
+        print('All bricks are disconnected. Resetting world.')
+        self.pending_reset = None
+        self.world_simulator.request_reset()
+        self.first_connected = False
+
+    def ask_to_connect(self):
+        """
+        Ask to connect the bricks that are not connected, if any.
+        """
+        for (robot_name, brick_name), sock in self.brick_sockets.items():
+            if not sock.is_connected:
+                print(f'Please connect brick "{brick_name}" from robot "{robot_name}"')
 
     @staticmethod
     def all_sockets_are_disconnected(sockets):
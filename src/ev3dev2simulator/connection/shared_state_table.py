@@ -0,0 +1,125 @@
+"""
+The shared_state_table module contains the class SharedStateTable, a block of shared memory in which the simulator
+publishes the state of a brick, so programs on the same machine can read it without any request.
+"""
+
+import struct
+import time
+from multiprocessing import shared_memory
+from multiprocessing import resource_tracker
+from typing import List, Optional
+
+
+class SharedStateTable:
+    """
+    A SharedStateTable has a fixed layout: a sequence number and the number of the frame, followed by a float
+    for every address of the brick. The addresses are those of the sensors and motors in the robot configuration,
+    so the layout is known once the brick connected and does not change while it is connected.
+
+    The simulator is the only writer. The table is protected by a sequence lock: the writer makes the sequence
+    number odd before writing and even again afterwards, and a reader retries until it read the same even sequence
+    number before and after reading a value. Readers never block the writer, and give up when the sequence number
+    stays odd, because the simulator stopped while writing.
+    """
+
+    HEADER = struct.Struct('=Qq')
+    VALUE = struct.Struct('=d')
+    # number of times a reader retries before giving up, yielding to the writer in between
+    MAX_READ_ATTEMPTS = 10000
+
+    # names of the tables created by this process, which are tracked already
+    created_names = set()
+
+    def __init__(self, shm: shared_memory.SharedMemory, addresses: List[str], owner: bool):
+        self.shm = shm
+        self.buf = shm.buf
+        self.addresses = list(addresses)
+        self.offsets = {address: self.HEADER.size + index * self.VALUE.size
+                        for index, address in enumerate(self.addresses)}
+        self.values = struct.Struct(f'={len(self.addresses)}d')
+        self.owner = owner
+        self.sequence = 0
+
+    @classmethod
+    def create(cls, addresses: List[str]) -> 'SharedStateTable':
+        """
+        Create a new table for the given addresses. Only the simulator creates tables.
+        :param addresses: of the sensors and motors of the brick, in the order of the layout.
+        :return: the table, of which the name is used by readers to attach.
+        """
+        size = cls.HEADER.size + len(addresses) * cls.VALUE.size
+        table = cls(shared_memory.SharedMemory(create=True, size=size), addresses, True)
+        table.HEADER.pack_into(table.buf, 0, 0, -1)
+        cls.created_names.add(table.name)
+        return table
+
+    @classmethod
+    def attach(cls, name: str, addresses: List[str]) -> 'SharedStateTable':
+        """
+        Attach to the table created by the simulator.
+        :param name: of the shared memory block.
+        :param addresses: of the layout, as given by the simulator.
+        :return: the table.
+        """
+        try:
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # before Python 3.13 every process attaching is tracked and would remove the block on exit
+            shm = shared_memory.SharedMemory(name=name)
+            if name not in cls.created_names:
+                resource_tracker.unregister(shm._name, 'shared_memory')  # pylint: disable=protected-access
+        return cls(shm, addresses, False)
+
+    @property
+    def name(self) -> str:
+        """
+        Name of the shared memory block.
+        """
+        return self.shm.name
+
+    def publish(self, frame: int, values: List[float]):
+        """
+        Write the values of a frame, in the order of the addresses of the layout.
+        :param frame: the number of the frame the values belong to.
+        :param values: to write, None is written as NaN.
+        """
+        self.sequence += 1
+        self.HEADER.pack_into(self.buf, 0, self.sequence, frame)
+        self.values.pack_into(self.buf, self.HEADER.size,
+                              *[float('nan') if value is None else value for value in values])
+        self.sequence += 1
+        self.HEADER.pack_into(self.buf, 0, self.sequence, frame)
+
+    def read(self, address: str) -> float:
+        """
+        Read the latest value of the given address.
+        :param address: of a sensor or motor in the layout.
+        :return: the value.
+        """
+        return self.read_with_frame(address)[1]
+
+    def read_with_frame(self, address: str) -> (Optional[int], float):
+        """
+        Read the latest value of the given address and the frame it belongs to.
+        :param address: of a sensor or motor in the layout.
+        :return: the frame, None when nothing has been published yet, and the value.
+        """
+        offset = self.offsets[address]
+        for _ in range(self.MAX_READ_ATTEMPTS):
+            sequence, frame = self.HEADER.unpack_from(self.buf, 0)
+            if not sequence & 1:
+                value = self.VALUE.unpack_from(self.buf, offset)[0]
+                if self.HEADER.unpack_from(self.buf, 0)[0] == sequence:
+                    return (frame if frame >= 0 else None), value
+            time.sleep(0)
+        raise RuntimeError(f'shared state table {self.name} is not written completely')
+
+    def close(self):
+        """
+        Stop using the table. The simulator also removes the block, readers that are still attached keep their view.
+        """
+        self.buf = None
+        self.shm.close()
+        if self.owner:
+            self.created_names.discard(self.name)
+            self.shm.unlink()
@@ -0,0 +1,340 @@
+"""
+The wire_protocol module contains the protocols used to exchange messages between the ev3dev2 API and the simulator.
+The protocol of a connection is negotiated with a ProtocolRequest when the connection is set up.
+"""
+
+import json
+import socket
+import struct
+from typing import Any, Optional, Tuple
+
+from ev3dev2simulator.config.config import get_simulation_settings
+
+# names of the supported protocols, in order of preference
+PROTOCOL_NAMES = ('binary', 'json')
+
+# request id of the values pushed by the simulator on multiplexed connections, real requests start at 1
+PUSH_REQUEST_ID = 0
+
+
+def receive_exactly(sock: socket.socket, size: int) -> Optional[bytes]:
+    """
+    Receive exactly the given number of bytes from a stream socket.
+    :param sock: to receive from.
+    :param size: number of bytes to receive.
+    :return: the received bytes or None when the connection has been closed.
+    """
+    data = sock.recv(size)
+    if not data:
+        return None
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return data
+
+
+class JsonProtocol:
+    """
+    The original protocol. Every message is a JSON object padded with '#' to the configured message size
+    and every response is a JSON object containing the value. Request ids are not send, so a response always
+    belongs to the last request and only a single request can be in flight.
+    """
+
+    name = 'json'
+    multiplexed = False
+    # responses are read in a single chunk of 32 bytes, so long values do not fit
+    framed = False
+
+    def __init__(self):
+        self.message_size = int(get_simulation_settings()['exec_settings']['message_size'])
+
+    def encode_message(self, obj_dict: dict, _request_id: int = 0) -> bytes:
+        """
+        Encode a serialized message so it can be send via a stream channel.
+        :param obj_dict: the message serialized into a dictionary.
+        :return: bytes representing the message.
+        """
+        jsn = json.dumps(obj_dict)
+        jsn = jsn.ljust(self.message_size, '#')
+        return str.encode(jsn)
+
+    @staticmethod
+    def decode_message(data: bytes) -> dict:
+        """
+        Decode a message received from the stream channel.
+        :param data: the bytes of the message.
+        :return: the message serialized into a dictionary.
+        """
+        jsn = data.decode()
+        jsn = jsn.replace('#', '')
+        return json.loads(jsn)
+
+    def receive_message(self, sock: socket.socket) -> Optional[Tuple[int, dict]]:
+        """
+        Receive and decode the next message.
+        :param sock: to receive from.
+        :return: the request id, always 0, and the message serialized into a dictionary
+        or None when the connection has been closed.
+        """
+        data = sock.recv(self.message_size)
+        if not data:
+            return None
+        return 0, self.decode_message(data)
+
+    def next_message(self, buffer: bytearray) -> Optional[Tuple[int, dict]]:
+        """
+        Take the next complete message out of the given buffer of received bytes.
+        :param buffer: the bytes received so far, from which the message is removed.
+        :return: the request id, always 0, and the message serialized into a dictionary
+        or None when the buffer does not contain a complete message yet.
+        """
+        if len(buffer) < self.message_size:
+            return None
+        data = bytes(buffer[:self.message_size])
+        del buffer[:self.message_size]
+        return 0, self.decode_message(data)
+
+    @staticmethod
+    def encode_response(value: Any) -> bytes:
+        """
+        Encode the value of a response.
+        :param value: to encode.
+        :return: bytes representing the response.
+        """
+        return str.encode(json.dumps({'value': value}))
+
+    @staticmethod
+    def decode_response(data: bytes) -> Any:
+        """
+        Decode the value of a response.
+        :param data: the bytes of the response.
+        :return: the value.
+        """
+        return json.loads(data.decode())['value']
+
+    @staticmethod
+    def frame(response: bytes, _request_id: int) -> bytes:
+        """
+        Prepare an encoded response to be send, which is send as is.
+        :param response: the encoded response.
+        :return: bytes to send.
+        """
+        return response
+
+    def receive_response(self, sock: socket.socket) -> Tuple[int, Any]:
+        """
+        Receive and decode a response.
+        :param sock: to receive from.
+        :return: the request id, always 0, and the value of the response.
+        """
+        return 0, self.decode_response(sock.recv(32))
+
+
+class BinaryProtocol:
+    """
+    A compact protocol in which every message and response is a frame prefixed with its length and a request id.
+    The messages send most often are packed with struct behind a single byte opcode, other messages are send as JSON.
+    Responses start with a single byte telling the type of the value and carry the id of their request, so multiple
+    requests can be in flight on a single connection and the simulator can answer them in any order.
+    """
+
+    name = 'binary'
+    multiplexed = True
+    framed = True
+
+    # length of the payload and request id
+    HEADER = struct.Struct('!II')
+
+    OP_JSON = 0
+    OP_DATA_REQUEST = 1
+    OP_ROTATE_COMMAND = 2
+    OP_STOP_COMMAND = 3
+    OP_LED_COMMAND = 4
+    OP_TIME_REQUEST = 5
+    OP_WAIT_REQUEST = 6
+
+    ROTATE_COMMAND = struct.Struct('!BddB')
+    STOP_COMMAND = struct.Struct('!BdB')
+    LED_COMMAND = struct.Struct('!Bd')
+    WAIT_REQUEST = struct.Struct('!Bd')
+
+    STOP_ACTIONS = ('coast', 'brake', 'hold')
+
+    VALUE_NONE = b'n'
+    VALUE_INT = b'i'
+    VALUE_FLOAT = b'f'
+    VALUE_JSON = b'j'
+
+    INT = struct.Struct('!q')
+    FLOAT = struct.Struct('!d')
+
+    def frame(self, payload: bytes, request_id: int) -> bytes:
+        """
+        Put the given payload, an encoded message or response, in a frame.
+        :param payload: the bytes of the frame without header.
+        :param request_id: id of the request the payload belongs to.
+        :return: bytes to send.
+        """
+        return self.HEADER.pack(len(payload), request_id) + payload
+
+    def _receive_frame(self, sock: socket.socket) -> Optional[Tuple[int, bytes]]:
+        header = receive_exactly(sock, self.HEADER.size)
+        if header is None:
+            return None
+        size, request_id = self.HEADER.unpack(header)
+        payload = receive_exactly(sock, size) if size else b''
+        if payload is None:
+            return None
+        return request_id, payload
+
+    def encode_message(self, obj_dict: dict, request_id: int = 0) -> bytes:
+        """
+        Encode a serialized message into a frame. Messages that cannot be packed are send as JSON.
+        :param obj_dict: the message serialized into a dictionary.
+        :param request_id: id of the request, which is send back with the response.
+        :return: bytes representing the message.
+        """
+        try:
+            payload = self._pack_message(obj_dict)
+        except (struct.error, ValueError, AttributeError):
+            payload = None
+        if payload is None:
+            payload = bytes([self.OP_JSON]) + str.encode(json.dumps(obj_dict))
+        return self.frame(payload, request_id)
+
+    def _pack_message(self, obj_dict: dict) -> Optional[bytes]:
+        """
+        Pack a message behind its opcode.
+        :return: the packed message or None if there is no opcode for the message.
+        """
+        tpe = obj_dict['type']
+        if tpe == 'DataRequest' and not obj_dict.get('with_frame'):
+            return bytes([self.OP_DATA_REQUEST]) + obj_dict['address'].encode()
+        if tpe == 'RotateCommand':
+            return self.ROTATE_COMMAND.pack(self.OP_ROTATE_COMMAND, obj_dict['speed'], obj_dict['distance'],
+                                            self.STOP_ACTIONS.index(obj_dict['stop_action'])) \
+                + obj_dict['address'].encode()
+        if tpe == 'StopCommand':
+            return self.STOP_COMMAND.pack(self.OP_STOP_COMMAND, obj_dict['speed'],
+                                          self.STOP_ACTIONS.index(obj_dict['stop_action'])) \
+                + obj_dict['address'].encode()
+        if tpe == 'LedCommand':
+            return self.LED_COMMAND.pack(self.OP_LED_COMMAND, obj_dict['brightness']) + obj_dict['address'].encode()
+        if tpe == 'TimeRequest':
+            return bytes([self.OP_TIME_REQUEST])
+        if tpe == 'WaitRequest':
+            return self.WAIT_REQUEST.pack(self.OP_WAIT_REQUEST, obj_dict['until'])
+        return None
+
+    def decode_message(self, payload: bytes) -> dict:
+        """
+        Decode the payload of a frame into the same dictionary the message was serialized into.
+        :param payload: the bytes of the frame without header.
+        :return: the message serialized into a dictionary.
+        """
+        opcode = payload[0]
+        if opcode == self.OP_DATA_REQUEST:
+            return {'type': 'DataRequest', 'address': payload[1:].decode()}
+        if opcode == self.OP_ROTATE_COMMAND:
+            _, speed, distance, stop_action = self.ROTATE_COMMAND.unpack_from(payload)
+            return {'type': 'RotateCommand', 'address': payload[self.ROTATE_COMMAND.size:].decode(),
+                    'speed': speed, 'distance': distance, 'stop_action': self.STOP_ACTIONS[stop_action]}
+        if opcode == self.OP_STOP_COMMAND:
+            _, speed, stop_action = self.STOP_COMMAND.unpack_from(payload)
+            return {'type': 'StopCommand', 'address': payload[self.STOP_COMMAND.size:].decode(),
+                    'speed': speed, 'stop_action': self.STOP_ACTIONS[stop_action]}
+        if opcode == self.OP_LED_COMMAND:
+            _, brightness = self.LED_COMMAND.unpack_from(payload)
+            return {'type': 'LedCommand', 'address': payload[self.LED_COMMAND.size:].decode(),
+                    'brightness': brightness}
+        if opcode == self.OP_TIME_REQUEST:
+            return {'type': 'TimeRequest'}
+        if opcode == self.OP_WAIT_REQUEST:
+            return {'type': 'WaitRequest', 'until': self.WAIT_REQUEST.unpack(payload)[1]}
+        return json.loads(payload[1:].decode())
+
+    def receive_message(self, sock: socket.socket) -> Optional[Tuple[int, dict]]:
+        """
+        Receive and decode the next message.
+        :param sock: to receive from.
+        :return: the request id and the message serialized into a dictionary
+        or None when the connection has been closed.
+        """
+        frame = self._receive_frame(sock)
+        if frame is None:
+            return None
+        request_id, payload = frame
+        return request_id, self.decode_message(payload)
+
+    def next_message(self, buffer: bytearray) -> Optional[Tuple[int, dict]]:
+        """
+        Take the next complete frame out of the given buffer of received bytes and decode its message.
+        :param buffer: the bytes received so far, from which the frame is removed.
+        :return: the request id and the message serialized into a dictionary
+        or None when the buffer does not contain a complete frame yet.
+        """
+        if len(buffer) < self.HEADER.size:
+            return None
+        size, request_id = self.HEADER.unpack_from(buffer)
+        end = self.HEADER.size + size
+        if len(buffer) < end:
+            return None
+        payload = bytes(buffer[self.HEADER.size:end])
+        del buffer[:end]
+        return request_id, self.decode_message(payload)
+
+    def encode_response(self, value: Any) -> bytes:
+        """
+        Encode the value of a response. The response still has to be put in a frame with the id of its request.
+        :param value: to encode.
+        :return: bytes representing the response.
+        """
+        if value is None:
+            payload = self.VALUE_NONE
+        elif isinstance(value, float):
+            payload = self.VALUE_FLOAT + self.FLOAT.pack(value)
+        elif isinstance(value, int) and not isinstance(value, bool) and -2 ** 63 <= value < 2 ** 63:
+            payload = self.VALUE_INT + self.INT.pack(value)
+        else:
+            payload = self.VALUE_JSON + str.encode(json.dumps(value))
+        return payload
+
+    def decode_response(self, payload: bytes) -> Any:
+        """
+        Decode the value of a response.
+        :param payload: the bytes of the frame without header.
+        :return: the value.
+        """
+        tag = payload[:1]
+        if tag == self.VALUE_FLOAT:
+            return self.FLOAT.unpack_from(payload, 1)[0]
+        if tag == self.VALUE_INT:
+            return self.INT.unpack_from(payload, 1)[0]
+        if tag == self.VALUE_NONE:
+            return None
+        return json.loads(payload[1:].decode())
+
+    def receive_response(self, sock: socket.socket) -> Tuple[int, Any]:
+        """
+        Receive and decode the next response.
+        :param sock: to receive from.
+        :return: the id of the request the response belongs to and the value of the response.
+        """
+        frame = self._receive_frame(sock)
+        if frame is None:
+            raise ConnectionError('Connection closed while waiting for a response')
+        request_id, payload = frame
+        return request_id, self.decode_response(payload)
+
+
+def create_protocol(name: str):
+    """
+    Create the protocol with the given name.
+    :param name: of the protocol, one of PROTOCOL_NAMES.
+    :return: the protocol.
+    """
+    if name == BinaryProtocol.name:
+        return BinaryProtocol()
+    return JsonProtocol()
@@ -0,0 +1,83 @@
+"""
+Singleton module clock_connector contains the class ClockConnector and the function get_clock_connector to get the
+instance.
+"""
+
+import sys
+import time
+
+from ev3dev2simulator.connection.client_socket import get_client_socket
+from ev3dev2simulator.connection.message.time_request import TimeRequest
+from ev3dev2simulator.connection.message.wait_request import WaitRequest
+
+THIS = sys.modules[__name__]
+
+
+class ClockConnector:
+    """
+    The ClockConnector class provides a translation layer between the timing of the ev3dev2 API
+    and the clock of the simulator. When the simulator runs with a virtual clock, for example in turbo mode,
+    time is read from and waited for on the simulator instead of the wall clock.
+    Which clock is used is decided once, when the clock is first used, connecting to the simulator if needed.
+    Times measured before and after, for example by a StopWatch started before the first device is created,
+    therefore always come from the same clock.
+    """
+
+    def __init__(self):
+        self.client_socket = None
+        self.is_virtual = False
+
+    def _use_simulator_clock(self) -> bool:
+        """
+        Determine whether the clock of the simulator should be used. This is asked once to the simulator,
+        connecting to it if this process is not connected yet.
+        :return: True if the simulator has a virtual clock.
+        """
+        if self.client_socket is None:
+            self.client_socket = get_client_socket()
+            self.is_virtual = self.client_socket.send_command(TimeRequest(), True) is not None
+        return self.is_virtual
+
+    def uses_simulator_clock(self) -> bool:
+        """
+        Check whether the clock of the simulator is used. Its time only passes while the program sends requests,
+        which in lock-step mode also decide in which frame the program reads its sensors.
+        :return: True if the simulator has a virtual clock.
+        """
+        return self._use_simulator_clock()
+
+    def time(self) -> float:
+        """
+        Get the current time, the replacement of time.time().
+        :return: the time in seconds.
+        """
+        if not self._use_simulator_clock():
+            return time.time()
+        return self.client_socket.send_command(TimeRequest(), True)
+
+    def sleep(self, seconds: float):
+        """
+        Suspend execution for the given number of seconds, the replacement of time.sleep().
+        The simulator is asked to wait frame by frame, so other threads can use the connection in between.
+        :param seconds: to sleep.
+        """
+        if not self._use_simulator_clock():
+            time.sleep(seconds)
+            return
+
+        now = self.time()
+        until = round(now + seconds, 6)
+        while now is not None and now < until:
+            now = self.client_socket.send_command(WaitRequest(until), True)
+
+
+THIS.CLOCK_CONNECTOR = None
+
+
+def get_clock_connector() -> ClockConnector:
+    """
+    Functionality to make ClockConnector a singleton. Creates it if it does not exists and returns it either way.
+    """
+    if not THIS.CLOCK_CONNECTOR:
+        THIS.CLOCK_CONNECTOR = ClockConnector()
+    return THIS.CLOCK_CONNECTOR
@@ -2,19 +2,25 @@
 The module sensor_connector contains the class SensorConnector.
 """
 
-import time
-from typing import Any
+from typing import Any, List
 
 from ev3dev2simulator.config.config import get_simulation_settings
 from ev3dev2simulator.connection.client_socket import get_client_socket
 from ev3dev2simulator.connection.message.data_request import DataRequest
+from ev3dev2simulator.connection.message.events_request import EventsRequest
+from ev3dev2simulator.connection.message.values_request import ValuesRequest
+from ev3dev2simulator.connector.clock_connector import get_clock_connector
+from ev3dev2simulator.connector.sensor_hub import get_sensor_hub
 
 
 class SensorConnector:
     """
     The SensorConnector class provides a translation layer between the ev3dev2 sensor classes
     and the sensors on the simulated robot. This includes sensor data.
-    This class is responsible for creating DataRequests to be send to simulator.
+    This class is responsible for creating DataRequests to be send to simulator, or for reading the value from
+    the snapshot shared by all sensors or from the values streamed by the simulator when the protocol allows it.
+    Values are only streamed or read from shared memory when the program uses the wall clock.
+    When the simulator shares memory, the value is read from its shared memory table instead.
     """
 
     def __init__(self, address: str):
@@ -23,6 +29,19 @@ class SensorConnector:
             raise RuntimeError('created connector with None as address')
 
         self.client_socket = get_client_socket()
+        self.clock = get_clock_connector()
+        # the hub is used when the protocol allows responses with the values of all sensors
+        self.hub = get_sensor_hub() if self.client_socket.protocol.framed else None
+        # the shared state and streamed values change in between requests, so with the clock of the simulator every
+        # read is a request that counts against the frame, which lets a program busy reading a sensor advance
+        # the simulation
+        uses_simulator_clock = self.clock.uses_simulator_clock()
+        self.shared_state_table = self.hub.get_shared_state_table() \
+            if self.hub is not None and not uses_simulator_clock else None
+        self.is_streamed = self.shared_state_table is None and self.hub is not None and self.hub.can_stream() \
+            and not uses_simulator_clock
+        if self.is_streamed:
+            self.hub.subscribe(self.address)
 
         self.wait_time = 0.008
         self.frame_time = 1 / int(get_simulation_settings()['exec_settings']['frames_per_second'])
@@ -35,28 +54,56 @@ class SensorConnector:
         """
         Get data of the simulated sensor at the given address if required. Provides caching whenever a second request
         would result in the same answer as the first, because they happened in such quick succession that the
-        simulator data could not possibly have changed yet. :return: the value in any form of the sensor.
+        simulator data could not possibly have changed yet. A streamed sensor always returns the latest value
+        received from the simulator. :return: the value in any form of the sensor.
         """
+        if self.shared_state_table is not None:
+            return int(self.shared_state_table.read(self.address))
+        if self.is_streamed:
+            return int(self.hub.get_latest_value(self.address))
 
-        now = time.time()
+        now = self.clock.time()
         delta = now - self.last_request_time
 
         self.delta_sum += delta
         self.last_request_time = now
 
-        if delta > self.frame_time or self.delta_sum > self.frame_time:
+        if self.value_cache is None or delta > self.frame_time or self.delta_sum > self.frame_time:
             self.delta_sum = 0
-            self.value_cache = self.send_command()
+            self.value_cache = self.send_command(now)
 
         else:
-            time.sleep(self.wait_time)
+            self.clock.sleep(self.wait_time)
 
         return int(self.value_cache)
 
-    def send_command(self) -> Any:
+    def send_command(self, now: float) -> Any:
         """
         Get data of the simulated sensor at the given address.
+        :param now: the current time in seconds.
         :return: the value in any form of the sensor.
         """
+        if self.hub is not None:
+            return self.hub.get_value(self.address, now)
+
         request = DataRequest(self.address)
         return self.client_socket.send_command(request, True)
+
+    def get_mode_values(self, mode: str) -> List[float]:
+        """
+        Get the values of the simulated sensor in the given mode, for sensors of which the values depend on their mode.
+        These are always requested, as only the value of the default mode is streamed or shared.
+        :param mode: of the sensor.
+        :return: the values, as read from value0, value1, ... in that mode.
+        """
+        return self.client_socket.send_command(ValuesRequest(self.address, mode), True)
+
+    def get_events(self, after_frame: int) -> dict:
+        """
+        Get the events of the simulated sensor after the given frame, for sensors that report events such as the
+        presses and releases of a touch sensor. These are kept by the simulator, so no event is missed between
+        two requests.
+        :param after_frame: the frame after which the events happened, -1 for all events the simulator remembers.
+        :return: a dictionary containing the events and the current frame.
+        """
+        return self.client_socket.send_command(EventsRequest(self.address, after_frame), True)
@@ -0,0 +1,143 @@
+"""
+Singleton module sensor_hub contains the class SensorHub and the function get_sensor_hub to get the instance.
+"""
+
+import sys
+import threading
+from typing import Any, Optional
+
+from ev3dev2simulator.config.config import get_simulation_settings
+from ev3dev2simulator.connection.client_socket import get_client_socket
+from ev3dev2simulator.connection.message.shared_state_request import SharedStateRequest
+from ev3dev2simulator.connection.message.snapshot_request import SnapshotRequest
+from ev3dev2simulator.connection.shared_state_table import SharedStateTable
+from ev3dev2simulator.connection.message.subscribe_request import SubscribeRequest
+from ev3dev2simulator.connector.clock_connector import get_clock_connector
+
+THIS = sys.modules[__name__]
+
+
+class SensorHub:
+    """
+    The SensorHub class lets all sensors of the ev3dev2 API share a snapshot of the values of all sensors of the brick.
+    The snapshot is requested with a single SnapshotRequest at most once per simulated frame, so reading several
+    sensors in a control loop costs a single round trip instead of one per sensor.
+
+    On a multiplexed connection, sensors can be streamed instead: the hub subscribes to them and the simulator pushes
+    their values whenever they change. Reading a streamed sensor is a lookup in the table of latest values, without
+    any round trip at all.
+
+    When the simulator shares memory, sensors are read directly from the table in which the simulator publishes
+    the state of the brick every frame, which is preferred over streaming.
+    """
+
+    def __init__(self):
+        self.client_socket = get_client_socket()
+        self.clock = get_clock_connector()
+        self.frame_time = 1 / int(get_simulation_settings()['exec_settings']['frames_per_second'])
+
+        self.values = None
+        self.valid_until = 0
+
+        # threads reading sensors at the same time share a single request
+        self.lock = threading.Lock()
+
+        # latest frame and value of every streamed sensor by address
+        self.latest_values = {}
+        self.subscriptions = set()
+        self.latest_values_lock = threading.Lock()
+
+        self.shared_state_table = None
+        self.shared_state_requested = False
+
+    def get_shared_state_table(self) -> Optional[SharedStateTable]:
+        """
+        Get the table in shared memory in which the simulator publishes the state of the brick.
+        The table is requested from the simulator only once.
+        :return: the table or None when the simulator does not share memory.
+        """
+        with self.lock:
+            if not self.shared_state_requested:
+                self.shared_state_requested = True
+                layout = self.client_socket.send_command(SharedStateRequest(), True)
+                if layout is not None:
+                    self.shared_state_table = SharedStateTable.attach(layout['name'], layout['addresses'])
+            return self.shared_state_table
+
+    def can_stream(self) -> bool:
+        """
+        Check if sensors can be streamed, which requires a multiplexed protocol.
+        """
+        return self.client_socket.protocol.multiplexed
+
+    def subscribe(self, address: str):
+        """
+        Stream the values of the sensor at the given address from now on.
+        :param address: of the sensor.
+        """
+        with self.lock:
+            if address in self.subscriptions:
+                return
+            self.subscriptions.add(address)
+            self.client_socket.start_receiver(self._update_latest_values)
+            # the subscription replaces the previous one, with all values in the response
+            update = self.client_socket.send_command(SubscribeRequest(sorted(self.subscriptions)), True)
+        self._update_latest_values(update)
+
+    def get_latest_value(self, address: str) -> Any:
+        """
+        Get the latest value of the streamed sensor at the given address.
+        :param address: of the sensor.
+        :return: the value in any form of the sensor.
+        """
+        return self.latest_values[address][1]
+
+    def _update_latest_values(self, update: dict):
+        """
+        Update the table of latest values with the values of a response or a push. These may arrive out of order,
+        so a value is only replaced by a value of the same or a later frame.
+        """
+        frame = update['frame'] or 0
+        with self.latest_values_lock:
+            for address, value in update['values'].items():
+                if address not in self.latest_values or self.latest_values[address][0] <= frame:
+                    self.latest_values[address] = (frame, value)
+
+    def get_value(self, address: str, now: float) -> Any:
+        """
+        Get the value of the sensor at the given address from the snapshot of the current frame.
+        A new snapshot is requested when the simulator may have simulated a frame since the last one.
+        :param address: of the sensor.
+        :param now: the current time in seconds of the clock used by the API.
+        :return: the value in any form of the sensor.
+        """
+        with self.lock:
+            if self.values is None or now >= self.valid_until:
+                self._update(now)
+            return self.values[address]
+
+    def _update(self, now: float):
+        """
+        Request a new snapshot and determine until when it is valid.
+        """
+        snapshot = self.client_socket.send_command(SnapshotRequest(), True)
+        self.values = snapshot['values']
+
+        frame = snapshot['frame']
+        if self.clock.is_virtual and frame is not None:
+            # with a virtual clock, the values are valid exactly until the next frame has been simulated
+            self.valid_until = round((frame + 1) * self.frame_time, 6)
+        else:
+            self.valid_until = now + self.frame_time
+
+
+THIS.SENSOR_HUB = None
+
+
+def get_sensor_hub() -> SensorHub:
+    """
+    Functionality to make SensorHub a singleton. Creates it if it does not exists and returns it either way.
+    """
+    if not THIS.SENSOR_HUB:
+        THIS.SENSOR_HUB = SensorHub()
+    return THIS.SENSOR_HUB
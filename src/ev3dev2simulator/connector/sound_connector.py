@@ -4,7 +4,6 @@ The module sound_connector contains the classes SimpleAudioError and SoundConnec
 
 
 import textwrap
-from time import sleep
 from typing import Any, Optional
 import threading
 import wave
@@ -15,6 +14,7 @@ import simpleaudio as sa
 
 from ev3dev2simulator.connection.client_socket import get_client_socket
 from ev3dev2simulator.connection.message.sound_command import SoundCommand
+from ev3dev2simulator.connector.clock_connector import get_clock_connector
 
 
 class SimpleaudioError(Exception):
@@ -42,6 +42,7 @@ class SoundConnector:
 
     def __init__(self, play_actual_sound=True):
         self.client_socket = get_client_socket()
+        self.clock = get_clock_connector()
         self.play_actual_sound = play_actual_sound
 
     def _linux_beep(self, tone_sequence) -> Any:
@@ -67,7 +68,7 @@ class SoundConnector:
                     play_obj.wait_done()
                 except SimpleaudioError:
                     print("An error occurred when trying to play a file. Ignoring to keep simulation running")
-            sleep(delay / 1000.0)
+            self.clock.sleep(delay / 1000.0)
 
     def beep(self, args, play_type: int) -> Optional[threading.Thread]:
         """
@@ -0,0 +1,68 @@
+"""
+The headless_runner module contains the class HeadlessRunner, which runs the simulation without a window.
+It is the counterpart of the Visualiser for machines without a display, e.g. when running on a CI server.
+"""
+
+import time
+from typing import Callable
+
+from ev3dev2simulator.config.config import get_simulation_settings
+from ev3dev2simulator.state.world_simulator import WorldSimulator
+from ev3dev2simulator.state.world_state import WorldState
+
+
+class HeadlessRunner:
+    """
+    Drives the world simulator from its own loop at the configured frames per second.
+    No sprites are created and arcade/pyglet are never imported, so no X server is required.
+    In turbo mode, frames are simulated as fast as possible instead.
+    """
+
+    def __init__(self, world_sim: WorldSimulator, world_state: WorldState, turbo: bool = False):
+        self.world_simulator = world_sim
+        self.world_state = world_state
+        self.turbo = turbo
+
+        exec_settings = get_simulation_settings()['exec_settings']
+        self.frame_time = 1 / int(exec_settings['frames_per_second'])
+        self.max_catch_up_frames = max(1, int(exec_settings['max_catch_up_frames']))
+        self.is_running = False
+
+    def setup(self):
+        """
+        Set up the physical objects of the world. All sensors derive their position from the pymunk bodies.
+        """
+        self.world_state.setup_pymunk_shapes()
+
+    def run(self, max_frames: int = None, on_update: Callable[[], None] = None):
+        """
+        Update the world every frame until stopped or until max_frames frames have been simulated. In lock-step mode an
+        update simulates no frame while the bricks have not acknowledged the previous one.
+        When simulating falls behind the wall clock, frames are simulated without waiting until it has caught up,
+        but once it is more than max_catch_up_frames frames behind the time lost is dropped.
+        :param max_frames: the maximum number of frames to simulate, None to run until stopped.
+        :param on_update: optional function called after every update of the world.
+        """
+        self.is_running = True
+        frames = 0
+        next_frame_time = time.perf_counter()
+        while self.is_running and (max_frames is None or frames < max_frames):
+            frames += self.world_simulator.update()
+            if on_update is not None:
+                on_update()
+            if self.turbo:
+                continue
+
+            next_frame_time += self.frame_time
+            delay = next_frame_time - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            elif -delay > self.max_catch_up_frames * self.frame_time:
+                next_frame_time = time.perf_counter()
+        self.is_running = False
+
+    def stop(self):
+        """
+        Stop the simulation loop after the current frame.
+        """
+        self.is_running = False
@@ -3,10 +3,10 @@ The module board contains the class Board, the background of the playing field.
 """
 
 
-import arcade as _arcade
+import numpy as np
 
-from ev3dev2simulator.obstacle.color_obstacle import ColorObstacle
-from ev3dev2simulator.util.util import to_color_code
+from ev3dev2simulator.obstacle.color_obstacle import ColorObstacle, cover_rectangle
+from ev3dev2simulator.util.util import Color, PointList, get_rectangle_points, is_point_in_polygon, to_color_code
 
 
 class Board(ColorObstacle):
@@ -19,7 +19,7 @@ class Board(ColorObstacle):
                  y: float,
                  width: int,
                  height: int,
-                 color: _arcade.Color):
+                 color: Color):
         super(Board, self).__init__(to_color_code(color))
         self.x = x
         self.y = y
@@ -38,29 +38,36 @@ class Board(ColorObstacle):
         """
         return [self.shape]
 
-    def create_shape(self, scale):
+    def calc_points(self):
+        """
+        Calculate the points of the board, used for collision detection.
+        """
+        self.points = self._create_points()
+
+    def create_shape(self):
         """
         Creates the shape of the border.
         """
-        self.points = self._create_points(scale)
+        self.calc_points()
         self.shape = self._create_shape()
 
-    def _create_points(self, scale) -> _arcade.PointList:
+    def _create_points(self) -> PointList:
         """
         Create a list of points representing this rock in 2D space.
         :return: a PointList object.
         """
-        return _arcade.get_rectangle_points(self.x * scale,
-                                            self.y * scale,
-                                            self.width * scale,
-                                            self.height * scale,
-                                            self.angle)
+        return get_rectangle_points(self.x,
+                                    self.y,
+                                    self.width,
+                                    self.height)
 
-    def _create_shape(self) -> _arcade.Shape:
+    def _create_shape(self):
         """
         Create a shape representing the rectangle of this rock.
         :return: a Arcade shape object.
         """
+        # pylint: disable=import-outside-toplevel
+        import arcade as _arcade
 
         colors = []
 
@@ -77,4 +84,10 @@ class Board(ColorObstacle):
         :return: True if collision detected.
         """
 
-        return _arcade.is_point_in_polygon(x, y, self.points)
+        return is_point_in_polygon(x, y, self.points)
+
+    def cover(self, left: np.ndarray, bottom: np.ndarray, right: np.ndarray, top: np.ndarray) -> np.ndarray:
+        """
+        Check how the board covers the given cells.
+        """
+        return cover_rectangle(self.points, left, bottom, right, top)
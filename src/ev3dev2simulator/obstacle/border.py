@@ -2,10 +2,8 @@
 The module border contains the class Border. A class representing the colored border around the playing field.
 """
 
-import arcade as _arcade
-
 from ev3dev2simulator.obstacle.border_obstacle import BorderObstacle
-from ev3dev2simulator.util.util import to_color_code
+from ev3dev2simulator.util.util import Color, to_color_code
 
 
 class Border(BorderObstacle):
@@ -13,7 +11,7 @@ class Border(BorderObstacle):
     The outer line surrounding the playing field.
     """
 
-    def __init__(self, board_width, board_height, color: _arcade.Color, depth, edge_spacing):
+    def __init__(self, board_width, board_height, color: Color, depth, edge_spacing):
         super(Border, self).__init__(board_width, board_height, to_color_code(color), depth, edge_spacing)
 
         # visualisation
@@ -37,12 +35,15 @@ class Border(BorderObstacle):
 
         return cls(board_width, board_height, color, depth, spacing)
 
-    def create_shape(self, scale) -> [_arcade.Shape]:
+    def create_shape(self):
         """
         Create a list of shapes representing the four lines that make up this border.
         :return: a list of Arcade shapes.
         """
-        self._calc_points(scale)
+        # pylint: disable=import-outside-toplevel
+        import arcade as _arcade
+
+        self.calc_points()
         colors = [self.color for _ in range(4)]
         self.shapes = []
         for side in [self.top_points, self.right_points, self.bottom_points, self.left_points]:
@@ -3,9 +3,13 @@ The border_obstacle module contains the class BorderObstacle
 It is a class representing any obstacle acting as a square border.
 """
 
-import arcade as _arcade
+from typing import List
 
-from ev3dev2simulator.obstacle.color_obstacle import ColorObstacle
+import numpy as np
+import pymunk
+
+from ev3dev2simulator.obstacle.color_obstacle import ColorObstacle, cover_rectangle
+from ev3dev2simulator.util.util import get_rectangle_points, is_point_in_polygon
 
 
 class BorderObstacle(ColorObstacle):
@@ -26,46 +30,55 @@ class BorderObstacle(ColorObstacle):
         self.bottom_points = None
         self.left_points = None
 
-    def _calc_points(self, scale):
+    def calc_points(self):
         """
-        Calculate the points of the polygon this BorderObstacle consist of.
+        Calculate the points of the polygon this BorderObstacle consist of, in mm.
         """
 
-        screen_center_x = (self.rectangle_width / 2) * scale
-        screen_center_y = (self.rectangle_height / 2) * scale
+        screen_center_x = self.rectangle_width / 2
+        screen_center_y = self.rectangle_height / 2
 
-        screen_height = self.rectangle_height * scale
-        screen_width = self.rectangle_width * scale
+        screen_height = self.rectangle_height
+        screen_width = self.rectangle_width
 
-        draw_depth = self.depth * scale
+        draw_depth = self.depth
 
-        screen_edge_spacing = self.edge_spacing * scale
+        screen_edge_spacing = self.edge_spacing
 
         border_long_width = screen_width - screen_edge_spacing * 2
         border_long_height = screen_height - screen_edge_spacing * 2
 
-        self.top_points = _arcade.get_rectangle_points(screen_center_x,
-                                                       screen_height - screen_edge_spacing - (draw_depth / 2),
-                                                       border_long_width,
-                                                       draw_depth)
+        self.top_points = get_rectangle_points(screen_center_x,
+                                               screen_height - screen_edge_spacing - (draw_depth / 2),
+                                               border_long_width,
+                                               draw_depth)
 
-        self.right_points = _arcade.get_rectangle_points(screen_width - screen_edge_spacing - (draw_depth / 2),
-                                                         screen_center_y,
-                                                         draw_depth,
-                                                         border_long_height)
+        self.right_points = get_rectangle_points(screen_width - screen_edge_spacing - (draw_depth / 2),
+                                                 screen_center_y,
+                                                 draw_depth,
+                                                 border_long_height)
 
-        self.bottom_points = _arcade.get_rectangle_points(screen_center_x,
-                                                          screen_edge_spacing + (draw_depth / 2),
-                                                          border_long_width,
-                                                          draw_depth)
+        self.bottom_points = get_rectangle_points(screen_center_x,
+                                                  screen_edge_spacing + (draw_depth / 2),
+                                                  border_long_width,
+                                                  draw_depth)
 
-        self.left_points = _arcade.get_rectangle_points(screen_edge_spacing + (draw_depth / 2),
-                                                        screen_center_y,
-                                                        draw_depth,
-                                                        border_long_height)
+        self.left_points = get_rectangle_points(screen_edge_spacing + (draw_depth / 2),
+                                                screen_center_y,
+                                                draw_depth,
+                                                border_long_height)
 
     def collided_with(self, x: float, y: float) -> bool:
         for side in [self.top_points, self.right_points, self.bottom_points, self.left_points]:
-            if _arcade.is_point_in_polygon(x, y, side):
+            if is_point_in_polygon(x, y, side):
                 return True
         return False
+
+    def create_floor_shapes(self, body: pymunk.Body) -> List[pymunk.Shape]:
+        return [pymunk.Poly(body, side)
+                for side in [self.top_points, self.right_points, self.bottom_points, self.left_points]]
+
+    def cover(self, left: np.ndarray, bottom: np.ndarray, right: np.ndarray, top: np.ndarray) -> np.ndarray:
+        return np.maximum.reduce([cover_rectangle(side, left, bottom, right, top)
+                                  for side in [self.top_points, self.right_points, self.bottom_points,
+                                               self.left_points]])
@@ -3,11 +3,10 @@ The module bottle contains the class Bottle, that represents a wine bottle.
 """
 
 import pymunk
-import arcade as _arcade
-from arcade import Sprite
 
 from ev3dev2simulator.obstacle.movable_object import MovableObject
 from ev3dev2simulator.util.point import Point
+from ev3dev2simulator.util.util import Color
 
 
 class Bottle(MovableObject):
@@ -17,7 +16,7 @@ class Bottle(MovableObject):
     def __init__(self,
                  pos: Point,
                  radius: float,
-                 color: _arcade.Color):
+                 color: Color):
         super().__init__(pos, 0, color)
 
         self.radius = radius
@@ -33,27 +32,27 @@ class Bottle(MovableObject):
 
         return cls(pos, radius, color)
 
-    def create_shape(self, scale):
+    def create_shape(self):
         """
-        Creates the bottle shape.
+        Creates the bottle shape, in mm.
         """
-        radius = scale * self.radius
+        radius = self.radius
         mass = 5
         friction = 0.2
         moment = pymunk.moment_for_circle(mass, 0, radius, (0, 0))
 
         self.body = pymunk.Body(mass, moment)
-        pos_x, pos_y = self.get_pos()
-        self.body.position = pymunk.Vec2d(pos_x * scale, pos_y * scale)
+        self.body.position = pymunk.Vec2d(self.x, self.y)
 
         self.shape = pymunk.Circle(self.body, radius, (0, 0))
         self.shape.friction = friction
-        self.scale = scale
 
-    def create_sprite(self, scale):
+    def create_sprite(self):
         """
-        Create the sprite, the visuals of the bottle.
+        Create the sprite, the visuals of the bottle, sized in mm.
         """
-        pos_x, pos_y = self.get_pos()
-        self.sprite = Sprite('assets/images/bottle.png', scale=scale * 2 * (self.radius / 948),
-                             center_x=pos_x * scale, center_y=pos_y * scale)
+        # pylint: disable=import-outside-toplevel
+        from arcade import Sprite
+
+        self.sprite = Sprite('assets/images/bottle.png', scale=2 * (self.radius / 948),
+                             center_x=self.x, center_y=self.y)
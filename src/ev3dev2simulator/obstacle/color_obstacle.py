@@ -2,6 +2,18 @@
 module color_obstacle containing the abstract class ColorObstacle.
 """
 
+from typing import List
+
+import numpy as np
+import pymunk
+
+from ev3dev2simulator.util.util import Color, PointList
+
+# how an obstacle covers a cell of a ColorMap, ordered so the cover of a union of areas is the maximum
+OUTSIDE = 0
+PARTIAL = 1
+INSIDE = 2
+
 
 class ColorObstacle:
     """
@@ -10,6 +22,8 @@ class ColorObstacle:
 
     def __init__(self, color_code: int):
         self.color_code = color_code
+        # the rgb value of the color of the obstacle
+        self.color = None
 
     def collided_with(self, x: float, y: float) -> bool:
         """
@@ -19,8 +33,55 @@ class ColorObstacle:
         :return: True if collision detected.
         """
 
+    def cover(self, left: np.ndarray, bottom: np.ndarray, right: np.ndarray, top: np.ndarray) -> np.ndarray:
+        """
+        Check how this obstacle covers the given cells. A cell is only INSIDE or OUTSIDE when collided_with
+        gives the same outcome for every point of the cell, otherwise it is PARTIAL. Obstacles that cannot
+        tell cover every cell partially, so their points are always checked by collided_with.
+        :param left: coordinates of the left side of the cells, broadcast against the other sides.
+        :param bottom: coordinates of the bottom side of the cells.
+        :param right: coordinates of the right side of the cells.
+        :param top: coordinates of the top side of the cells.
+        :return: array of OUTSIDE, PARTIAL or INSIDE for every cell.
+        """
+        return np.full(np.broadcast(left, bottom, right, top).shape, PARTIAL, dtype=np.int8)
+
+    def create_floor_shapes(self, body: pymunk.Body) -> List[pymunk.Shape]:
+        """
+        Create static shapes covering every point collided_with is True for, used to look up the obstacles near
+        a point (see FloorIndex). Obstacles without shapes, such as the board, are near every point.
+        :param body: the static body the shapes are attached to.
+        :return: list of the shapes, in mm.
+        """
+        return []
+
+    def sample(self, x: float, y: float, size: float) -> (int, Color):
+        """
+        Get the color a color sensor senses at the given point. Obstacles of a single color return their color.
+        :param x: coordinate of the center of the sensor.
+        :param y: coordinate of the center of the sensor.
+        :param size: width and height of the area the sensor senses.
+        :return: the color code and the rgb value of the average color of the area.
+        """
+        return self.color_code, self.color
+
     def get_color_code(self):
         """
         Returns the saved color code
         """
         return self.color_code
+
+
+def cover_rectangle(points: PointList,
+                    left: np.ndarray, bottom: np.ndarray, right: np.ndarray, top: np.ndarray) -> np.ndarray:
+    """
+    Check how the axis aligned rectangle with the given corner points covers the given cells, with the outcome
+    of is_point_in_polygon. Cells touching the sides of the rectangle are covered partially.
+    :param points: of the rectangle, as returned by get_rectangle_points.
+    :return: array of OUTSIDE, PARTIAL or INSIDE for every cell.
+    """
+    xs = [x for x, _ in points]
+    ys = [y for _, y in points]
+    inside = (left > min(xs)) & (right < max(xs)) & (bottom > min(ys)) & (top < max(ys))
+    outside = (right < min(xs)) | (left > max(xs)) | (top < min(ys)) | (bottom > max(ys))
+    return np.where(inside, INSIDE, np.where(outside, OUTSIDE, PARTIAL)).astype(np.int8)
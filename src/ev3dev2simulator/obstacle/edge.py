@@ -18,11 +18,11 @@ class Edge(BorderObstacle):
         edge_spacing = 0
         super(Edge, self).__init__(width, height, 1, depth, edge_spacing)
 
-    def create_shape(self, scale):
+    def create_shape(self):
         """
         Creates the shape of the edge.
         """
-        self._calc_points(scale)
+        self.calc_points()
 
     @staticmethod
     def get_shapes():
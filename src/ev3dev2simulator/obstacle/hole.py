@@ -2,11 +2,11 @@
 Module containing the class Hole, used to detect robots driving into lakes.
 """
 
+from typing import List
 
-import arcade
-from arcade import PointList
+import pymunk
 
-from ev3dev2simulator.util.util import get_circle_points
+from ev3dev2simulator.util.util import PointList, get_circle_points, is_point_in_polygon
 
 
 class Hole:
@@ -27,21 +27,27 @@ class Hole:
         # visualisation
         self.points = None
 
-    def create_shape(self, scale):
+    def calc_points(self):
+        """
+        Calculate the points of the hole, used for collision detection.
+        """
+        self.points = self._create_points()
+
+    def create_shape(self):
         """
         Creates the shape of the hole.
         """
-        self.points = self._create_points(scale)
+        self.calc_points()
 
-    def _create_points(self, scale) -> PointList:
+    def _create_points(self) -> PointList:
         """
         Create a list of points representing this Lake in 2D space.
         :return: a PointList object.
         """
 
-        return get_circle_points(self.x * scale,
-                                 self.y * scale,
-                                 self.radius * scale)
+        return get_circle_points(self.x,
+                                 self.y,
+                                 self.radius)
 
     def collided_with(self, x: float, y: float) -> bool:
         """
@@ -51,4 +57,12 @@ class Hole:
         :return: True if collision detected.
         """
 
-        return arcade.is_point_in_polygon(x, y, self.points)
+        return is_point_in_polygon(x, y, self.points)
+
+    def create_floor_shapes(self, body: pymunk.Body) -> List[pymunk.Shape]:
+        """
+        Create the static shape covering the hole, used to look up the obstacles near a point (see FloorIndex).
+        :param body: the static body the shape is attached to.
+        :return: list of the shape, in mm.
+        """
+        return [pymunk.Circle(body, self.radius, (self.x, self.y))]
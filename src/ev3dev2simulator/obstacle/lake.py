@@ -2,13 +2,15 @@
 Module lake containing the class Lake, an obstacle on the playground.
 """
 
-import arcade
-from arcade import Shape, PointList, create_line_strip, create_ellipse_filled
+from typing import List
 
-from ev3dev2simulator.obstacle.color_obstacle import ColorObstacle
+import numpy as np
+import pymunk
+
+from ev3dev2simulator.obstacle.color_obstacle import ColorObstacle, INSIDE, OUTSIDE, PARTIAL
 from ev3dev2simulator.obstacle.hole import Hole
 from ev3dev2simulator.util.point import Point
-from ev3dev2simulator.util.util import get_circle_points, distance_between_points, to_color_code
+from ev3dev2simulator.util.util import Color, PointList, get_circle_points, distance_between_points, to_color_code
 
 
 class Lake(ColorObstacle):
@@ -21,7 +23,7 @@ class Lake(ColorObstacle):
                  pos: Point,
                  outer_radius: float,
                  inner_radius: float,
-                 color: arcade.Color,
+                 color: Color,
                  border_width: int,
                  hole_config: (bool, int)
                  ):
@@ -44,7 +46,6 @@ class Lake(ColorObstacle):
         self.center_y = None
         self.color = color
         self.shape = None
-        self.scale = None
 
     def get_shapes(self):
         """
@@ -52,16 +53,21 @@ class Lake(ColorObstacle):
         """
         return [self.shape]
 
-    def create_shape(self, scale):
+    def calc_points(self):
         """
-        Creates the shape of lake.
+        Calculate the center of the lake and the points of its hole, used for collision detection.
         """
-        self.scale = scale
-        self.center_x = self.x * scale
-        self.center_y = self.y * scale
-        self.shape = self._create_shape(scale)
+        self.center_x = self.x
+        self.center_y = self.y
         if self.hole is not None:
-            self.hole.create_shape(scale)
+            self.hole.calc_points()
+
+    def create_shape(self):
+        """
+        Creates the shape of lake.
+        """
+        self.calc_points()
+        self.shape = self._create_shape()
 
     @classmethod
     def from_config(cls, config):
@@ -80,7 +86,7 @@ class Lake(ColorObstacle):
 
         return cls(pos, outer_radius, inner_radius, color, border_width, (has_hole, depth))
 
-    def _create_points(self, scale) -> PointList:
+    def _create_points(self) -> PointList:
         """
         Create a list of points representing this Lake in 2D space.
         :return: a PointList object.
@@ -88,20 +94,23 @@ class Lake(ColorObstacle):
 
         return get_circle_points(self.center_x,
                                  self.center_y,
-                                 self.outer_radius * scale)
+                                 self.outer_radius)
 
-    def _create_shape(self, scale) -> Shape:
+    def _create_shape(self):
         """
         Create a shape representing this lake.
         :return: a Arcade shape object.
         """
+        # pylint: disable=import-outside-toplevel
+        from arcade import create_line_strip, create_ellipse_filled
+
         if self.hole is not None:
-            points = self._create_points(scale)
+            points = self._create_points()
             return create_line_strip(points,
                                      self.color,
-                                     self.border_width * scale)
+                                     self.border_width)
         return create_ellipse_filled(self.center_x, self.center_y,
-                                     self.outer_radius * scale, self.outer_radius * scale, self.color)
+                                     self.outer_radius, self.outer_radius, self.color)
 
     def _create_hole(self, depth):
         """
@@ -115,6 +124,32 @@ class Lake(ColorObstacle):
         """
         distance = distance_between_points(self.center_x, self.center_y, x, y)
         if self.hole is not None:
-            return (self.inner_radius * self.scale) < distance <\
-                   ((self.outer_radius + (self.border_width/2)) * self.scale)
-        return distance < (self.outer_radius * self.scale)
+            return self.inner_radius < distance < self.outer_radius + (self.border_width/2)
+        return distance < self.outer_radius
+
+    def create_floor_shapes(self, body: pymunk.Body) -> List[pymunk.Shape]:
+        if self.hole is not None:
+            outer = self.outer_radius + (self.border_width/2)
+        else:
+            outer = self.outer_radius
+        return [pymunk.Circle(body, outer, (self.center_x, self.center_y))]
+
+    def cover(self, left: np.ndarray, bottom: np.ndarray, right: np.ndarray, top: np.ndarray) -> np.ndarray:
+        """
+        Check how the lake covers the given cells, using the distance from its center to the nearest and the
+        farthest point of every cell.
+        """
+        nearest = np.hypot(np.maximum(np.maximum(left - self.center_x, self.center_x - right), 0),
+                           np.maximum(np.maximum(bottom - self.center_y, self.center_y - top), 0))
+        farthest = np.hypot(np.maximum(np.abs(left - self.center_x), np.abs(right - self.center_x)),
+                            np.maximum(np.abs(bottom - self.center_y), np.abs(top - self.center_y)))
+        if self.hole is not None:
+            inner = self.inner_radius
+            outer = self.outer_radius + (self.border_width/2)
+            inside = (nearest > inner) & (farthest < outer)
+            outside = (farthest <= inner) | (nearest >= outer)
+        else:
+            outer = self.outer_radius
+            inside = farthest < outer
+            outside = nearest >= outer
+        return np.where(inside, INSIDE, np.where(outside, OUTSIDE, PARTIAL)).astype(np.int8)
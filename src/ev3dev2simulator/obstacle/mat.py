@@ -0,0 +1,135 @@
+"""
+The module mat contains the class Mat, a printed mat lying on the board, like the mats of line following competitions.
+"""
+
+import numpy as np
+
+from ev3dev2simulator.config.config import get_world_file_path
+from ev3dev2simulator.obstacle.color_obstacle import ColorObstacle, cover_rectangle
+from ev3dev2simulator.util.util import Color, PointList, get_rectangle_points, is_point_in_polygon, \
+    to_nearest_color_code
+
+
+class Mat(ColorObstacle):
+    """
+    This class represents a 'Mat', an image lying on the board. The pixels of the image are kept in a summed-area
+    table, in which every entry holds the sum of the pixels below and left of it. The average color of any area is
+    then found from the four entries at its corners, so sampling takes as long for a large sensor as for a small one.
+    """
+
+    def __init__(self, image_path: str, pixels: np.ndarray, x: float, y: float, width: int, height: int):
+        super(Mat, self).__init__(0)
+        self.image_path = image_path
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+        # rows from the bottom of the image to the top, like the y coordinates of the world
+        self.rows, self.columns = pixels.shape[:2]
+        self.sums = np.zeros((self.rows + 1, self.columns + 1, 3), dtype=np.int64)
+        self.sums[1:, 1:] = np.cumsum(np.cumsum(pixels, axis=0, dtype=np.int64), axis=1)
+
+        self.points = None
+
+        # visualisation
+        self.sprite_list = None
+
+    @classmethod
+    def from_config(cls, board_width: int, board_height: int, config):
+        """
+        Create a mat from config. By default the mat covers the whole board.
+        """
+        image_path = get_world_file_path(config['image'])
+        width = config['width'] if 'width' in config else board_width
+        height = config['height'] if 'height' in config else board_height
+        x = config['x'] if 'x' in config else board_width / 2
+        y = config['y'] if 'y' in config else board_height / 2
+
+        return cls(image_path, load_pixels(image_path), x, y, width, height)
+
+    def get_shapes(self):
+        """
+        Returns the sprite of the mat, drawn like the shapes of the other obstacles.
+        """
+        return [self.sprite_list]
+
+    def calc_points(self):
+        """
+        Calculate the points of the mat, used for collision detection.
+        """
+        self.points = self._create_points()
+
+    def create_shape(self):
+        """
+        Creates the sprite of the mat.
+        """
+        # pylint: disable=import-outside-toplevel
+        import arcade as _arcade
+
+        self.calc_points()
+        sprite = _arcade.Sprite(self.image_path, center_x=self.x, center_y=self.y)
+        sprite.width = self.width
+        sprite.height = self.height
+        self.sprite_list = _arcade.SpriteList()
+        self.sprite_list.append(sprite)
+
+    def _create_points(self) -> PointList:
+        """
+        Create a list of points representing this mat in 2D space.
+        :return: a PointList object.
+        """
+        return get_rectangle_points(self.x,
+                                    self.y,
+                                    self.width,
+                                    self.height)
+
+    def collided_with(self, x: float, y: float) -> bool:
+        """
+        Check if the given point lies on the mat.
+        """
+        return is_point_in_polygon(x, y, self.points)
+
+    def cover(self, left: np.ndarray, bottom: np.ndarray, right: np.ndarray, top: np.ndarray) -> np.ndarray:
+        """
+        Check how the mat covers the given cells.
+        """
+        return cover_rectangle(self.points, left, bottom, right, top)
+
+    def sample(self, x: float, y: float, size: float) -> (int, Color):
+        """
+        Get the average color of the pixels of the area the sensor senses, as far as the area lies on the mat,
+        and the color code of the nearest color of the world.
+        """
+        first_column, last_column = self._to_pixels(x - size / 2, x + size / 2, self.x, self.width, self.columns)
+        first_row, last_row = self._to_pixels(y - size / 2, y + size / 2, self.y, self.height, self.rows)
+
+        total = self.sums[last_row, last_column] - self.sums[first_row, last_column] \
+            - self.sums[last_row, first_column] + self.sums[first_row, first_column]
+        rgb = tuple(int(round(value)) for value in total / ((last_row - first_row) * (last_column - first_column)))
+        return to_nearest_color_code(rgb), rgb
+
+    def _to_pixels(self, start: float, end: float, center: float, length: int, pixels: int) -> (int, int):
+        """
+        Convert a range of coordinates along one axis to the range of pixels it covers, at least one pixel.
+        :return: the first pixel and the pixel after the last one.
+        """
+        origin = center - length / 2
+        pixels_per_unit = pixels / length
+        first = min(max(int(np.floor((start - origin) * pixels_per_unit)), 0), pixels - 1)
+        last = min(max(int(np.ceil((end - origin) * pixels_per_unit)), first + 1), pixels)
+        return first, last
+
+
+def load_pixels(image_path: str) -> np.ndarray:
+    """
+    Load the rgb values of the pixels of an image.
+    :param image_path: of the image, such as a PNG file.
+    :return: array of the rows of the image from bottom to top.
+    """
+    # pillow is installed with arcade, but only imported when a world has a mat
+    # pylint: disable=import-outside-toplevel
+    from PIL import Image
+
+    with Image.open(image_path) as image:
+        return np.flipud(np.asarray(image.convert('RGB')))
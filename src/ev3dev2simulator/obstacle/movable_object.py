@@ -3,10 +3,10 @@ Module movable_object contains the class MovableObject.
 """
 import math
 
-import arcade as _arcade
 import pymunk
 
 from ev3dev2simulator.util.point import Point
+from ev3dev2simulator.util.util import Color
 
 
 class MovableObject:
@@ -16,7 +16,7 @@ class MovableObject:
     def __init__(self,
                  pos: Point,
                  angle: int,
-                 color: _arcade.Color):
+                 color: Color):
 
         self.x = pos.x
         self.y = pos.y
@@ -25,34 +25,19 @@ class MovableObject:
         # visualisation
         self.color = color
         self.sprite = None
-        self.scale = None
 
-        # physics
+        # physics, in mm
         self.body = None
         self.shape = None
-        self.new_pos_x = None
-        self.new_pos_y = None
-
-    def get_pos(self):
-        """
-        Returns the current position of the rock.
-        """
-        if self.new_pos_x and self.new_pos_y:
-            return self.new_pos_x, self.new_pos_y
-        return self.x, self.y
-
-    def set_new_pos(self, pos):
-        """
-        Sets the current position of the bottle.
-        """
-        self.new_pos_x = (1 / self.scale) * pos.x
-        self.new_pos_y = (1 / self.scale) * pos.y
 
     def reset(self):
         """
         Resets the position and the speed of the movable object.
         """
-        self.body.position = pymunk.Vec2d(self.x * self.scale, self.y * self.scale)
+        self.body.position = pymunk.Vec2d(self.x, self.y)
         self.body.angle = math.radians(self.angle)
         self.body.velocity = (0, 0)
         self.body.angular_velocity = 0
+        if self.body.body_type == pymunk.Body.STATIC and self.body.space is not None:
+            # the space only indexes static shapes again when told so
+            self.body.space.reindex_shapes_for_body(self.body)
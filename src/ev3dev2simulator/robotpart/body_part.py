@@ -2,11 +2,12 @@
 The body_part module contains the class BodyPart, the super class to a all body parts.
 """
 
+import math
+
 import pymunk
 
 from ev3dev2simulator.util.dimensions import Dimensions
 from ev3dev2simulator.util.point import Point
-from ev3dev2simulator.visualisation.robot_part_sprite import RobotPartSprite
 
 # Default friction used for sprites, unless otherwise specified
 DEFAULT_FRICTION = 0.2
@@ -32,8 +33,12 @@ class BodyPart:
         self.height_mm = dimensions.height
         self.x_offset = float(config['x_offset']) + offset.x
         self.y_offset = float(config['y_offset']) + offset.y
+        # how many times per second a sensor takes a new sample, every frame when it is None
+        self.sample_rate_hz = float(config['sample_rate_hz']) if 'sample_rate_hz' in config else None
 
         self.sensible_obstacles = []
+        # index of the obstacles on the floor, which are checked one by one when there is none
+        self.floor_index = None
 
         self.sprite = None
         self.shape = None
@@ -45,6 +50,23 @@ class BodyPart:
         """
         self.sensible_obstacles = obstacles
 
+    def set_floor_index(self, floor_index):
+        """
+        Set the index of the obstacles on the floor, used to look up the sensible obstacles near a point.
+        :param floor_index: of the obstacles on the floor, None to check the sensible obstacles one by one.
+        """
+        self.floor_index = floor_index
+
+    def get_near_obstacles(self, x: float, y: float) -> list:
+        """
+        Get the sensible obstacles that may collide with the given point, in the order they were set.
+        :param x: coordinate of the point, in mm.
+        :param y: coordinate of the point, in mm.
+        """
+        if self.floor_index is None:
+            return self.sensible_obstacles
+        return self.floor_index.get_near_obstacles(x, y, self.sensible_obstacles)
+
     def get_default_value(self):
         """
         Get the default value which the sensor would return without
@@ -52,35 +74,68 @@ class BodyPart:
         :return: any possible value representing the default value.
         """
 
-    def setup_visuals(self, scale):
+    def get_mode_values(self, mode: str):
+        """
+        Get the values the sensor would return in the given mode, for sensors of which the value depends on it.
+        :param mode: of the ev3dev sensor.
+        :return: list of the values or None if the mode is not supported.
+        """
+        return None
+
+    def get_events(self, after_frame: int):
         """
-        Abstract function for settings up the sprite of body part.
+        Get the events of the sensor since the given frame, for sensors that report events.
+        :param after_frame: the frame after which the events happened.
+        :return: list of the events or None if the sensor does not report events.
         """
+        return None
 
-    def setup_pymunk_shape(self, px_mm_scale, body):
+    def setup_visuals(self):
         """
-        Create the shape of a body part as a square.
+        Abstract function for settings up the sprite of body part, sized in mm like its shape.
         """
-        width = self.width_mm * px_mm_scale
-        height = self.height_mm * px_mm_scale
+
+    def setup_pymunk_shape(self, body):
+        """
+        Create the shape of a body part as a square, in mm.
+        """
+        width = self.width_mm
+        height = self.height_mm
         vertices = [(0, 0), (width, 0), (width, height), (0, height)]
-        transform = pymunk.Transform(tx=self.x_offset * px_mm_scale - width/2,
-                                     ty=self.y_offset * px_mm_scale - height/2)
+        transform = pymunk.Transform(tx=self.x_offset - width/2,
+                                     ty=self.y_offset - height/2)
         self.shape = pymunk.Poly(body, vertices, transform=transform)
         self.shape.friction = DEFAULT_FRICTION
         self.shape.mass = DEFAULT_MASS
 
-    def init_sprite_with_list(self, src_list, scale, start_sprite=0):
+    def get_world_position(self) -> pymunk.Vec2d:
+        """
+        Get the position of the center of this body part in the world.
+        The position is derived from the pymunk body the part is attached to, so no sprite is needed.
+        """
+        return self.shape.body.local_to_world(self.shape.center_of_gravity)
+
+    def get_world_angle(self) -> float:
+        """
+        Get the angle in degrees of this body part in the world, derived from the pymunk body.
+        """
+        return math.degrees(self.shape.body.angle)
+
+    def init_sprite_with_list(self, src_list, start_sprite=0):
         """
         Initializes the sprite with a list of textures and the start texture.
         """
-        self.sprite = RobotPartSprite(src_list, start_sprite, self.width_mm, scale=scale)
+        # sprites are only needed for visualisation, so only import arcade when actually creating them
+        # pylint: disable=import-outside-toplevel
+        from ev3dev2simulator.visualisation.robot_part_sprite import RobotPartSprite
+
+        self.sprite = RobotPartSprite(src_list, start_sprite, self.width_mm)
 
-    def init_sprite(self, src, scale):
+    def init_sprite(self, src):
         """
         Initialize a sprite with only one texture.
         """
-        self.init_sprite_with_list([src], scale)
+        self.init_sprite_with_list([src])
 
     def get_ev3type(self):
         """
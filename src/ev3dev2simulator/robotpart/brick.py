@@ -16,6 +16,6 @@ class Brick(BodyPart):
         dims = get_simulation_settings()['body_part_sizes']['body']
         super().__init__(config, robot, Dimensions(dims['width'], dims['height']), 'brick')
 
-    def setup_visuals(self, scale):
+    def setup_visuals(self):
         vis_conf = get_simulation_settings()
-        self.init_sprite(vis_conf['image_paths']['body'], scale)
+        self.init_sprite(vis_conf['image_paths']['body'])
@@ -3,9 +3,17 @@ The color_sensor module contains the class ColorSensor class which represents an
 """
 
 
+from typing import List, Optional
+
 from ev3dev2simulator.config.config import get_simulation_settings
 from ev3dev2simulator.robotpart.body_part import BodyPart
 from ev3dev2simulator.util.dimensions import Dimensions
+from ev3dev2simulator.util.util import Color
+
+# modes of the ev3dev color sensor
+MODE_COL_REFLECT = 'COL-REFLECT'
+MODE_COL_COLOR = 'COL-COLOR'
+MODE_RGB_RAW = 'RGB-RAW'
 
 COLORS = dict()
 COLORS[0] = 0  # set black for no color
@@ -27,31 +35,70 @@ class ColorSensor(BodyPart):
         super().__init__(config, robot, Dimensions(dims['width'], dims['height']),
                          'color_sensor', driver_name='lego-ev3-color')
         self.old_texture_index = 0
+        # raster of the sensible obstacles, which are checked one by one when there is none
+        self.color_map = None
+        self.footprint = float(get_simulation_settings()['color_sensor_settings']['footprint'])
+        self.mode_values = self._to_mode_values(self.get_default_value(), (0, 0, 0))
 
-    def setup_visuals(self, scale):
+    def setup_visuals(self):
         img_cfg = get_simulation_settings()['image_paths']
         src_list = [img_cfg[f'color_sensor_{color}'] for color in ['black', 'blue', 'green', 'red', 'white', 'yellow']]
-        self.init_sprite_with_list(src_list, scale)
+        self.init_sprite_with_list(src_list)
 
     def get_latest_value(self):
         """
-        Return the current color sensor below the color sensor.
+        Return the current color sensor below the color sensor. The values of the other modes are sensed as well.
         """
-        latest_data = self.get_sensed_color()
-        self.set_color_texture(latest_data)
+        latest_data, rgb = self.sample()
+        self.mode_values = self._to_mode_values(latest_data, rgb)
         return latest_data
 
+    @staticmethod
+    def _to_mode_values(color_code: int, rgb: Color) -> dict:
+        """
+        Get the values of every mode of the given sensed color.
+        """
+        return {MODE_COL_COLOR: [color_code],
+                MODE_COL_REFLECT: [sum(rgb) / (255 * 3) * 100],  # percentage of light
+                MODE_RGB_RAW: list(rgb)}
+
+    def get_mode_values(self, mode: str) -> Optional[List[float]]:
+        """
+        Get the values sensed last in the given mode.
+        :param mode: of the ev3dev color sensor.
+        :return: the values, as read from value0, value1, ... in that mode, or None if the mode is not supported.
+        """
+        return self.mode_values.get(mode)
+
     def get_sensed_color(self) -> int:
         """
         Get the color this ColorSensor is currently 'seeing'.
         :return: integer value representing the color.
         """
+        return self.sample()[0]
+
+    def sample(self) -> (int, Color):
+        """
+        Get the color code and the rgb value of the color this ColorSensor is currently 'seeing'.
+        :return: the color code and the rgb value.
+        """
+        x, y = self.get_world_position()
+        if self.color_map is not None:
+            obstacle = self.color_map.get_obstacle(x, y)
+        else:
+            obstacle = next((obstacle for obstacle in self.get_near_obstacles(x, y) if obstacle.collided_with(x, y)),
+                            None)
 
-        for obstacle in self.sensible_obstacles:
-            if obstacle.collided_with(self.sprite.center_x, self.sprite.center_y):
-                return obstacle.color_code
+        if obstacle is None:
+            return self.get_default_value(), (0, 0, 0)
+        return obstacle.sample(x, y, self.footprint)
 
-        return self.get_default_value()
+    def set_color_map(self, color_map):
+        """
+        Set the raster of the sensible obstacles, used to look up the obstacle below the sensor.
+        :param color_map: of the sensible obstacles, None to check the obstacles one by one.
+        """
+        self.color_map = color_map
 
     def get_default_value(self):
         """
@@ -65,6 +112,6 @@ class ColorSensor(BodyPart):
         Set the color texture of the center of the color sensor.
         """
         converted = COLORS[color]
-        if self.old_texture_index != converted:
+        if self.sprite is not None and self.old_texture_index != converted:
             self.old_texture_index = converted
             self.sprite.set_texture(converted)
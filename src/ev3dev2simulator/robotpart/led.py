@@ -25,15 +25,15 @@ class Led(BodyPart):
         super().__init__(config, robot, Dimensions(dims['width'], dims['height']), 'led', Point(offset_x, - 32.5))
         self.old_texture_index = 1
 
-    def setup_visuals(self, scale):
+    def setup_visuals(self):
         img_cfg = get_simulation_settings()['image_paths']
         src_list = [img_cfg[f'led_{color}'] for color in ['amber', 'black', 'red', 'green', 'orange', 'yellow']]
-        self.init_sprite_with_list(src_list, scale, 1)
+        self.init_sprite_with_list(src_list, 1)
 
     def set_color_texture(self, color):
         """
         Sets the sprite corresponding to the given color.
         """
-        if self.old_texture_index != color:
+        if self.sprite is not None and self.old_texture_index != color:
             self.old_texture_index = color
             self.sprite.set_texture(color)
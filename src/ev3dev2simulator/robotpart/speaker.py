@@ -28,6 +28,6 @@ class Speaker(BodyPart):
         dims = get_simulation_settings()['body_part_sizes']['speaker']
         super(Speaker, self).__init__(config, robot, Dimensions(dims['width'], dims['height']), 'speaker')
 
-    def setup_visuals(self, scale):
+    def setup_visuals(self):
         vis_conf = get_simulation_settings()
-        self.init_sprite(vis_conf['image_paths']['led_black'], scale)
+        self.init_sprite(vis_conf['image_paths']['led_black'])
@@ -2,10 +2,18 @@
 The touch_sensor module contains the class TouchSensor which represents a front or rear touch sensor.
 """
 
+from collections import deque
+from typing import List
+
 from ev3dev2simulator.config.config import get_simulation_settings
 from ev3dev2simulator.robotpart.body_part import BodyPart
 from ev3dev2simulator.util.dimensions import Dimensions
 
+# collision type of the shapes of touch sensors, for which the world registers a collision handler
+TOUCH_SENSOR_COLLISION_TYPE = 1
+# number of presses and releases a touch sensor remembers
+MAX_EVENTS = 64
+
 
 class TouchSensor(BodyPart):
     """
@@ -20,8 +28,12 @@ class TouchSensor(BodyPart):
 
         super(TouchSensor, self).__init__(config, robot, Dimensions(dims['width'], dims['height']), 'touch_sensor',
                                           driver_name='lego-ev3-touch')
+        # number of shapes the sensor is in contact with, kept by the collision handler of the world
+        self.contacts = 0
+        # presses and releases as (frame, is_pressed), oldest first
+        self.events = deque(maxlen=MAX_EVENTS)
 
-    def setup_visuals(self, scale):
+    def setup_visuals(self):
         if self.side == 'left':
             img = 'touch_sensor_left'
         elif self.side == 'right':
@@ -29,7 +41,13 @@ class TouchSensor(BodyPart):
         else:
             img = 'touch_sensor_rear'
         vis_conf = get_simulation_settings()
-        self.init_sprite(vis_conf['image_paths'][img], scale)
+        self.init_sprite(vis_conf['image_paths'][img])
+
+    def setup_pymunk_shape(self, body):
+        super(TouchSensor, self).setup_pymunk_shape(body)
+        self.shape.collision_type = TOUCH_SENSOR_COLLISION_TYPE
+        # a new shape starts without contacts, the contacts of a removed shape are separated when it is removed
+        self.contacts = 0
 
     def get_latest_value(self):
         """
@@ -42,8 +60,35 @@ class TouchSensor(BodyPart):
         Check if this TouchSensor is touching a TouchObstacle.
         :return: boolean value representing the outcome.
         """
-        hits = self.shape.space.shape_query(self.shape)
-        return len(hits) > 0
+        return self.contacts > 0
+
+    def begin_contact(self):
+        """
+        Called by the collision handler of the world when the sensor starts touching a shape,
+        while a frame is simulated.
+        """
+        self.contacts += 1
+        # the robot starts the frame in which the contact begins after the space has been stepped
+        if self.contacts == 1:
+            self.events.append((self.robot.frame + 1, True))
+
+    def end_contact(self):
+        """
+        Called by the collision handler of the world when the sensor stops touching a shape.
+        """
+        if self.contacts == 0:
+            return
+        self.contacts -= 1
+        if self.contacts == 0:
+            self.events.append((self.robot.frame + 1, False))
+
+    def get_events(self, after_frame: int) -> List[list]:
+        """
+        Get the presses and releases of the sensor since the given frame.
+        :param after_frame: the frame after which the events happened.
+        :return: list of [frame, is_pressed] from old to new, of the frame in which the sensor was pressed or released.
+        """
+        return [[frame, is_pressed] for frame, is_pressed in self.events if frame > after_frame]
 
     def get_default_value(self):
         return False
@@ -20,9 +20,9 @@ class UltrasonicSensorBottom(BodyPart):
         super(UltrasonicSensorBottom, self).__init__(config, robot, Dimensions(dims['width'], dims['height']),
                                                      'ultrasonic_sensor', driver_name='lego-ev3-us')
 
-    def setup_visuals(self, scale):
+    def setup_visuals(self):
         img_cfg = get_simulation_settings()['image_paths']
-        self.init_sprite(img_cfg['ultrasonic_sensor_bottom'], scale)
+        self.init_sprite(img_cfg['ultrasonic_sensor_bottom'])
 
     def get_latest_value(self):
         """
@@ -36,8 +36,9 @@ class UltrasonicSensorBottom(BodyPart):
         Get the distance in pixels between this ultrasonic sensor and an the ground.
         :return: a floating point value representing the distance.
         """
-        for obstacle in self.sensible_obstacles:
-            if obstacle.collided_with(self.sprite.center_x, self.sprite.center_y):
+        x, y = self.get_world_position()
+        for obstacle in self.get_near_obstacles(x, y):
+            if obstacle.collided_with(x, y):
                 if isinstance(obstacle, Hole):
                     return obstacle.depth
                 if isinstance(obstacle, Board):
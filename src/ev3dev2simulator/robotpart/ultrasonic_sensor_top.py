@@ -5,11 +5,10 @@ It represents an ultrasonic sensor on top of a robot that aims in front of the r
 
 
 import math
-from typing import Optional
+from typing import Tuple
 
-from arcade import Point, create_line
-from arcade.color import RED
-from pymunk import Space
+import numpy as np
+from pymunk import BB, Body, Space
 
 from ev3dev2simulator.config.config import get_simulation_settings, DEBUG
 from ev3dev2simulator.robotpart.body_part import BodyPart
@@ -26,10 +25,22 @@ class UltrasonicSensor(BodyPart):
         super(UltrasonicSensor, self).__init__(config, robot, Dimensions(dims['width'], dims['height']),
                                                'ultrasonic_sensor', driver_name='lego-ev3-us')
         self.sensor_half_height = 22.5
-
-    def setup_visuals(self, scale):
+        # distance of the eyes to the left and right of the center of the sensor
+        self.eye_offset = 18
+        settings = get_simulation_settings()['ultrasonic_sensor_settings']
+        # width in degrees of the cone of rays each eye sends, and the number of rays in it
+        self.cone_angle = float(settings['cone_angle'])
+        self.rays = int(settings['rays'])
+        # size of the board in pixels, set once the world has been set up
+        self.board_size = None
+        # distances to the shapes that do not move, through which rays are traced instead of checking those shapes
+        self.distance_field = None
+        # the angles of the rays for the cone angle and number of rays they were calculated for
+        self._ray_angles = None
+
+    def setup_visuals(self):
         img_cfg = get_simulation_settings()['image_paths']
-        self.init_sprite(img_cfg['ultrasonic_sensor_top'], scale)
+        self.init_sprite(img_cfg['ultrasonic_sensor_top'])
 
     def get_latest_value(self):
         """
@@ -39,74 +50,102 @@ class UltrasonicSensor(BodyPart):
 
     def distance(self, space: Space) -> float:
         """
-        Get the distance in pixels between this ultrasonic sensors eyes and an object it is pointed to. First check
-        the left eye, if this does not see anything check the right eye. If this sensor is not pointing towards an
-        object return 2550, which is the max distance of the real robots ultrasonic sensor. :param space: which
-        holds the visible objects. :return: a floating point value representing the distance.
+        Get the distance in pixels between this ultrasonic sensors eyes and the nearest object it is pointed to.
+        Both eyes send a cone of rays, of which the nearest hit counts. If this sensor is not pointing towards an
+        object return 2550, which is the max distance of the real robots ultrasonic sensor.
+        With a distance field, rays are traced through it for the static shapes and only moving shapes are checked.
+        :param space: which holds the visible objects.
+        :return: a floating point value representing the distance.
         """
-
-        distances = []
-
-        left_eye_x, left_eye_y = self._calc_eye_center(self.sprite.angle + 90)
-        distance = self._calc_view_distance(space, left_eye_x, left_eye_y)
-
-        if distance:
-            distances.append(distance * (1 / self.robot.scale))
-
-        right_eye_x, right_eye_y = self._calc_eye_center(self.sprite.angle - 90)
-        distance = self._calc_view_distance(space, right_eye_x, right_eye_y)
-
-        if distance:
-            distances.append(distance * (1 / self.robot.scale))
-
-        if len(distances) > 0:
-            return min(distances)
-
+        starts, ends = self._calc_rays()
+
+        # a single query of the spatial index for the shapes near any of the rays, each ray only checks those
+        lower = np.minimum(starts.min(axis=0), ends.min(axis=0))
+        upper = np.maximum(starts.max(axis=0), ends.max(axis=0))
+        candidates = space.bb_query(BB(lower[0], lower[1], upper[0], upper[1]), self.shape.filter)
+        if self.distance_field is not None:
+            candidates = [shape for shape in candidates if shape.body.body_type == Body.DYNAMIC]
+
+        nearest = None
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            if DEBUG:
+                # pylint: disable=import-outside-toplevel
+                from arcade import create_line
+                from arcade.color import RED
+                line = create_line(end[0], end[1], start[0], start[1], RED, 5)
+                self.robot.debug_shapes.append(line)
+            hits = [distance_between_points(start[0], start[1], query.point.x, query.point.y)
+                    for query in (shape.segment_query(start, end, 1) for shape in candidates)
+                    if query.shape is not None]
+            if self.distance_field is not None:
+                hit = self.distance_field.trace(start, end)
+                if hit is not None:
+                    hits.append(hit)
+            if hits:
+                distance = min(hits) - self.sensor_half_height
+                if nearest is None or distance < nearest:
+                    nearest = distance
+
+        if nearest is not None:
+            return nearest
         return self.get_default_value()
 
-    def _calc_view_distance(self, space: Space, base_x: float, base_y: float) -> Optional[float]:
+    def _calc_rays(self) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Calculate the distance between the base point, represented by base_x and base_y, and the furthest
-        viewable object. If no object is in sight, return None.
-        :param space: which holds the visible objects.
-        :param base_x: x coordinate of the base point.
-        :param base_y: y coordinate of the base point.
-        :return: a floating point value representing the distance if object is viewable, else None.
+        Calculate the start and end points of the rays of both eyes, spread evenly over the cone of the sensor.
+        Rays reach as far as the sensor can measure, but not beyond the board.
+        :return: arrays of the x and y coordinates of the start points and of the end points of the rays.
         """
-        x, y = self._calc_ray_cast_point(base_x, base_y)
-        if DEBUG:
-            line = create_line(x, y, base_x, base_y, RED, 5)
-            self.robot.debug_shapes.append(line)
-        query = space.segment_query_first((base_x, base_y), (x, y), 1, self.shape.filter)
-        if query:
-            return -self.sensor_half_height + distance_between_points(base_x, base_y, query.point.x, query.point.y)
-        return None
-
-    def _calc_ray_cast_point(self, from_x: float, from_y: float) -> Point:
+        rad = math.radians(self.get_world_angle())
+        center_x, center_y = self.get_world_position()
+        eye_x, eye_y = self.eye_offset * math.cos(rad), self.eye_offset * math.sin(rad)
+        eyes = np.array(((center_x - eye_x, center_y - eye_y), (center_x + eye_x, center_y + eye_y)))
+
+        rays = -(rad + self._get_ray_angles())
+        directions = np.empty((len(rays), 2))
+        directions[:, 0] = np.sin(rays)
+        directions[:, 1] = np.cos(rays)
+        # every eye sends every ray
+        starts = np.repeat(eyes, len(rays), axis=0)
+        directions = np.concatenate((directions, directions))
+        lengths = np.full((len(starts), 1), self.get_default_value() + self.sensor_half_height)
+
+        width, height = self.board_size if self.board_size is not None else (None, None)
+        if width is not None and all(0 <= x <= width and 0 <= y <= height for x, y in eyes.tolist()):
+            # the length at which every ray leaves the board on either axis, rays along an axis never leave it on
+            # the other axis as their direction on that axis is replaced by a tiny positive one
+            directions_on_axes = np.where(directions == 0, 1e-12, directions)
+            sides = np.where(directions_on_axes > 0, self.board_size, 0.0)
+            lengths = np.minimum(lengths, ((sides - starts) / directions_on_axes).min(axis=1, keepdims=True))
+
+        return starts, starts + directions * lengths
+
+    def _get_ray_angles(self) -> np.ndarray:
         """
-        Calculate the coordinates of the point to perform a ray-cast towards
-        which covers the entire playing field of the simulator.
-        :return: a Point object representing the coordinates of the ray-cast point.
+        Get the angles in radians of the rays of an eye relative to the direction of the sensor.
         """
-        rad = math.radians(self.sprite.angle)
-
-        x = 1000 * math.sin(-rad) + from_x
-        y = 1000 * math.cos(-rad) + from_y
-
-        return x, y
-
-    def _calc_eye_center(self, angle: float) -> Point:
+        if self._ray_angles is None or self._ray_angles[0] != (self.cone_angle, self.rays):
+            if self.rays > 1:
+                angles = np.radians(np.linspace(-self.cone_angle / 2, self.cone_angle / 2, self.rays))
+            else:
+                angles = np.zeros(1)
+            self._ray_angles = ((self.cone_angle, self.rays), angles)
+        return self._ray_angles[1]
+
+    def set_board_size(self, width: float, height: float):
         """
-        Calculate the center point of a location at the given angle relative to this objects center.
-        :param angle: at which the new point is relative to this objects center.
-        :return: a Point object representing the coordinates of the new location.
+        Set the size of the board, beyond which rays are not cast.
+        :param width: of the board in pixels.
+        :param height: of the board in pixels.
         """
-        rad = math.radians(angle)
-        eye_offset = 18
-        x = eye_offset * math.sin(-rad) + self.sprite.center_x
-        y = eye_offset * math.cos(-rad) + self.sprite.center_y
+        self.board_size = (width, height)
 
-        return x, y
+    def set_distance_field(self, distance_field):
+        """
+        Set the raster of the distances to the shapes that do not move, through which rays are traced.
+        :param distance_field: of the static shapes.
+        """
+        self.distance_field = distance_field
 
     def get_default_value(self):
         """
@@ -18,17 +18,18 @@ class Wheel(BodyPart):
         super().__init__(config, robot, Dimensions(dims['width'], dims['height']), 'motor',
                          driver_name='lego-ev3-l-motor')
 
-    def setup_visuals(self, scale):
+    def setup_visuals(self):
         vis_conf = get_simulation_settings()
-        self.init_sprite(vis_conf['image_paths']['wheel'], scale)
+        self.init_sprite(vis_conf['image_paths']['wheel'])
 
     def is_falling(self) -> bool:
         """
         Check if this Wheel is 'falling' of the playing field.
         :return: boolean value representing the outcome.
         """
-        for obstacle in self.sensible_obstacles:
-            if obstacle.collided_with(self.sprite.center_x, self.sprite.center_y):
+        x, y = self.get_world_position()
+        for obstacle in self.get_near_obstacles(x, y):
+            if obstacle.collided_with(x, y):
                 if isinstance(obstacle, Board):
                     return False
                 return True
@@ -8,10 +8,10 @@ import sys
 import os
 
 from ev3dev2simulator.config.config import load_config, get_world_config
-from ev3dev2simulator.visualisation.visualiser import Visualiser
 from ev3dev2simulator.connection.server_sockets import ServerSockets
 from ev3dev2simulator.state.world_simulator import WorldSimulator
 from ev3dev2simulator.state.world_state import WorldState
+from ev3dev2simulator.headless_runner import HeadlessRunner
 from ev3dev2simulator import version as sim_version
 from ev3dev2 import version as api_version
 
@@ -40,6 +40,22 @@ def parse_args(args):
     parser.add_argument("-m", "--maximized",
                         action='store_true',
                         help="Show simulator maximized")
+    parser.add_argument("--headless",
+                        action='store_true',
+                        help="Run the simulation without a window, e.g. on machines without a display")
+    parser.add_argument("--turbo",
+                        action='store_true',
+                        help="Run the simulation headless as fast as possible. Robot programs use the simulated "
+                             "clock instead of the wall clock and run in lock-step with the simulation, "
+                             "so they behave the same as in real time")
+    parser.add_argument("--lockstep",
+                        action='store_true',
+                        help="Only simulate the next frame when all connected bricks are done with the current frame. "
+                             "Makes runs of a program reproducible")
+    parser.add_argument("--shared-memory",
+                        action='store_true',
+                        help="Publish the sensor and motor state of the bricks in shared memory, so robot programs "
+                             "on the same machine read their sensors without sending requests")
     return parser.parse_args(args)
 
 
@@ -54,15 +70,36 @@ def main(orig_path):
         print("version ev3dev2simulator  : " + sim_version.__version__)
         sys.exit(0)
 
-    use_second_screen_to_show_simulator = args['show_on_second_monitor']
-    show_fullscreen = args['fullscreen']
-    show_maximized = args['maximized']
-
     load_config(args['simulation_file'], orig_path)
 
     world_state = WorldState(get_world_config())
 
     world_simulator = WorldSimulator(world_state)
+    if args['lockstep'] or args['turbo']:
+        # in turbo mode, frames only keep up with the programs when they are simulated in lock-step
+        world_simulator.enable_lock_step()
+    if args['shared_memory']:
+        world_simulator.enable_shared_state()
+
+    if args['turbo']:
+        run_headless(world_simulator, world_state, turbo=True)
+    elif args['headless']:
+        run_headless(world_simulator, world_state)
+    else:
+        run_visualiser(world_simulator, world_state, args)
+
+
+def run_visualiser(world_simulator, world_state, args):
+    """
+    Runs the simulation in a window. The visualiser drives the simulation.
+    """
+    # only import the visualisation (arcade/pyglet) when a window is actually shown
+    # pylint: disable=import-outside-toplevel
+    from ev3dev2simulator.visualisation.visualiser import Visualiser
+
+    use_second_screen_to_show_simulator = args['show_on_second_monitor']
+    show_fullscreen = args['fullscreen']
+    show_maximized = args['maximized']
 
     visualiser = Visualiser(world_simulator, world_state, show_fullscreen, show_maximized,
                             use_second_screen_to_show_simulator)
@@ -75,6 +112,27 @@ def main(orig_path):
     visualiser.run()
 
 
+def run_headless(world_simulator, world_state, turbo=False):
+    """
+    Runs the simulation without a window. The headless runner drives the simulation until interrupted.
+    """
+    runner = HeadlessRunner(world_simulator, world_state, turbo)
+    runner.setup()
+
+    server_thread = ServerSockets(world_simulator)
+    server_thread.daemon = True
+    server_thread.start()
+
+    if turbo:
+        print('Running simulation headless in turbo mode, press Ctrl-C to stop')
+    else:
+        print('Running simulation headless, press Ctrl-C to stop')
+    try:
+        runner.run()
+    except KeyboardInterrupt:
+        runner.stop()
+
+
 if __name__ == '__main__':
     _ORIG_PATH = os.getcwd()
     SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
@@ -0,0 +1,191 @@
+"""
+The distance_field module contains the class DistanceField, a raster of the distances to the shapes that do not move.
+"""
+
+import math
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pymunk
+
+from ev3dev2simulator.util.util import distance_between_points
+
+
+class DistanceField:
+    """
+    A DistanceField divides the board in square cells and holds for every cell the distance from its center to the
+    nearest static shape, a shape of which the body does not move by itself. A ray is traced through the field by
+    stepping as far as the distance of the cell it reaches, which never passes a shape. Only where the ray comes
+    within a cell of a shape, the shapes near that cell are checked exactly. So the cost of a ray hardly depends on
+    the number of static shapes, and the distances are the same as checking the shapes themselves.
+
+    The field reaches a cell beyond the board on every side, so rays that end on the edge of the board do not leave
+    it. Distances are calculated up to MAX_CELLS cells from a shape, further cells hold that distance.
+
+    Static shapes can still be moved by hand. The field is then invalidated, and calculated again when a ray
+    is traced through it.
+    """
+
+    MAX_CELLS = 32
+
+    def __init__(self, shapes: List[pymunk.Shape], width: float, height: float, cell_size: float,
+                 radius: float = 1):
+        """
+        Create the field of the given shapes, which is calculated when the first ray is traced.
+        :param shapes: that do not move by themselves.
+        :param width: of the board, in the coordinates of the shapes.
+        :param height: of the board, in the coordinates of the shapes.
+        :param cell_size: width and height of a cell, in the coordinates of the shapes.
+        :param radius: of the rays traced through the field.
+        """
+        self.shapes = shapes
+        self.cell_size = cell_size
+        self.radius = radius
+        self.columns = max(1, int(np.ceil(width / cell_size))) + 2
+        self.rows = max(1, int(np.ceil(height / cell_size))) + 2
+        self.max_distance = self.MAX_CELLS * cell_size
+        # a ray anywhere in a cell can be this much nearer to a shape than the distance of the cell
+        self.margin = cell_size * math.sqrt(2) / 2 + radius
+
+        self.distances = None
+        # the indices of the shapes near every cell that is near any shape
+        self.near_shapes = None
+
+    def invalidate(self):
+        """
+        Calculate the field again before the next ray is traced, for example because a static shape has been moved.
+        """
+        self.distances = None
+        self.near_shapes = None
+
+    def _calculate(self):
+        """
+        Calculate the distance of every cell to the nearest shape, and which shapes every cell is near to.
+        """
+        self.distances = np.full((self.rows, self.columns), float(self.max_distance))
+        self.near_shapes = {}
+        for index, shape in enumerate(self.shapes):
+            # only the cells up to the max distance from the bounding box of the shape
+            bb = shape.cache_bb()
+            first_column, last_column = self._cell(bb.left - self.max_distance, bb.right + self.max_distance,
+                                                   self.columns)
+            first_row, last_row = self._cell(bb.bottom - self.max_distance, bb.top + self.max_distance, self.rows)
+            if first_column > last_column or first_row > last_row:
+                continue
+            xs = (np.arange(first_column, last_column + 1) - 0.5) * self.cell_size
+            ys = (np.arange(first_row, last_row + 1)[:, np.newaxis] - 0.5) * self.cell_size
+
+            distances = signed_distance(shape, xs, ys)
+            window = self.distances[first_row:last_row + 1, first_column:last_column + 1]
+            np.minimum(window, distances, out=window)
+            # shapes a ray may hit within a cell, from anywhere in the cell, are near it
+            for row, column in np.argwhere(distances <= self.margin + self.cell_size + self.radius).tolist():
+                self.near_shapes.setdefault((first_row + row) * self.columns + first_column + column, []).append(index)
+
+    def _cell(self, lower: float, upper: float, cells: int) -> Tuple[int, int]:
+        """
+        Get the first and last cell, on the board, between the given coordinates on an axis.
+        """
+        return max(0, int(lower // self.cell_size) + 1), min(cells - 1, int(upper // self.cell_size) + 1)
+
+    def trace(self, start: Tuple[float, float], end: Tuple[float, float]) -> Optional[float]:
+        """
+        Get the distance from the start of the given ray to where it first hits a shape.
+        :param start: of the ray.
+        :param end: of the ray.
+        :return: the distance to the point the ray hits or None if the ray does not hit any shape.
+        """
+        if self.distances is None:
+            self._calculate()
+
+        length = distance_between_points(start[0], start[1], end[0], end[1])
+        if length == 0:
+            return None
+        direction_x, direction_y = (end[0] - start[0]) / length, (end[1] - start[1]) / length
+
+        # the shapes the ray has been checked against, and the nearest hit of those
+        checked = set()
+        nearest = None
+        travelled = 0
+        while travelled <= length:
+            column = int((start[0] + direction_x * travelled) // self.cell_size) + 1
+            row = int((start[1] + direction_y * travelled) // self.cell_size) + 1
+            if not (0 <= row < self.rows and 0 <= column < self.columns):
+                # beyond the board, the rest of the ray is checked against every shape
+                return self._hit(range(len(self.shapes)), start, end)
+
+            clearance = self.distances.item(row, column) - self.margin
+            if clearance > 0:
+                travelled += clearance
+                continue
+
+            # near a shape: a hit within a cell is the first hit, a hit further on may be behind a shape that is not
+            # near any cell so far. Steps of half a cell do not pass a hit without finding it within a cell.
+            for index in self.near_shapes.get(row * self.columns + column, ()):
+                if index in checked:
+                    continue
+                checked.add(index)
+                query = self.shapes[index].segment_query(start, end, self.radius)
+                if query.shape is None:
+                    continue
+                # pymunk reports a ray starting inside a shape to hit it at the end of the ray, so that hit is kept
+                # until the ray has been traced as far
+                distance = distance_between_points(start[0], start[1], query.point.x, query.point.y)
+                if nearest is None or distance < nearest:
+                    nearest = distance
+            if nearest is not None and nearest <= travelled + self.cell_size:
+                return nearest
+            travelled += self.cell_size / 2
+        return nearest
+
+    def _hit(self, indices, start: Tuple[float, float], end: Tuple[float, float]) -> Optional[float]:
+        """
+        Get the distance from the start of the given ray to the nearest point where it hits one of the given shapes.
+        """
+        nearest = None
+        for index in indices:
+            query = self.shapes[index].segment_query(start, end, self.radius)
+            if query.shape is not None:
+                distance = distance_between_points(start[0], start[1], query.point.x, query.point.y)
+                if nearest is None or distance < nearest:
+                    nearest = distance
+        return nearest
+
+
+def signed_distance(shape: pymunk.Shape, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """
+    Get the distances of the given points to the given shape, negative for points inside the shape.
+    :param shape: a polygon, circle or segment, of which the body has been positioned.
+    :param xs: coordinates of the points, broadcast against ys.
+    :param ys: coordinates of the points.
+    :return: array of the distances of the points.
+    """
+    body = shape.body
+    if isinstance(shape, pymunk.Circle):
+        center = body.local_to_world(shape.offset)
+        return np.hypot(xs - center.x, ys - center.y) - shape.radius
+
+    if isinstance(shape, pymunk.Segment):
+        points = [body.local_to_world(shape.a), body.local_to_world(shape.b)]
+        return _distance_to_segment(xs, ys, points[0], points[1]) - shape.radius
+
+    points = [body.local_to_world(vertex) for vertex in shape.get_vertices()]
+    distances = np.full(np.broadcast(xs, ys).shape, np.inf)
+    is_inside = np.ones(distances.shape, dtype=bool)
+    for first, second in zip(points, points[1:] + points[:1]):
+        np.minimum(distances, _distance_to_segment(xs, ys, first, second), out=distances)
+        # the vertices of pymunk polygons are counterclockwise, so the inside is left of every edge
+        is_inside &= (second.x - first.x) * (ys - first.y) - (second.y - first.y) * (xs - first.x) >= 0
+    return np.where(is_inside, -distances, distances) - shape.radius
+
+
+def _distance_to_segment(xs: np.ndarray, ys: np.ndarray, first, second) -> np.ndarray:
+    """
+    Get the distances of the given points to the segment between the given points.
+    """
+    delta_x, delta_y = second.x - first.x, second.y - first.y
+    squared_length = delta_x * delta_x + delta_y * delta_y
+    if squared_length == 0:
+        return np.hypot(xs - first.x, ys - first.y)
+    fraction = np.clip(((xs - first.x) * delta_x + (ys - first.y) * delta_y) / squared_length, 0, 1)
+    return np.hypot(xs - (first.x + fraction * delta_x), ys - (first.y + fraction * delta_y))
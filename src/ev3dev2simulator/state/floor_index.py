@@ -0,0 +1,58 @@
+"""
+The floor_index module contains the class FloorIndex, the obstacles on the floor as static shapes of the pymunk space.
+"""
+
+from typing import List
+
+import pymunk
+
+# the category of the shapes of the floor obstacles, which shapes of bodies exclude from their mask so they never
+# collide with them
+FLOOR_CATEGORY = 1 << 31
+FLOOR_FILTER = pymunk.ShapeFilter(categories=FLOOR_CATEGORY, mask=FLOOR_CATEGORY)
+BODY_MASK = pymunk.ShapeFilter.ALL_MASKS() ^ FLOOR_CATEGORY
+
+
+class FloorIndex:
+    """
+    A FloorIndex adds the obstacles on the floor, such as lakes, borders and the edge, to the pymunk space as static
+    shapes on its static body. The shapes are sensors that only match FLOOR_FILTER, so they never touch the robots or
+    the obstacles on the floor. They let the spatial index of the space look up the obstacles near a point, which are
+    then checked exactly by their collided_with. So the cost of a lookup hardly depends on the number of obstacles.
+    """
+
+    # how far a shape may be from a point for its obstacle to be near it, in mm
+    NEAR_DISTANCE = 1
+
+    def __init__(self, space: pymunk.Space, obstacles: list):
+        """
+        Add the static shapes of the given obstacles to the given space.
+        :param space: of the world.
+        :param obstacles: on the floor, of which the collision areas have been calculated.
+        """
+        self.space = space
+        self.obstacles_by_shape = {}
+        # obstacles without shapes are near every point
+        self.indexed = set()
+        for obstacle in obstacles:
+            shapes = obstacle.create_floor_shapes(space.static_body)
+            for shape in shapes:
+                shape.sensor = True
+                shape.filter = FLOOR_FILTER
+                self.obstacles_by_shape[shape] = obstacle
+            if shapes:
+                self.indexed.add(obstacle)
+                space.add(*shapes)
+
+    def get_near_obstacles(self, x: float, y: float, obstacles: list) -> List:
+        """
+        Get the given obstacles that may collide with the given point.
+        :param x: coordinate of the point, in mm.
+        :param y: coordinate of the point, in mm.
+        :param obstacles: to check, such as the sensible obstacles of a body part.
+        :return: list of the obstacles near the point, in the same order as the given obstacles.
+        """
+        # shapes of bodies that do not exclude the floor from their mask match the filter as well
+        near = {self.obstacles_by_shape.get(query.shape)
+                for query in self.space.point_query((x, y), self.NEAR_DISTANCE, FLOOR_FILTER)}
+        return [obstacle for obstacle in obstacles if obstacle in near or obstacle not in self.indexed]
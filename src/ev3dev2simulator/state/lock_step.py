@@ -0,0 +1,119 @@
+"""
+The lock_step module contains the class LockStep, which keeps the simulation and the connected bricks in lock-step.
+"""
+
+import threading
+from typing import Hashable
+
+
+class LockStep:
+    """
+    In lock-step mode, the simulator only advances a frame once every connected brick has acknowledged the current
+    frame. A brick acknowledges a frame by either using up its budget of requests for that frame or by waiting for the
+    next frame. While a frame is simulated, no requests are processed. This makes the frame at which every request
+    is processed independent of thread scheduling, so a program always produces the same run.
+    """
+
+    def __init__(self, requests_per_frame: int):
+        self.requests_per_frame = requests_per_frame
+        self.frame = 0
+        self.is_simulating = False
+
+        # number of requests processed in the current frame per connected brick
+        self.requests = {}
+        # connected bricks that are processing a request
+        self.busy = set()
+        # connected bricks that wait for the next frame
+        self.waiting = set()
+
+        self.condition = threading.Condition()
+
+    def connect(self, brick: Hashable):
+        """
+        Take part in lock-step with a newly connected brick.
+        :param brick: key identifying the brick.
+        """
+        with self.condition:
+            self.requests[brick] = 0
+
+    def disconnect(self, brick: Hashable):
+        """
+        Stop taking part in lock-step with a disconnected brick, so the simulation does not wait for it anymore.
+        :param brick: key identifying the brick.
+        """
+        with self.condition:
+            self.requests.pop(brick, None)
+            self.busy.discard(brick)
+            self.waiting.discard(brick)
+            self.condition.notify_all()
+
+    def start_request(self, brick: Hashable):
+        """
+        Block until the given brick is allowed to process a request in the current frame.
+        :param brick: key identifying the brick.
+        """
+        with self.condition:
+            self.condition.wait_for(lambda: not self.is_simulating
+                                    and self.requests.get(brick, 0) < self.requests_per_frame)
+            if brick in self.requests:
+                self.requests[brick] += 1
+                self.busy.add(brick)
+
+    def end_request(self, brick: Hashable):
+        """
+        Mark the request of the given brick as processed.
+        :param brick: key identifying the brick.
+        """
+        with self.condition:
+            self.busy.discard(brick)
+            self.condition.notify_all()
+
+    def wait_for_next_frame(self, brick: Hashable):
+        """
+        Acknowledge the current frame for the given brick and block until the next frame has been simulated.
+        :param brick: key identifying the brick.
+        """
+        with self.condition:
+            if brick not in self.requests:
+                return
+            frame = self.frame
+            self.waiting.add(brick)
+            self.busy.discard(brick)
+            self.condition.notify_all()
+            self.condition.wait_for(lambda: self.frame > frame or brick not in self.requests)
+            if brick in self.requests:
+                self.busy.add(brick)
+
+    def start_frame(self, timeout: float) -> bool:
+        """
+        Block until all connected bricks have acknowledged the current frame. No requests are processed
+        until end_frame has been called.
+        :param timeout: maximum number of seconds to wait.
+        :return: True if the next frame can be simulated, False if the bricks did not acknowledge in time.
+        """
+        with self.condition:
+            self.is_simulating = self.condition.wait_for(self._all_acknowledged, timeout)
+            return self.is_simulating
+
+    def end_frame(self):
+        """
+        Start a new frame for all connected bricks after a frame has been simulated.
+        """
+        with self.condition:
+            self.frame += 1
+            self.is_simulating = False
+            self.waiting.clear()
+            for brick in self.requests:
+                self.requests[brick] = 0
+            self.condition.notify_all()
+
+    def _all_acknowledged(self) -> bool:
+        """
+        Check if all connected bricks acknowledged the current frame. Without connected bricks, there is
+        nobody to acknowledge and the simulation waits.
+        """
+        if not self.requests:
+            return False
+        return all(brick in self.waiting
+                   or (self.requests[brick] >= self.requests_per_frame and brick not in self.busy)
+                   for brick in self.requests)
@@ -3,12 +3,19 @@ The message_processor module contains the class MessageProcessor.
 This class takes the commands given and converts them into jobs the robot simulator understands.
 """
 
-from typing import Any, Tuple
+import queue
+import threading
+from functools import partial
+from typing import Any, Callable, Optional, Tuple
 # noinspection PyProtectedMember
 from ev3dev2._platform.ev3 import LEDS
 from ev3dev2simulator.config.config import get_simulation_settings
+from ev3dev2simulator.connection.shared_state_table import SharedStateTable
 from ev3dev2simulator.state.motor_command_processor import MotorCommandProcessor
 from ev3dev2simulator.state.robot_simulator import RobotSimulator
+from ev3dev2simulator.state.lock_step import LockStep
+from ev3dev2simulator.state.motion_segment import MotionSegment
+from ev3dev2simulator.state.simulation_clock import SimulationClock
 
 from ev3dev2simulator.connection.message.config_request import ConfigRequest
 from ev3dev2simulator.connection.message.rotate_command import RotateCommand
@@ -16,6 +23,12 @@ from ev3dev2simulator.connection.message.stop_command import StopCommand
 from ev3dev2simulator.connection.message.sound_command import SoundCommand
 from ev3dev2simulator.connection.message.led_command import LedCommand
 from ev3dev2simulator.connection.message.data_request import DataRequest
+from ev3dev2simulator.connection.message.events_request import EventsRequest
+from ev3dev2simulator.connection.message.shared_state_request import SharedStateRequest
+from ev3dev2simulator.connection.message.snapshot_request import SnapshotRequest
+from ev3dev2simulator.connection.message.subscribe_request import SubscribeRequest
+from ev3dev2simulator.connection.message.values_request import ValuesRequest
+from ev3dev2simulator.connection.message.wait_request import WaitRequest
 
 
 LED_COLORS = dict()
@@ -33,7 +46,8 @@ class MessageProcessor:
     them to the RobotState.
     """
 
-    def __init__(self, brick_id: int, robot_sim: RobotSimulator):
+    def __init__(self, brick_id: int, robot_sim: RobotSimulator, clock: SimulationClock = None,
+                 lock_step: LockStep = None, shared_state: bool = False, command_queue: queue.SimpleQueue = None):
         cfg = get_simulation_settings()
 
         self.brick_id = brick_id
@@ -43,12 +57,28 @@ class MessageProcessor:
         self.frames_per_second = int(cfg['exec_settings']['frames_per_second'])
 
         self.robot_sim = robot_sim
+        self.clock = clock
+        # when given, changes to the robot are executed by the thread simulating the world, see _execute
+        self.command_queue = command_queue
+        self.lock_step = lock_step
+        # key of the brick taking part in lock-step
+        self.brick_key = (robot_sim.robot.name, brick_id)
+
+        # addresses of the sensors of which changed values are pushed to the brick and the values last pushed
+        self.subscription = None
+        self.pushed_values = {}
+        self.subscription_lock = threading.Lock()
+
+        # table in shared memory in which the state of the brick is published, only when sharing memory is enabled
+        self.shared_state = shared_state
+        self.shared_state_table = None
+        self.shared_state_lock = threading.Lock()
         self.motor_command_processor = MotorCommandProcessor()
         self.led_cache = {k: None for k in LEDS.values()}
 
     def process_rotate_command(self, command: RotateCommand) -> float:
         """
-        Process the given RotateCommand by creating the appropriate motor jobs in the RobotState.
+        Process the given RotateCommand by creating the appropriate motion segment in the RobotSimulator.
         The type of jobs created  depends on the motor called.
         The command for the arm motor is processed for degrees, while the other motors are processed for distance.
         :param command: to process.
@@ -59,12 +89,8 @@ class MessageProcessor:
         motor = self.robot_sim.robot.get_actuator(full_address)
         spf, frames, coast_frames, run_time = self._process_rotate_command_values(command, motor)
 
-        self.robot_sim.clear_actuator_jobs(full_address)
-
-        for _ in range(frames):
-            self.robot_sim.put_actuator_job(full_address, spf)
-
-        self._process_coast(coast_frames, spf, motor)
+        segment = MotionSegment(spf, frames, coast_frames, self._coasting_sub(motor))
+        self._execute(partial(self.robot_sim.set_actuator_segment, full_address, segment))
         return run_time
 
     def _process_rotate_command_values(self, command: RotateCommand, motor: any) -> Tuple[float, int, int, float]:
@@ -95,8 +121,9 @@ class MessageProcessor:
 
         spf, frames, run_time = self._process_stop_command_values(command, motor)
 
-        self.robot_sim.clear_actuator_jobs(full_address)
-        self._process_coast(frames, spf, motor)
+        # the motor coasts from its current speed, without any frames at constant speed
+        segment = MotionSegment(spf, 0, frames, self._coasting_sub(motor))
+        self._execute(partial(self.robot_sim.set_actuator_segment, full_address, segment))
         return run_time
 
     def _process_stop_command_values(self, command: StopCommand, motor: any) -> Tuple[float, int, float]:
@@ -112,23 +139,12 @@ class MessageProcessor:
             return -dpf, frames, run_time
         return self.motor_command_processor.process_stop_command_distance(command)
 
-    def _process_coast(self, frames, ppf, motor):
+    def _coasting_sub(self, motor) -> float:
         """
-        Process coasting by creating move jobs decreasing in speed in the RobotState.
-        :param frames: to coast before coming to a halt.
-        :param ppf: speed of motor when the coasting starts.
+        Get the speed subtracted every frame when the given motor is coasting to a halt.
         :param motor: the motor in the RobotState.
         """
-
-        coasting_sub = self.degree_coasting_sub if motor.ev3type == 'arm' else self.distance_coasting_sub
-        og_ppf = ppf
-
-        for _ in range(frames):
-            if og_ppf > 0:
-                ppf = max(ppf - coasting_sub, 0)
-            else:
-                ppf = min(ppf + coasting_sub, 0)
-            self.robot_sim.put_actuator_job(self._to_full_address(motor.address), ppf)
+        return self.degree_coasting_sub if motor.ev3type == 'arm' else self.distance_coasting_sub
 
     def process_led_command(self, command: LedCommand):
         """
@@ -142,7 +158,7 @@ class MessageProcessor:
         color_tuple = (self.led_cache[led_id + ':red:brick-status'], self.led_cache[led_id + ':green:brick-status'])
         color = self._red_green_to_color(color_tuple)
         if color is not None:
-            self.robot_sim.set_led_color(self.brick_id, led_id, color)
+            self._execute(partial(self.robot_sim.set_led_color, self.brick_id, led_id, color))
 
     @staticmethod
     def _red_green_to_color(color_tuple):
@@ -176,18 +192,145 @@ class MessageProcessor:
         frames = int(round(self.frames_per_second * command.duration))
         msg_len = len(command.message)
         message = '\n'.join(command.message[i:i + 10] for i in range(0, msg_len, 10))
-        for i in range(frames):
-            self.robot_sim.put_actuator_job(self._to_full_address('speaker'), message)
+        self._execute(partial(self.robot_sim.add_actuator_segment, self._to_full_address('speaker'),
+                              MotionSegment(message, frames)))
 
     def process_data_request(self, request: DataRequest) -> Any:
         """
         Process the given data request by retrieving the requested value from the RobotState and returning this.
         :param request: to process.
-        :return: a dictionary containing the requested value.
+        :return: the requested value or, when the frame is requested as well, a dictionary containing the value
+        and the frame in which the sensor took it.
         """
         full_address = self._to_full_address(request.address)
+        if request.with_frame:
+            frame, value = self.robot_sim.get_sample(full_address)
+            return {'frame': frame, 'value': value}
         return self.robot_sim.get_value(full_address)
 
+    def process_events_request(self, request: EventsRequest) -> Optional[dict]:
+        """
+        Process the given events request by retrieving the events of the sensor after the requested frame.
+        :param request: to process.
+        :return: a dictionary containing the events and the current frame, from which the next request can continue,
+        or None when the sensor does not report events.
+        """
+        full_address = self._to_full_address(request.address)
+        return self.robot_sim.get_events(full_address, request.after_frame)
+
+    def process_values_request(self, request: ValuesRequest) -> Optional[list]:
+        """
+        Process the given values request by retrieving the values of the sensor in the requested mode.
+        :param request: to process.
+        :return: a list of the values, None when the sensor does not support the mode.
+        """
+        full_address = self._to_full_address(request.address)
+        return self.robot_sim.get_mode_values(full_address, request.mode)
+
+    def process_snapshot_request(self, _request: SnapshotRequest) -> dict:
+        """
+        Process the given snapshot request by retrieving the values of all sensors of the brick from the RobotState.
+        :param _request: to process.
+        :return: a dictionary containing the values by address and the frame they belong to, which is None when
+        there is no simulation clock.
+        """
+        # the frame is read first: the values are updated before the clock ticks, so values read while a frame
+        # is simulated belong to the same or a later frame, and the client never keeps values longer than it should
+        frame = self.clock.frame if self.clock is not None else None
+        values = {address: value for (_, address), value in self.robot_sim.robot.get_values(self.brick_id).items()}
+        return {'frame': frame, 'values': values}
+
+    def process_subscribe_request(self, request: SubscribeRequest) -> dict:
+        """
+        Process the given subscribe request by remembering the addresses of the sensors subscribed to.
+        :param request: to process.
+        :return: a dictionary containing the current values of the sensors by address and the frame they belong to.
+        """
+        with self.subscription_lock:
+            self.subscription = list(request.addresses)
+            self.pushed_values = {}
+        return self.get_sensor_updates()
+
+    def reset_subscription(self):
+        """
+        Stop pushing sensor values, for example because the brick disconnected.
+        """
+        with self.subscription_lock:
+            self.subscription = None
+            self.pushed_values = {}
+
+    def get_sensor_updates(self) -> Optional[dict]:
+        """
+        Get the values of the sensors subscribed to that changed since they were last returned.
+        :return: a dictionary containing the changed values by address and the frame they belong to
+        or None when there is no subscription.
+        """
+        with self.subscription_lock:
+            if self.subscription is None:
+                return None
+
+            # the frame is read first, as for a snapshot
+            frame = self.clock.frame if self.clock is not None else None
+            changed = {}
+            for address in self.subscription:
+                value = self.robot_sim.get_value(self._to_full_address(address))
+                if address not in self.pushed_values or self.pushed_values[address] != value:
+                    changed[address] = value
+                    self.pushed_values[address] = value
+            return {'frame': frame, 'values': changed}
+
+    def process_shared_state_request(self, _request: SharedStateRequest) -> Optional[dict]:
+        """
+        Process the given shared state request by creating the table in shared memory for the brick, if it does not
+        exist yet. The layout contains the sensors of the brick followed by its motors, in the order of the robot
+        configuration. Sensors hold their value, motors the distance or degrees of the last frame.
+        :param _request: to process.
+        :return: a dictionary containing the name of the table and the addresses of its layout
+        or None when sharing memory is not enabled.
+        """
+        if not self.shared_state:
+            return None
+
+        with self.shared_state_lock:
+            if self.shared_state_table is None:
+                addresses = [address for (brick_id, address) in self.robot_sim.robot.sensors
+                             if brick_id == self.brick_id]
+                addresses += [address for (brick_id, address), actuator in self.robot_sim.queue_info.items()
+                              if brick_id == self.brick_id and actuator.ev3type in ('motor', 'arm')]
+                self.shared_state_table = SharedStateTable.create(addresses)
+            table = self.shared_state_table
+        self.publish_shared_state()
+        return {'name': table.name, 'addresses': table.addresses}
+
+    def publish_shared_state(self):
+        """
+        Publish the current state of the brick in its shared memory table, if there is one. This is called
+        by the thread simulating the world at the end of every frame.
+        """
+        with self.shared_state_lock:
+            table = self.shared_state_table
+            if table is None:
+                return
+
+            values = []
+            for address in table.addresses:
+                full_address = self._to_full_address(address)
+                if full_address in self.robot_sim.robot.sensors:
+                    values.append(self.robot_sim.get_value(full_address))
+                else:
+                    values.append(self.robot_sim.get_actuator_job(full_address) or 0.0)
+            frame = self.clock.frame if self.clock is not None else 0
+            table.publish(frame, values)
+
+    def close_shared_state(self):
+        """
+        Remove the shared memory table of the brick, for example because the brick disconnected.
+        """
+        with self.shared_state_lock:
+            if self.shared_state_table is not None:
+                self.shared_state_table.close()
+                self.shared_state_table = None
+
     def process_config_request(self, request: ConfigRequest) -> Any:
         """
         Process the given data request by retrieving the port of the device from the RobotState and returning this.
@@ -196,5 +339,47 @@ class MessageProcessor:
         """
         return self.robot_sim.determine_port(self.brick_id, request.kwargs, request.class_name)
 
+    def process_time_request(self) -> Optional[float]:
+        """
+        Process a time request by retrieving the time of the simulation clock.
+        :return: the simulated time in seconds or None when the robot should use the wall clock.
+        """
+        if self.clock is None:
+            return None
+        return self.clock.get_virtual_time()
+
+    def process_wait_request(self, request: WaitRequest) -> Optional[float]:
+        """
+        Process the given wait request by waiting at most a single frame for the simulation clock to reach the
+        requested time. In lock-step mode, waiting acknowledges the current frame.
+        :param request: to process.
+        :return: the simulated time in seconds after waiting or None when the robot should use the wall clock.
+        """
+        if self.clock is None or not self.clock.virtual:
+            return None
+        if self.lock_step is not None:
+            # the brick acknowledges the current frame by waiting for the next one
+            if self.clock.get_time() < request.until:
+                self.lock_step.wait_for_next_frame(self.brick_key)
+            return self.clock.get_virtual_time()
+        return self.clock.wait_until(request.until)
+
+    def reset_actuators(self):
+        """
+        Stop all actuators of the brick, for example because the brick disconnected.
+        """
+        self._execute(partial(self.robot_sim.reset_queues_of_brick, self.brick_id))
+
+    def _execute(self, command: Callable[[], None]):
+        """
+        Execute a change to the simulated robot. With a command queue, the change is queued to be executed by
+        the thread simulating the world at the start of the next frame, otherwise it is executed right away.
+        :param command: function without arguments making the change.
+        """
+        if self.command_queue is None:
+            command()
+        else:
+            self.command_queue.put(command)
+
     def _to_full_address(self, address: str):
         return self.brick_id, address
@@ -0,0 +1,51 @@
+"""
+The motion_segment module contains the class MotionSegment, which describes what an actuator does during a number
+of frames.
+"""
+
+from typing import Any
+
+
+class MotionSegment:
+    """
+    A MotionSegment represents the jobs of an actuator for a number of consecutive frames: a constant job during
+    the given number of frames, optionally followed by coasting frames in which the job, a distance per frame,
+    decreases bit by bit until the motor does not move anymore. Instead of storing a job for every frame,
+    the job of the next frame is calculated when it is needed.
+
+    Speakers also use segments, where the job is the message shown during the frames the sound plays.
+    """
+
+    def __init__(self, job: Any, frames: int, coast_frames: int = 0, coasting_sub: float = 0.0):
+        self.job = job
+        self.frames = frames
+        self.coast_frames = coast_frames
+        self.coasting_sub = coasting_sub
+
+        self.elapsed_frames = 0
+        self.coast_job = job
+
+    def is_done(self) -> bool:
+        """
+        Check if all jobs of this segment have been executed.
+        """
+        return self.elapsed_frames >= self.frames + self.coast_frames
+
+    def next_job(self) -> Any:
+        """
+        Get the job of the next frame. The coasting jobs are calculated from the previous coasting job,
+        in the same way the MessageProcessor used to create them.
+        :return: the job or None when the segment is done.
+        """
+        if self.is_done():
+            return None
+
+        self.elapsed_frames += 1
+        if self.elapsed_frames <= self.frames:
+            return self.job
+
+        if self.job > 0:
+            self.coast_job = max(self.coast_job - self.coasting_sub, 0)
+        else:
+            self.coast_job = min(self.coast_job + self.coasting_sub, 0)
+        return self.coast_job
@@ -0,0 +1,42 @@
+"""
+The physics_thread module contains the class PhysicsThread, which simulates the world next to the window drawing it.
+"""
+
+import threading
+import time
+
+from ev3dev2simulator.state.world_simulator import WorldSimulator
+
+
+class PhysicsThread(threading.Thread):
+    """
+    Thread updating the world simulator with the wall time passed, so frames are simulated at the configured frames
+    per second however long the window takes to draw them. The window draws the render snapshots the world simulator
+    publishes, so it never waits for a frame to be simulated and a frame never waits for the window.
+    """
+
+    def __init__(self, world_sim: WorldSimulator):
+        super().__init__(name='physics', daemon=True)
+        self.world_simulator = world_sim
+        self.is_running = threading.Event()
+        self.is_running.set()
+
+    def run(self):
+        """
+        Update the world until stopped, sleeping until the next frame is due in between.
+        """
+        frame_time = self.world_simulator.clock.frame_time
+        previous = time.perf_counter()
+        while self.is_running.is_set():
+            now = time.perf_counter()
+            self.world_simulator.update(now - previous)
+            previous = now
+            delay = frame_time - self.world_simulator.accumulated_time - (time.perf_counter() - now)
+            if delay > 0:
+                time.sleep(delay)
+
+    def stop(self):
+        """
+        Stop updating the world after the current update.
+        """
+        self.is_running.clear()
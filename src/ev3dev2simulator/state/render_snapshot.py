@@ -0,0 +1,38 @@
+"""
+The render_snapshot module contains the classes RenderSnapshot and RobotSnapshot, the state of the world as it is
+drawn on screen after a frame has been simulated.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Mapping, Tuple
+
+# center x and center y in mm and angle in degrees of a sprite
+Pose = Tuple[float, float, float]
+
+
+@dataclass(frozen=True)
+class RobotSnapshot:
+    """
+    The state of a robot as drawn on screen: the poses of its parts and what the sidebar shows of it.
+    """
+    name: str
+    # poses in the order of the parts of the robot
+    part_poses: Tuple[Pose, ...]
+    led_colors: Mapping[Any, int]
+    # rotations of the arms, in the order of the arms shown in the sidebar
+    arm_degrees: Tuple[float, ...]
+    values: Mapping[Any, Any]
+    sounds: Mapping[Any, Any]
+    is_falling: bool
+
+
+@dataclass(frozen=True)
+class RenderSnapshot:
+    """
+    The state of the world after a frame, published by the thread simulating the world and drawn by the window.
+    Nothing in it is changed once published, so it can be drawn while the next frame is simulated.
+    """
+    frame: int
+    # poses in the order of the obstacles of the world
+    obstacle_poses: Tuple[Pose, ...]
+    robots: Tuple[RobotSnapshot, ...]
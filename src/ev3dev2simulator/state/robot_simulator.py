@@ -3,13 +3,10 @@ The robot_simulator module contains the RobotSimulator class which handles how t
 """
 
 
-import math
-import threading
-from queue import Queue, Empty
-from typing import Any
-# noinspection PyProtectedMember
-from pymunk import Vec2d
+from collections import deque
+from typing import Any, Optional
 
+from ev3dev2simulator.state.motion_segment import MotionSegment
 from ev3dev2simulator.state.robot_state import RobotState
 
 
@@ -17,14 +14,17 @@ class RobotSimulator:
     """
     Class responsible for inner-thread communication. All jobs coming from the robot
     are stored in this class to be retrieved by the simulator for updating/rendering
-    of the simulated robot.
+    of the simulated robot. The jobs are only changed by the thread simulating the world, which executes the
+    commands the bricks queue (see WorldSimulator.process_commands), so they need no lock.
     """
 
     def __init__(self, robot: RobotState):
         self.robot = robot
 
-        self.actuator_queues = {}
+        self.actuator_segments = {}
         self.queue_info = {}
+        # job of every actuator in the last frame, None when it did nothing
+        self.actuator_jobs = {}
 
         for actuator in self.robot.get_actuators():
             # actuator is an instance of Arm, Led, Speaker, Wheel  (childs of RobotPart)
@@ -33,68 +33,73 @@ class RobotSimulator:
                 # note: field actuator.address should really be called actuator.port
                 #       because real address of an actuator is brick_id and port
                 self.queue_info[actuator_address] = actuator
-                self.actuator_queues[actuator_address] = Queue()
+                self.actuator_segments[actuator_address] = deque()
 
         self.should_reset = False
 
-        self.motor_lock = threading.Lock()
-
     def update(self):
         """
-        processes the actuators and sensors of the robot and syncs the sprites to the physics.
+        processes the actuators and sensors of the robot.
         """
         if self.should_reset:
             self.reset()
 
         else:
             self._process_job_per_actuator()
-            self._process_leds()
             self.robot.update_sensors()
-            self._sync_physics_sprites()
 
-    def put_actuator_job(self, actuator_address: (int, str), job: float):
+    def set_actuator_segment(self, actuator_address: (int, str), segment: MotionSegment):
+        """
+        Replace all current jobs of an actuator by the jobs of the given segment.
+        :param actuator_address: Address of the actuator (brick_id,device_port)
+        :param segment: to execute from the next frame on.
+        """
+        self.actuator_segments[actuator_address] = deque([segment])
+
+    def add_actuator_segment(self, actuator_address: (int, str), segment: MotionSegment):
         """
-        Add a new job for actuator to its own queue.
-        For each unique actuator address there is a separate queue.
+        Add a segment of jobs for an actuator, to be executed after its current jobs.
         :param actuator_address: Address of the actuator (brick_id,device_port)
-        :param job: to add.
+        :param segment: to add.
         """
-        # actuator_queues is a dict with key an actuator_address, and as value a Queue
-        # put_nowait puts a value in the queue without blocking
-        self.actuator_queues[actuator_address].put_nowait(job)
+        self.actuator_segments[actuator_address].append(segment)
 
     def next_actuator_jobs(self) -> any:
         """
-        Get for all actuators of the robot the next job from each actuator's own Queue.
-        Some actuators may have an empty Queue, then the actuator does nothing at the moment.
+        Get for all actuators of the robot the next job from each actuator's own segments.
+        Some actuators may have no segments left, then the actuator does nothing at the moment.
 
-        For example by using this function we can get the next move jobs for the left and right motor from the queues.
+        For example by using this function we can get the next move jobs for the left and right motor.
         A move job in this case is just a floating point number representing the job's move distance.
 
         :return:
            list of job per each actuator of robot as :  List of (actuator_address, job) tuples, where job is None if actuator is inactive.
         """
 
-        self.motor_lock.acquire()
 
         motor_jobs = []
-        for actuator_address, jobs in self.actuator_queues.items():
-            try:
-                job = jobs.get_nowait()
-            except Empty:
-                job = None
+        for actuator_address, segments in self.actuator_segments.items():
+            while segments and segments[0].is_done():
+                segments.popleft()
+            job = segments[0].next_job() if segments else None
             motor_jobs.append((actuator_address, job))
+            self.actuator_jobs[actuator_address] = job
 
-        self.motor_lock.release()
         return motor_jobs
 
+    def get_actuator_job(self, actuator_address: (int, str)) -> Any:
+        """
+        Get the job an actuator executed in the last frame.
+        :param actuator_address: Address of the actuator (brick_id,device_port)
+        :return: the job or None when the actuator did nothing.
+        """
+        return self.actuator_jobs.get(actuator_address)
+
     def clear_actuator_jobs(self, actuator_address: (int, str)):
         """
         Clears all current jobs of an actuator at actuator_address on the robot
         """
-        self.motor_lock.acquire()
-        self.actuator_queues[actuator_address] = Queue()
-        self.motor_lock.release()
+        self.actuator_segments[actuator_address] = deque()
 
     def set_led_color(self, brick_id, led_id, color):
         """
@@ -108,7 +113,7 @@ class RobotSimulator:
         :param brick_id: identifier of brick you want to reset the queues of.
         """
         # actuator_address = (brick_id, device_port)
-        for actuator_address in self.actuator_queues:
+        for actuator_address in self.actuator_segments:
             if actuator_address[0] == brick_id:
                 self.clear_actuator_jobs(actuator_address)
 
@@ -117,7 +122,7 @@ class RobotSimulator:
         Reset the data of this State
         :return:
         """
-        for key in self.actuator_queues:
+        for key in self.actuator_segments:
             self.clear_actuator_jobs(key)
 
         self.robot.reset()
@@ -126,6 +131,15 @@ class RobotSimulator:
     def get_value(self, sensor_address: (int, str)) -> Any:
         return self.robot.get_value(sensor_address)
 
+    def get_sample(self, sensor_address: (int, str)) -> (int, Any):
+        return self.robot.get_sample(sensor_address)
+
+    def get_events(self, sensor_address: (int, str), after_frame: int) -> Optional[dict]:
+        return self.robot.get_events(sensor_address, after_frame)
+
+    def get_mode_values(self, sensor_address: (int, str), mode: str) -> Optional[list]:
+        return self.robot.get_mode_values(sensor_address, mode)
+
     def determine_port(self, brick_id: int, kwargs: dict, class_name: str):
         """
         Determines the port of a device based on the kwargs given to the device.
@@ -187,19 +201,3 @@ class RobotSimulator:
 
         if left_ppf is not None or right_ppf is not None:
             self.robot.execute_movement(left_ppf, right_ppf)
-
-    def _process_leds(self):
-        for address, led_color in self.robot.led_colors.items():
-            self.robot.set_led_color(address, led_color)
-
-
-
-    def _sync_physics_sprites(self):
-        self.robot.set_last_pos(self.robot.body.position)
-        self.robot.last_angle = math.degrees(self.robot.body.angle)
-        for part in self.robot.parts:
-            rel = Vec2d(*part.shape.center_of_gravity)
-            x, y = rel.rotated(self.robot.body.angle) + self.robot.body.position
-            part.sprite.center_x = x
-            part.sprite.center_y = y
-            part.sprite.angle = math.degrees(part.shape.body.angle)
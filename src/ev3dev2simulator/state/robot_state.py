@@ -5,8 +5,9 @@ This class can be seen as a snapshot of the robot at some point in time.
 
 import math
 import threading
+import time
+from types import MappingProxyType
 
-import arcade as _arcade
 import pymunk
 from pymunk.vec2d import Vec2d
 
@@ -21,10 +22,12 @@ from ev3dev2simulator.robotpart.touch_sensor import TouchSensor
 from ev3dev2simulator.robotpart.ultrasonic_sensor_bottom import UltrasonicSensorBottom
 from ev3dev2simulator.robotpart.ultrasonic_sensor_top import UltrasonicSensor
 from ev3dev2simulator.robotpart.wheel import Wheel
+from ev3dev2simulator.state.render_snapshot import RobotSnapshot
+from ev3dev2simulator.state.sensor_snapshot import SensorSnapshot
 from ev3dev2simulator.util.point import Point
 
 from ev3dev2simulator.util.util import calc_differential_steering_angle_x_y
-from ev3dev2simulator.config.config import DEBUG, get_robot_config
+from ev3dev2simulator.config.config import DEBUG, get_robot_config, get_simulation_settings
 
 
 class RobotState:
@@ -33,16 +36,29 @@ class RobotState:
     of parts defined by BodyParts and ExtraBodyParts.
     """
 
-    def __init__(self, config):
-        self.sprite_list = _arcade.SpriteList()
-        self.side_bar_sprites = _arcade.SpriteList()
+    def __init__(self, config, world_lock: threading.RLock = None):
+        # sprites are only created when the robot is visualised (see setup_visuals)
+        self.sprite_list = None
+        self.side_bar_sprites = []
 
         self.sensors = {}
-        # every frame we show the new sensor values in window
-        # so we update sensor values in below field every frame.
-        # This field is written(and read) by simulator thread and read by ev3dev thread
-        # so the prevent corruption by two threads we have to protect access to this field with a mutex.
-        self._sensor_values = {}
+        # the values of the sensors are published in an immutable snapshot, replaced at the start of every frame
+        # by the thread simulating the world, so the threads of the bricks read values without taking any lock.
+        # Sensors are only evaluated when their value is read, at most once per frame, unless they are eager.
+        # The snapshot keeps the frame in which every value was evaluated, so a value is evaluated again in the
+        # next frame; a read evaluating a sensor holds the world lock and publishes a snapshot with the new value.
+        self.eager_sensors = get_simulation_settings()['exec_settings']['eager_sensors']
+        self.sensor_snapshot = SensorSnapshot.create(0, {})
+        # reads that had to evaluate a sensor, and the seconds they waited for the world lock to do so, which shows
+        # how much reading sensors contends with simulating the world
+        self.evaluating_reads = 0
+        self.lock_wait_time = 0.0
+        # sensors with a sample rate take a sample every so many frames, in the frames that have the sensor's offset
+        # as remainder, so not all sensors with the same rate sample in the same frame (see stagger_sensors)
+        self._sample_periods = {}
+        self._sample_offsets = {}
+        # held by the simulator thread while it changes the world, so sensors are not evaluated halfway a frame
+        self.world_lock = world_lock if world_lock is not None else threading.RLock()
 
         self.actuators = {}
 
@@ -51,15 +67,13 @@ class RobotState:
         self.sounds = {}
         self.config = config
 
+        # the body of the robot, in mm like all shapes of the world
         self.body = None
-        self.scale = None
 
         if DEBUG:
             self.debug_shapes = []
 
         self.wheel_distance = None
-        self.last_pos = None
-        self.last_angle = None
 
         self.name = config['name']
 
@@ -69,9 +83,6 @@ class RobotState:
         # when initializing robot next to self.parts also self.sensors and selfs.actuators are initialized
         self._init_robot(config)
 
-
-        # per sensor a lock because simulator thread writes to it, and ev3dev client reads from it
-        self.sensor_locks = {}
         self._init_sensors()
 
 
@@ -115,7 +126,6 @@ class RobotState:
 
             elif part['type'] == 'arm':
                 arm = Arm(part, self)
-                self.side_bar_sprites.append(arm.side_bar_arm)
                 self.actuators[(arm.brick, arm.address)] = arm
             else:
                 print("Unknown robot part in config")
@@ -130,21 +140,80 @@ class RobotState:
     def _init_sensors(self):
         """
         Initialize each sensor with its default value.
-        Also create an unique lock per sensor sensor.
         """
+        frames_per_second = float(get_simulation_settings()['exec_settings']['frames_per_second'])
+        self.sensor_snapshot = SensorSnapshot.create(0, {address: sensor.get_default_value()
+                                                         for address, sensor in self.sensors.items()})
         for sensor_address, sensor in self.sensors.items():
-            self._sensor_values[sensor_address] = sensor.get_default_value()
-            self.sensor_locks[sensor_address] = threading.Lock()
+            if sensor.sample_rate_hz:
+                self._sample_periods[sensor_address] = max(1, int(round(frames_per_second / sensor.sample_rate_hz)))
+            else:
+                self._sample_periods[sensor_address] = 1
+            self._sample_offsets[sensor_address] = 0
+
+    def stagger_sensors(self, offset: int) -> int:
+        """
+        Spread the samples of the sensors that do not sample every frame over the frames, so the time to simulate
+        a frame stays the same as sensors are added.
+        :param offset: of the first sensor, the next sensor takes its samples one frame later.
+        :return: the offset for the first sensor after the sensors of this robot, for example of another robot.
+        """
+        for address, period in self._sample_periods.items():
+            if period > 1:
+                self._sample_offsets[address] = offset % period
+                offset += 1
+        return offset
+
+    @property
+    def frame(self) -> int:
+        """
+        The frame of the robot sensors, which is the number of frames simulated since the robot was created.
+        """
+        return self.sensor_snapshot.frame
 
     def update_sensors(self):
         """
-        Process the data of the robot sensors by retrieving the data and putting it
-        in the robot state.
+        Start a new frame of the robot sensors by publishing its snapshot. The values of the sensors that sample in
+        this frame are out of date, they are evaluated again when they are read. Eager sensors are evaluated right
+        away.
         """
-        for address, sensor in self.sensors.items():
-            self.sensor_locks[address].acquire()
-            self._sensor_values[address] = sensor.get_latest_value()
-            self.sensor_locks[address].release()
+        self.sensor_snapshot = self.sensor_snapshot.next_frame()
+        if self.eager_sensors:
+            self._get_snapshot(self.sensors)
+
+    def _is_due(self, address, snapshot: SensorSnapshot) -> bool:
+        """
+        Check whether the sensor at the given address has not taken a sample since the last frame it should have.
+        """
+        if address not in self.sensors:
+            return False
+        last_sample_frame = snapshot.frame - (snapshot.frame - self._sample_offsets[address]) % \
+            self._sample_periods[address]
+        return snapshot.frames[address] < last_sample_frame
+
+    def _get_snapshot(self, addresses) -> SensorSnapshot:
+        """
+        Get the snapshot of the sensor values in which the sensors at the given addresses have taken their latest
+        sample. Only when one of them still has to, the world lock is held to evaluate it and a new snapshot is
+        published.
+        :param addresses: of the sensors to read.
+        """
+        snapshot = self.sensor_snapshot
+        if not any(self._is_due(address, snapshot) for address in addresses):
+            return snapshot
+
+        start = time.perf_counter()
+        with self.world_lock:
+            self.evaluating_reads += 1
+            self.lock_wait_time += time.perf_counter() - start
+            # another thread may have evaluated the sensors in the meantime
+            snapshot = self.sensor_snapshot
+            values = {address: self.sensors[address].get_latest_value()
+                      for address in addresses if self._is_due(address, snapshot)}
+            if values:
+                snapshot = snapshot.with_values(values)
+                self.sensor_snapshot = snapshot
+            return snapshot
 
     def is_falling(self):
         """
@@ -158,12 +227,6 @@ class RobotState:
         return False
 
 
-    def set_last_pos(self, pos):
-        """
-        Updates the last pos as the given position multiplied by the inverse of the scale.
-        """
-        self.last_pos = Point(pos.x * (1 / self.scale), pos.y * (1 / self.scale))
-
     def _get_orig_orientation(self):
         """
         Get the orientation of the robot as specified in the robot configuration file
@@ -185,12 +248,12 @@ class RobotState:
         """
         self.clear_values()
         orig_pos = self._get_orig_position()
-        self.body.position = pymunk.Vec2d(orig_pos.x * self.scale, orig_pos.y * self.scale)
+        self.body.position = pymunk.Vec2d(orig_pos.x, orig_pos.y)
         self.body.angle = math.radians(self._get_orig_orientation())
         self.body.velocity = (0, 0)
         self.body.angular_velocity = 0
-        for obj in self.side_bar_sprites:
-            obj.reset()
+        for arm in self._get_arms():
+            arm.reset()
 
     def reset_position(self):
         """
@@ -200,30 +263,26 @@ class RobotState:
         """
         #self.clear_values() # hangs simulator => sensor values will be update automatically anyway by program
         orig_pos = self._get_orig_position()
-        self.body.position = pymunk.Vec2d(orig_pos.x * self.scale, orig_pos.y * self.scale)
+        self.body.position = pymunk.Vec2d(orig_pos.x, orig_pos.y)
         self.body.angle = math.radians(self._get_orig_orientation())
         #self.body.velocity = (0, 0)
         self.body.angular_velocity = 0
-        for obj in self.side_bar_sprites:
-            obj.reset()
+        for arm in self._get_arms():
+            arm.reset()
 
-    def setup_pymunk_shapes(self, scale):
+    def setup_pymunk_shapes(self):
         """
-        Creates the body of the robot and adds the shapes of all robot parts.
+        Creates the body of the robot and adds the shapes of all robot parts, in mm.
         """
-        self.scale = scale
-        moment = pymunk.moment_for_box(20, (200 * scale, 300 * scale))
+        moment = pymunk.moment_for_box(20, (200, 300))
 
         self.body = pymunk.Body(20, moment)
-        if self.last_pos:
-            self.body.position = pymunk.Vec2d(self.last_pos.x * scale, self.last_pos.y * scale)
-        else:
-            orig_pos = self._get_orig_position()
-            self.body.position = pymunk.Vec2d(orig_pos.x * scale, orig_pos.y * scale)
+        orig_pos = self._get_orig_position()
+        self.body.position = pymunk.Vec2d(orig_pos.x, orig_pos.y)
 
         shapes = []
         for part in self.parts:
-            part.setup_pymunk_shape(scale, self.body)
+            part.setup_pymunk_shape(self.body)
             shapes.append(part.shape)
 
         wheels = self.get_wheels()
@@ -234,22 +293,32 @@ class RobotState:
         else:
             raise RuntimeError('Currently cannot have anything other than 2 wheels')
 
-        if self.last_angle:
-            self._rotate(math.radians(self.last_angle))
-        elif self._get_orig_orientation() != 0:
+        if self._get_orig_orientation() != 0:
             self._rotate(math.radians(self._get_orig_orientation()))
 
 
         return shapes
 
-    def setup_visuals(self, scale):
+    def setup_visuals(self):
         """
-        Creates the sprite list based on all the parts of the robot.
+        Creates the sprite list based on all the parts of the robot, sized in mm.
         """
+        # pylint: disable=import-outside-toplevel
+        import arcade as _arcade
+
+        self.sprite_list = _arcade.SpriteList()
         for part in self.parts:
-            part.setup_visuals(scale)
+            part.setup_visuals()
             self.sprite_list.append(part.sprite)
 
+        self.side_bar_sprites = [arm.side_bar_arm for arm in self._get_arms()]
+
+    def _get_arms(self) -> [Arm]:
+        """
+        Gets the arms of the robot, in the order they are shown in the sidebar.
+        """
+        return [part for part in self.actuators.values() if isinstance(part, Arm)]
+
     def _move_position(self, distance: Vec2d):
         """
         Move all parts of this robot by the given distance vector.
@@ -268,12 +337,12 @@ class RobotState:
         """
         Move the robot and its parts by providing the speed of the left and right motor
         using the differential steering principle.
-        :param left_ppf: speed in pixels per second of the left motor.
-        :param right_ppf: speed in pixels per second of the right motor.
+        :param left_ppf: speed in mm per frame of the left motor.
+        :param right_ppf: speed in mm per frame of the right motor.
         """
 
-        distance_left = left_ppf * self.scale if left_ppf is not None else 0
-        distance_right = right_ppf * self.scale if right_ppf is not None else 0
+        distance_left = left_ppf if left_ppf is not None else 0
+        distance_right = right_ppf if right_ppf is not None else 0
 
         cur_angle = self.body.angle + math.radians(90)
         diff_angle, diff_x, diff_y = calc_differential_steering_angle_x_y(self.wheel_distance,
@@ -292,11 +361,38 @@ class RobotState:
         """
         self.actuators[address].rotate_arm(dfp)
 
-    def set_led_color(self, address, color):
+    def get_render_snapshot(self) -> RobotSnapshot:
         """
-        Sets the led texture of the led behind address to color
+        Gets the state of this robot as it is drawn on screen, with the values of all its sensors.
         """
-        self.actuators[address].set_color_texture(color)
+        part_poses = []
+        for part in self.parts:
+            x, y = Vec2d(*part.shape.center_of_gravity).rotated(self.body.angle) + self.body.position
+            part_poses.append((x, y, math.degrees(part.shape.body.angle)))
+        return RobotSnapshot(self.name, tuple(part_poses), MappingProxyType(dict(self.led_colors)),
+                             tuple(arm.degrees for arm in self._get_arms()), MappingProxyType(self.get_values()),
+                             MappingProxyType(dict(self.sounds)), self.is_falling())
+
+    def show_render_snapshot(self, snapshot: RobotSnapshot):
+        """
+        Move the sprites of this robot to the poses in the given snapshot and show its leds, color sensors and arms.
+        Only called by the thread drawing the window.
+        :param snapshot: of this robot.
+        """
+        if self.sprite_list is None:
+            return
+        for part, (x, y, angle) in zip(self.parts, snapshot.part_poses):
+            part.sprite.center_x = x
+            part.sprite.center_y = y
+            part.sprite.angle = angle
+        for address, color in snapshot.led_colors.items():
+            self.actuators[address].set_color_texture(color)
+        for address, value in snapshot.values.items():
+            sensor = self.sensors[address]
+            if isinstance(sensor, ColorSensor):
+                sensor.set_color_texture(value)
+        for arm, degrees in zip(self._get_arms(), snapshot.arm_degrees):
+            arm.show_rotation(degrees)
 
     def set_color_obstacles(self, obstacles: [color_obstacle]):
         """
@@ -307,6 +403,42 @@ class RobotState:
             if part.get_ev3type() == 'color_sensor':
                 part.set_sensible_obstacles(obstacles)
 
+    def set_color_map(self, color_map):
+        """
+        Set the raster of the color obstacles, used by the color sensors of this robot.
+        :param color_map: of the color obstacles.
+        """
+        for part in self.sensors.values():
+            if part.get_ev3type() == 'color_sensor':
+                part.set_color_map(color_map)
+
+    def set_floor_index(self, floor_index):
+        """
+        Set the index of the obstacles on the floor, used by the parts of this robot sensing them.
+        :param floor_index: of the obstacles on the floor.
+        """
+        for part in self.parts:
+            part.set_floor_index(floor_index)
+
+    def set_distance_field(self, distance_field):
+        """
+        Set the raster of the distances to the shapes that do not move, used by the ultrasonic sensors of this robot.
+        :param distance_field: of the static shapes.
+        """
+        for part in self.sensors.values():
+            if isinstance(part, UltrasonicSensor):
+                part.set_distance_field(distance_field)
+
+    def set_board_size(self, width: float, height: float):
+        """
+        Set the size of the board, beyond which the ultrasonic sensors of this robot do not look.
+        :param width: of the board in pixels.
+        :param height: of the board in pixels.
+        """
+        for part in self.sensors.values():
+            if isinstance(part, UltrasonicSensor):
+                part.set_board_size(width, height)
+
     def set_falling_obstacles(self, obstacles):
         """
         Set the obstacles which can be detected by the wheel of this robot. This simulates
@@ -342,43 +474,55 @@ class RobotState:
         """
          Gets value of a sensor based on the ev3dev address of the sensor.
          """
-        self.sensor_locks[address].acquire()
-        value=self._sensor_values[address]
-        self.sensor_locks[address].release()
-        return value
+        return self._get_snapshot((address,)).values[address]
 
-    def get_values(self):
+    def get_sample(self, address) -> (int, object):
         """
-         Gets values of all sensors
+         Gets the value of a sensor based on the ev3dev address of the sensor, with the frame it was sampled in.
          """
+        snapshot = self._get_snapshot((address,))
+        return snapshot.frames[address], snapshot.values[address]
 
-        # creates shallow copy which is fine because values in dict are copy values (no references as values)
-        # note: need to loop over dict keys so we can fetch each value with a mutex lock
-        values={}
-        for address in self._sensor_values.keys():
-            values[address] = self.get_value(address)
-            self.sensor_locks[address].acquire()
-            values[address] = self._sensor_values[address]
-            self.sensor_locks[address].release()
-        return values
+    def get_events(self, address, after_frame: int):
+        """
+         Gets the events of a sensor after the given frame based on the ev3dev address of the sensor,
+         with the current frame.
+         """
+        with self.world_lock:
+            events = self.sensors[address].get_events(after_frame)
+            return {'frame': self.frame, 'events': events} if events is not None else None
+
+    def get_mode_values(self, address, mode: str):
+        """
+         Gets the values of a sensor in the given mode based on the ev3dev address of the sensor.
+         The sensor replaces its values of all modes at once when it is evaluated.
+         """
+        self._get_snapshot((address,))
+        return self.sensors[address].get_mode_values(mode)
+
+    def get_values(self, brick_id: int = None):
+        """
+         Gets values of all sensors, or of the sensors of a single brick, all from the same snapshot.
+         """
+        addresses = [address for address in self.sensor_snapshot.values
+                     if brick_id is None or address[0] == brick_id]
+        snapshot = self._get_snapshot(addresses)
+        return {address: snapshot.values[address] for address in addresses}
 
     def set_value(self, address, value):
         """
          Sets value of a sensor based on the ev3dev address of the sensor.
          """
-        self.sensor_locks[address].acquire()
-        self._sensor_values[address] = value
-        self.sensor_locks[address].release()
+        with self.world_lock:
+            self.sensor_snapshot = self.sensor_snapshot.with_values({address: value})
 
     def clear_values(self):
         """
-         Sets value of a sensor based on the ev3dev address of the sensor.
+         Sets the value of every sensor back to its default value.
          """
-        for address in self._sensor_values.keys():
-            self.sensor_locks[address].acquire()
-        self._sensor_values.clear()
-        for address in self._sensor_values.keys():
-            self.sensor_locks[address].release()
+        with self.world_lock:
+            self.sensor_snapshot = self.sensor_snapshot.with_values(
+                {address: sensor.get_default_value() for address, sensor in self.sensors.items()})
 
     def get_wheels(self):
         """
@@ -390,7 +534,7 @@ class RobotState:
                 wheels.append(part)
         return wheels
 
-    def get_sprites(self) -> _arcade.SpriteList:
+    def get_sprites(self):
         """
         Gets the sprite list that has all robot part sprites in it.
         """
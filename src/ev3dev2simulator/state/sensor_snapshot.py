@@ -0,0 +1,45 @@
+"""
+The sensor_snapshot module contains the class SensorSnapshot, the values of the sensors of a robot in a frame.
+"""
+
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Mapping
+
+
+@dataclass(frozen=True)
+class SensorSnapshot:
+    """
+    The values of the sensors of a robot in a frame, with the frame every value was sampled in. A snapshot is never
+    changed: the robot publishes a new snapshot by replacing the previous one, so threads reading it need no lock.
+    """
+    frame: int
+    values: Mapping[Any, Any]
+    # the frame in which every value was sampled
+    frames: Mapping[Any, int]
+
+    @staticmethod
+    def create(frame: int, values: dict) -> 'SensorSnapshot':
+        """
+        Create a snapshot of the given values, all sampled in the given frame.
+        :param frame: of the snapshot.
+        :param values: of the sensors by address, which is not changed afterwards.
+        """
+        return SensorSnapshot(frame, MappingProxyType(values), MappingProxyType(dict.fromkeys(values, frame)))
+
+    def next_frame(self) -> 'SensorSnapshot':
+        """
+        Get the snapshot of the next frame, in which no sensor has taken a new sample yet.
+        """
+        return SensorSnapshot(self.frame + 1, self.values, self.frames)
+
+    def with_values(self, values: dict) -> 'SensorSnapshot':
+        """
+        Get a copy of this snapshot in which the given sensors took a sample in the frame of this snapshot.
+        :param values: of the sensors by address.
+        """
+        new_values = dict(self.values)
+        new_values.update(values)
+        frames = dict(self.frames)
+        frames.update(dict.fromkeys(values, self.frame))
+        return SensorSnapshot(self.frame, MappingProxyType(new_values), MappingProxyType(frames))
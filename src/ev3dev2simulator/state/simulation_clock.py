@@ -0,0 +1,72 @@
+"""
+The simulation_clock module contains the class SimulationClock, the clock of the simulated world.
+"""
+
+import threading
+from typing import Callable, Optional
+
+
+class SimulationClock:
+    """
+    The SimulationClock keeps track of the simulated time, which is the number of simulated frames times the
+    duration of a frame. When the clock is virtual, the ev3dev2 API of the robot programs uses this clock instead of
+    the wall clock. This allows the world to be simulated faster than real time while programs behave the same.
+    """
+
+    def __init__(self, frames_per_second: int, virtual: bool = False):
+        self.frame_time = 1 / frames_per_second
+        self.virtual = virtual
+        self.frame = 0
+
+        # threads of connected bricks wait on this condition for the next frame to be simulated
+        self.frame_condition = threading.Condition()
+        # called after every tick, by the thread simulating the world
+        self.tick_listeners = []
+
+    def add_tick_listener(self, listener: Callable[[], None]):
+        """
+        Call the given function every time a frame has been simulated, before anyone waiting for the frame
+        continues in lock-step mode.
+        :param listener: function without arguments.
+        """
+        self.tick_listeners.append(listener)
+
+    def tick(self):
+        """
+        Advance the clock with a single frame and wake up everyone waiting for it.
+        """
+        with self.frame_condition:
+            self.frame += 1
+            self.frame_condition.notify_all()
+        for listener in self.tick_listeners:
+            listener()
+
+    def get_time(self) -> float:
+        """
+        Get the simulated time.
+        :return: the time in seconds since the start of the simulation.
+        """
+        return self.frame * self.frame_time
+
+    def get_virtual_time(self) -> Optional[float]:
+        """
+        Get the simulated time when the clock is virtual.
+        :return: the time in seconds since the start of the simulation or None when the wall clock should be used.
+        """
+        if not self.virtual:
+            return None
+        return round(self.get_time(), 6)
+
+    def wait_until(self, until: float, timeout: float = 1) -> float:
+        """
+        Block until the given time is reached, but never longer than a single frame. Waiting at most one frame
+        at a time allows the brick waiting to handle other requests in between.
+        :param until: the simulated time in seconds to wait for.
+        :param timeout: maximum number of seconds of wall time to wait for the next frame.
+        :return: the simulated time in seconds after waiting.
+        """
+        with self.frame_condition:
+            if self.get_time() < until:
+                frame = self.frame
+                self.frame_condition.wait_for(lambda: self.frame > frame, timeout)
+            return round(self.get_time(), 6)
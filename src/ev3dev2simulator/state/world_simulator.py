@@ -1,9 +1,12 @@
 """
 The world simulator module contains the WoldSimulator class which simulates the world
 """
-import math
+import queue
+import threading
 
+from ev3dev2simulator.state.lock_step import LockStep
 from ev3dev2simulator.state.robot_simulator import RobotSimulator
+from ev3dev2simulator.state.simulation_clock import SimulationClock
 from ev3dev2simulator.state.world_state import WorldState
 from ev3dev2simulator.config.config import get_simulation_settings
 
@@ -23,58 +26,171 @@ class WorldSimulator:
 
         self.world_state.space.add_default_collision_handler()
 
-        self.space_step_size = float(get_simulation_settings()['exec_settings']['frames_per_second'])
+        exec_settings = get_simulation_settings()['exec_settings']
+        self.space_step_size = float(exec_settings['frames_per_second'])
+        # the simulated time, used by the robot programs instead of the wall clock when virtual
+        self.clock = SimulationClock(int(self.space_step_size))
+        self.physics_substeps = max(1, int(exec_settings['physics_substeps']))
+        self.max_catch_up_frames = max(1, int(exec_settings['max_catch_up_frames']))
+        # wall time passed that has not been simulated yet, see update
+        self.accumulated_time = 0.0
+        # only set in lock-step mode, see enable_lock_step
+        self.lock_step = None
+        # whether bricks may read their state from shared memory, see enable_shared_state
+        self.shared_state = False
+        # the state of the world drawn on screen, only published when enabled, see enable_render_snapshots
+        self.render_snapshots = False
+        self.render_snapshot = None
+        # changes requested by the bricks, executed by the thread simulating the world at the start of the next
+        # frame, so the world has a single writer
+        self.command_queue = queue.SimpleQueue()
+        # set once a requested reset has been applied, see wait_for_reset
+        self.is_reset = threading.Event()
+        self.is_reset.set()
+
+    def enable_lock_step(self):
+        """
+        Only simulate a frame once all connected bricks acknowledged the previous frame. Lock-step requires
+        the virtual clock, as the bricks acknowledge frames by waiting on it.
+        """
+        requests_per_frame = int(get_simulation_settings()['exec_settings']['lock_step_requests_per_frame'])
+        self.lock_step = LockStep(requests_per_frame)
+        self.clock.virtual = True
+
+    def enable_shared_state(self):
+        """
+        Publish the state of every brick that asks for it in a table in shared memory, from which programs
+        on the same machine read their sensors without sending any request.
+        """
+        self.shared_state = True
+
+    def enable_render_snapshots(self):
+        """
+        Publish a render snapshot after every update that simulated a frame, which the window draws. The window
+        then never draws the world while it is being simulated.
+        """
+        self.render_snapshots = True
+        self.publish_render_snapshot()
+
+    def publish_render_snapshot(self):
+        """
+        Take a render snapshot of the world as it is now and publish it, replacing the previous one.
+        """
+        with self.world_state.lock:
+            self.render_snapshot = self.world_state.get_render_snapshot(self.clock.frame)
 
     def request_reset(self):
         """
         Used to request a reset, which will be handled in the update function
         """
+        self.is_reset.clear()
         self.should_reset = True
         for robot_sim in self.robot_simulators:
             robot_sim.should_reset = True
 
+    def wait_for_reset(self, timeout: float = None) -> bool:
+        """
+        Block until a requested reset has been applied by the update function.
+        :param timeout: maximum number of seconds to wait, None to wait as long as it takes.
+        :return: True if the world has been reset, False if it has not been reset in time.
+        """
+        return self.is_reset.wait(timeout)
+
     def request_reset_position(self):
         """
         Used to request a reset of world, which will be handled in the update function
         Only reset position of robots. (not velocity)
         """
         self.should_reset = True
-        for robot_sim in self.robot_simulators:
-            robot_sim.robot.reset_position()
+        with self.world_state.lock:
+            for robot_sim in self.robot_simulators:
+                robot_sim.robot.reset_position()
 
     def request_reset_position_robot_only(self):
         """
         Only reset position of robots. (not velocity)
         """
         #self.should_reset = True
-        for robot_sim in self.robot_simulators:
-            robot_sim.robot.reset_position()
+        with self.world_state.lock:
+            for robot_sim in self.robot_simulators:
+                robot_sim.robot.reset_position()
 
-    def update(self):
+    def update(self, delta_time: float = None) -> int:
         """
           update physical properties of all objects such as speed,position and angle
           (does not draw, which is done in on_draw)
+        Given the wall time since the previous update, as many frames of fixed length are simulated as fit in the
+        time passed, so the simulation keeps up with the wall clock however often it is updated. After a long pause
+        at most max_catch_up_frames frames are simulated and the rest of the time is dropped. In lock-step mode the
+        bricks decide when the next frame starts, so a single frame is simulated at most.
+        :param delta_time: seconds of wall time since the previous update, None to simulate a single frame.
+        :return: the number of frames simulated.
         """
         if self.should_reset:
-            # Resets the model of the world.
-            self.world_state.reset()
+            with self.world_state.lock:
+                self.process_commands()
+                # Resets the model of the world.
+                self.world_state.reset()
+                # the robots are reset right away as well, in lock-step mode no frame is simulated until a brick
+                # connects
+                for robot_sim in self.robot_simulators:
+                    if robot_sim.should_reset:
+                        robot_sim.reset()
             self.should_reset = False
+            self.accumulated_time = 0.0
+            self.is_reset.set()
+            if self.render_snapshots:
+                self.publish_render_snapshot()
+            return 0
+
+        if delta_time is None or self.lock_step is not None:
+            frames = 1 if self._simulate_frame() else 0
         else:
-            # update pymunk physics in small step
-            self.world_state.space.step(1.0 / self.space_step_size)
-            # sync new pymunk object coordinates with arcade sprites (for all world objects except robots)
-            self.sync_physics_sprites()
+            self.accumulated_time += delta_time
+            # a tiny margin so a delta of exactly a frame time is not lost to rounding
+            frames = int((self.accumulated_time + 1e-9) / self.clock.frame_time)
+            self.accumulated_time = max(0.0, self.accumulated_time - frames * self.clock.frame_time)
+            if frames > self.max_catch_up_frames:
+                frames = self.max_catch_up_frames
+            for _ in range(frames):
+                self._simulate_frame()
+
+        if frames and self.render_snapshots:
+            self.publish_render_snapshot()
+        return frames
+
+    def _simulate_frame(self) -> bool:
+        """
+        Simulate a single frame: step the physics and update the robots, then advance the clock.
+        :return: False if the frame could not be started as not all bricks acknowledged the previous frame yet.
+        """
+        if self.lock_step is not None and not self.lock_step.start_frame(self.clock.frame_time):
+            # not all bricks acknowledged the previous frame yet, try again next update
+            return False
+        # the sensors are evaluated when they are read, which waits until the frame has been simulated
+        with self.world_state.lock:
+            # in lock-step mode all commands of the previous frame have been queued by now
+            self.process_commands()
+            # update pymunk physics in small steps, several per frame so fast bodies do not pass through thin ones
+            for _ in range(self.physics_substeps):
+                self.world_state.space.step(1.0 / (self.space_step_size * self.physics_substeps))
             for robot in self.robot_simulators:
                 #  processes the actuators(from incoming ev3dev requests) and sensors of the robot,
-                #  update its physical properties such as position, speed and angle (used in pymunk physical calculation)
-                #  and after pymunk calculations syncs its physical objects locations with arcade's  sprites drawn on screen
+                #  update its physical properties such as position, speed and angle (used in pymunk physical
+                #  calculation), the sprites follow them from the render snapshot
                 robot.update()
+        self.clock.tick()
+        if self.lock_step is not None:
+            self.lock_step.end_frame()
+        return True
 
-    def sync_physics_sprites(self):
-        """ Move sprites to where physics objects are """
-        for obstacle in self.world_state.obstacles:
-            obstacle.sprite.center_x = obstacle.body.position.x
-            obstacle.sprite.center_y = obstacle.body.position.y
-            obstacle.sprite.angle = math.degrees(obstacle.body.angle)
-            obstacle.set_new_pos(obstacle.body.position)
-            obstacle.new_angle = obstacle.sprite.angle
+    def process_commands(self):
+        """
+        Execute the commands of the bricks queued since the previous frame, in the order they were queued.
+        """
+        while True:
+            try:
+                command = self.command_queue.get_nowait()
+            except queue.Empty:
+                return
+            command()
@@ -2,37 +2,58 @@
 The world state module contains the state of the world, which includes the robot states.
 """
 
+import math
+import threading
 from math import radians
 
-import arcade as _arcade
 import pymunk
 from pymunk import Space
 
+from ev3dev2simulator.config.config import get_simulation_settings
 from ev3dev2simulator.obstacle.board import Board
+from ev3dev2simulator.state.color_map import ColorMap
+from ev3dev2simulator.state.distance_field import DistanceField
+from ev3dev2simulator.state.floor_index import BODY_MASK, FLOOR_CATEGORY, FloorIndex
+from ev3dev2simulator.state.render_snapshot import RenderSnapshot
 from ev3dev2simulator.state.robot_state import RobotState
 
 from ev3dev2simulator.obstacle.border import Border
 from ev3dev2simulator.obstacle.bottle import Bottle
 from ev3dev2simulator.obstacle.edge import Edge
 from ev3dev2simulator.obstacle.lake import Lake
+from ev3dev2simulator.obstacle.mat import Mat
 from ev3dev2simulator.obstacle.rock import Rock
+from ev3dev2simulator.robotpart.touch_sensor import TouchSensor, TOUCH_SENSOR_COLLISION_TYPE
 
 
 class WorldState:
     """
-    Contains the objects, the robots and the surrounding space of the 'world'
+    Contains the objects, the robots and the surrounding space of the 'world'.
+    The world is defined in mm, both its physics and its sprites; the window projects mm to pixels when drawing.
     """
     def __init__(self, config):
-        self.sprite_list = _arcade.SpriteList()
+        # sprites are only created when the world is visualised (see setup_visuals)
+        self.sprite_list = None
         # self.obstacles are movable obstacles
         self.obstacles = []
         self.static_obstacles = []
         self.falling_obstacles = []
         self.color_obstacles = []
+        # raster of the colors of the color obstacles, created once their collision areas are calculated
+        self.color_map = None
+        # raster of the distances to the obstacles that do not move by themselves, created with their shapes
+        self.distance_field = None
+        # the obstacles on the floor as static shapes of the space, created once their collision areas are calculated
+        self.floor_index = None
 
         self.robots = []
+        # held while the world is changed, so the robots do not evaluate their sensors halfway a change
+        self.lock = threading.RLock()
         self.space = Space()
         self.space.damping = 0.1
+        # the touch sensors by their shape, of which the contacts are kept by a collision handler
+        self.touch_sensors = {}
+        self.touch_handlers = []
 
         self.board_width = config['board_width']
         self.board_height = config['board_height']
@@ -41,13 +62,17 @@ class WorldState:
         board = Board(self.board_width / 2, self.board_height / 2, self.board_width, self.board_height, board_color)
         self.static_obstacles.append(board)
 
+        sample_offset = 0
         for robot_conf in config['robots']:
-            self.robots.append(RobotState(robot_conf))
+            robot = RobotState(robot_conf, self.lock)
+            sample_offset = robot.stagger_sensors(sample_offset)
+            self.robots.append(robot)
 
         edge = Edge(self.board_width, self.board_height)
         self.static_obstacles.append(edge)
         self.falling_obstacles.append(edge)
 
+        mats = []
         for obstacle in config['obstacles']:
             if obstacle['type'] == 'lake':
                 lake = Lake.from_config(obstacle)
@@ -65,9 +90,14 @@ class WorldState:
             elif obstacle['type'] == 'bottle':
                 bottle = Bottle.from_config(obstacle)
                 self.obstacles.append(bottle)
+            elif obstacle['type'] == 'mat':
+                mats.append(Mat.from_config(self.board_width, self.board_height, obstacle))
             else:
                 print("unknown obstacle type")
 
+        # mats lie on the board, below the other obstacles
+        self.static_obstacles[1:1] = mats
+        self.color_obstacles.extend(mats)
         self.falling_obstacles.append(board)
         self.color_obstacles.append(board)
 
@@ -80,71 +110,128 @@ class WorldState:
         for obstacle in self.obstacles:
             # reset position and speed of obstacle
             obstacle.reset()
+        if self.distance_field is not None:
+            self.distance_field.invalidate()
 
-    def setup_pymunk_shapes(self, scale):
+    def setup_pymunk_shapes(self):
         """
-        Setup the shapes that are added to the pymunk space.
+        Setup the shapes that are added to the pymunk space, in mm.
         The robot get a shape filter so it does not interact with itself.
+        Also calculates the collision areas of the static obstacles, which are sensed by the robots, and the raster
+        of their colors.
         """
+        for obstacle in self.static_obstacles:
+            obstacle.calc_points()
+        holes = [obstacle for obstacle in self.falling_obstacles if obstacle not in self.static_obstacles]
+        self.floor_index = FloorIndex(self.space, self.static_obstacles + holes)
+        cell_size = float(get_simulation_settings()['exec_settings']['color_map_cell_size'])
+        self.color_map = ColorMap(self.color_obstacles, self.board_width, self.board_height, cell_size)
+
+        # handlers for the pairs of collision types, as wildcard handlers are only called by the default handler,
+        # which may be replaced; all shapes that are not touch sensors have the default collision type 0
+        self.touch_handlers = [self.space.add_collision_handler(TOUCH_SENSOR_COLLISION_TYPE, other)
+                               for other in (0, TOUCH_SENSOR_COLLISION_TYPE)]
+        for touch_handler in self.touch_handlers:
+            touch_handler.begin = self._begin_touch
+            touch_handler.separate = self._separate_touch
+
         for idx, robot in enumerate(self.robots):
             # setup robot's single body and its attached shapes (one for each part)
-            robot_shapes = robot.setup_pymunk_shapes(scale)
+            robot_shapes = robot.setup_pymunk_shapes()
             # add robot body to space
             self.space.add(robot.body)
             # add robot's attached shapes (one for each part) to space
             for shape in robot_shapes:
-                shape.filter = pymunk.ShapeFilter(group=idx+5)
+                shape.filter = pymunk.ShapeFilter(group=idx+5, mask=BODY_MASK)
                 self.space.add(shape)
+            for sensor in robot.get_sensors():
+                if isinstance(sensor, TouchSensor):
+                    self.touch_sensors[sensor.shape] = sensor
 
         # only for movable obstacles we add body and shape to space
         for obstacle in self.obstacles:
             #  create body and shape for obstacel
-            obstacle.create_shape(scale)
+            obstacle.create_shape()
+            obstacle.shape.filter = pymunk.ShapeFilter(mask=BODY_MASK)
             self.space.add(obstacle.body)
             self.space.add(obstacle.shape)
 
-    def rescale(self, new_scale):
-        """
-        On screen rescale, rescale all objects ( both sprite(visual) as pymunk body(physical) )
-        """
+        # a cell size of zero checks the static obstacles like the moving ones
+        cell_size = float(get_simulation_settings()['exec_settings']['distance_field_cell_size'])
+        if cell_size > 0:
+            static_shapes = [obstacle.shape for obstacle in self.obstacles
+                             if obstacle.body.body_type != pymunk.Body.DYNAMIC]
+            self.distance_field = DistanceField(static_shapes, self.board_width, self.board_height, cell_size)
 
-        # remove all shapes and bodies
-        for robot in self.robots:
-            robot.shapes = []
-        for obstacle in self.obstacles:
-            obstacle.shape = None
-        self.space.remove(*self.space.shapes)
-        self.space.remove(*self.space.bodies)
+        if get_simulation_settings()['exec_settings']['use_spatial_hash']:
+            self._use_spatial_hash()
 
         for robot in self.robots:
-            robot.sprite_list = _arcade.SpriteList()
-        self.sprite_list = _arcade.SpriteList()
+            robot.set_floor_index(self.floor_index)
+            robot.set_distance_field(self.distance_field)
+            robot.set_color_obstacles(self.color_obstacles)
+            robot.set_color_map(self.color_map)
+            robot.set_board_size(self.board_width, self.board_height)
+            robot.set_falling_obstacles(self.falling_obstacles)
+
+    def _use_spatial_hash(self):
+        """
+        Index the shapes of the space in a spatial hash instead of bounding box trees. In the generated worlds of
+        benchmarks/bench_obstacles.py this is only faster with up to a few hundred obstacles. The cells are as large
+        as the median shape of the bodies and there are about ten times as many cells as shapes, as pymunk advises.
+        """
+        sizes = sorted(max(bb.right - bb.left, bb.top - bb.bottom)
+                       for bb in (shape.cache_bb() for shape in self.space.shapes
+                                  if shape.filter.categories != FLOOR_CATEGORY))
+        dim = sizes[len(sizes) // 2] if sizes else 100
+        self.space.use_spatial_hash(max(dim, 1), max(1000, 10 * len(self.space.shapes)))
+
+    def _begin_touch(self, arbiter: pymunk.Arbiter, _space, _data) -> bool:
+        """
+        Count a new contact of the touch sensors of the shapes of the arbiter. The collision is processed as usual.
+        """
+        for shape in arbiter.shapes:
+            sensor = self.touch_sensors.get(shape)
+            if sensor is not None:
+                sensor.begin_contact()
+        return True
 
-        self.setup_pymunk_shapes(new_scale)
-        self.setup_visuals(new_scale)
+    def _separate_touch(self, arbiter: pymunk.Arbiter, _space, _data):
+        """
+        Remove a contact of the touch sensors of the shapes of the arbiter.
+        """
+        for shape in arbiter.shapes:
+            sensor = self.touch_sensors.get(shape)
+            if sensor is not None:
+                sensor.end_contact()
 
-    def setup_visuals(self, scale):
+    def setup_visuals(self):
         """
-        Setup all sprites.
+        Setup all sprites, once: they are sized in mm, so resizing the window does not change them.
         """
+        # pylint: disable=import-outside-toplevel
+        import arcade as _arcade
+
+        self.sprite_list = _arcade.SpriteList()
         for obstacle in self.static_obstacles:
-            obstacle.create_shape(scale)
+            obstacle.create_shape()
 
         for obstacle in self.obstacles:
-            obstacle.create_sprite(scale)
+            obstacle.create_sprite()
             self.sprite_list.append(obstacle.sprite)
 
         for robot in self.robots:
-            robot.setup_visuals(scale)
-            robot.set_color_obstacles(self.color_obstacles)
-            robot.set_falling_obstacles(self.falling_obstacles)
+            robot.setup_visuals()
 
     def set_object_at_position_as_selected(self, pos):
         """
-        Based on the position given, select the object that is closest (with a maximum of 15) and set as selected.
+        Based on the position given in mm, select the object that is closest (with a maximum of 15 mm) and set as
+        selected.
         """
         max_distance = 15
-        queried_object = self.space.point_query_nearest(pos, max_distance, pymunk.ShapeFilter())
+        with self.lock:
+            # the obstacles on the floor cannot be selected
+            queried_object = self.space.point_query_nearest(pos, max_distance, pymunk.ShapeFilter(mask=BODY_MASK))
         if queried_object is not None:
             poly = queried_object.shape
             if hasattr(poly, 'body'):
@@ -152,17 +239,32 @@ class WorldState:
 
     def move_selected_object(self, delta_x, delta_y):
         """
-        Move the selected object with the given offset.
+        Move the selected object with the given offset in mm.
         """
         if self.selected_object:
-            self.selected_object.position += (delta_x, delta_y)
+            with self.lock:
+                self.selected_object.position += (delta_x, delta_y)
+            self._moved_by_hand(self.selected_object)
 
     def rotate_selected_object(self, delta_angle):
         """
         Rotate the selected object with the given angle.
         """
         if self.selected_object is not None:
-            self.selected_object.angle += radians(delta_angle)
+            with self.lock:
+                self.selected_object.angle += radians(delta_angle)
+            self._moved_by_hand(self.selected_object)
+
+    def _moved_by_hand(self, body: pymunk.Body):
+        """
+        Index the shapes of the given body, which has been moved by hand, again when it does not move by itself: the
+        space only indexes static shapes again when told so, and the distance field is calculated again.
+        """
+        with self.lock:
+            if body.body_type == pymunk.Body.STATIC:
+                self.space.reindex_shapes_for_body(body)
+            if body.body_type != pymunk.Body.DYNAMIC and self.distance_field is not None:
+                self.distance_field.invalidate()
 
     def unselect_object(self):
         """
@@ -170,6 +272,30 @@ class WorldState:
         """
         self.selected_object = None
 
+    def get_render_snapshot(self, frame: int) -> RenderSnapshot:
+        """
+        Gets the state of the world as it is drawn on screen. Called with the lock held, after simulating a frame.
+        :param frame: the frame that has been simulated.
+        """
+        obstacle_poses = tuple((obstacle.body.position.x, obstacle.body.position.y, math.degrees(obstacle.body.angle))
+                               for obstacle in self.obstacles)
+        return RenderSnapshot(frame, obstacle_poses,
+                              tuple(robot.get_render_snapshot() for robot in self.robots))
+
+    def show_render_snapshot(self, snapshot: RenderSnapshot):
+        """
+        Move the sprites of the obstacles and robots to the poses in the given snapshot. Only called by the thread
+        drawing the window, so the sprites are never changed while they are drawn.
+        :param snapshot: of the world.
+        """
+        for obstacle, (x, y, angle) in zip(self.obstacles, snapshot.obstacle_poses):
+            if obstacle.sprite is not None:
+                obstacle.sprite.center_x = x
+                obstacle.sprite.center_y = y
+                obstacle.sprite.angle = angle
+        for robot, robot_snapshot in zip(self.robots, snapshot.robots):
+            robot.show_render_snapshot(robot_snapshot)
+
     def get_robots(self) -> [RobotState]:
         """
         Gets the objects that are on the playing field.
@@ -3,46 +3,68 @@ Module containing the class InstanceChecker.
 """
 
 import os
-import time
 import tempfile
 import sys
 import platform
 from pyglet import clock
 
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
 
 class InstanceChecker:
     """
-    Class used to detect whether another instance is already running.
+    Class used to detect whether another instance is already running. The running instance holds a lock on a lock
+    file for as long as it runs, which the operating system releases when the instance exits, also when it crashes.
     """
-    def __init__(self, visualiser):
+    def __init__(self, visualiser, directory: str = None):
         self.visualiser = visualiser
+        self.directory = directory if directory is not None else tempfile.gettempdir()
         self.pid_file = None
         self.pid = None
+        self.lock_file = None
 
     def check_for_unique_instance(self):
         """ Detect whether an other instance is already running. If so then trigger the
             activation for the other instance and terminate this instance.
         """
+        self.pid_file = os.path.join(self.directory, "ev3dev2simulator.pid")
+        self.pid = str(os.getpid())
 
-        tmpdir = tempfile.gettempdir()
-        self.pid_file = os.path.join(tmpdir, "ev3dev2simulator.pid")
+        # the lock file is kept open, and so locked, until this instance exits
+        self.lock_file = open(os.path.join(self.directory, "ev3dev2simulator.lock"), 'a')
+        is_unique = self._try_lock()
 
-        self.pid = str(os.getpid())
+        # the running instance activates its window when another pid is written
+        self._write_pid()
+        if not is_unique:
+            # other process already running
+            sys.exit()
+
+    def _try_lock(self) -> bool:
+        """
+        Try to lock the lock file without waiting.
+        :return: True if this instance holds the lock, False if another instance does.
+        """
+        try:
+            if fcntl is not None:
+                fcntl.flock(self.lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(self.lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+
+    def _write_pid(self):
         pid_file = open(self.pid_file, 'w')
         pid_file.write(self.pid)
         pid_file.flush()
         pid_file.close()
 
-        time.sleep(2)
-
-        file = open(self.pid_file, 'r')
-        line = file.readline()
-        file.close()
-        read_pid = line.rstrip()
-        if read_pid != self.pid:
-            # other process already running
-            sys.exit()
-
     def check_for_activation(self):
         """ checks each interval whether the simulator windows must be activated (bring to front)
 
@@ -60,9 +82,7 @@ class InstanceChecker:
 
                 # other simulator tries to start running
                 # write pid to pid_file to notify this simulator is already running
-                pid_file = open(self.pid_file, 'w')
-                pid_file.write(self.pid)
-                pid_file.close()
+                self._write_pid()
 
                 if platform.system().lower().startswith('win'):
                     self.visualiser.windows_activate()
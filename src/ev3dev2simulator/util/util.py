@@ -3,10 +3,11 @@ Module containing various utility function, mostly concerning mathematical 2D ca
 """
 
 import math
-from typing import Tuple
+from typing import List, Sequence, Tuple, Union
 
-import arcade as _arcade
-from arcade import PointList
+# geometry and color types (compatible with the ones used by arcade, but usable without importing arcade)
+Color = Union[Tuple[int, int, int], Tuple[int, int, int, int], List[int]]
+PointList = Sequence[Tuple[float, float]]
 
 
 def get_circle_points(center_x: float,
@@ -40,6 +41,54 @@ def get_circle_points(center_x: float,
     return points
 
 
+def get_rectangle_points(center_x: float,
+                         center_y: float,
+                         width: float,
+                         height: float) -> PointList:
+    """
+    Determine the four corner points of an axis aligned rectangle given its center, width and height.
+    The points are returned in the same order as arcade.get_rectangle_points does.
+
+    :param center_x: the x coordinate of the rectangle center.
+    :param center_y: the y coordinate of the rectangle center.
+    :param width: the width of the rectangle.
+    :param height: the height of the rectangle.
+    :return: a PointList object containing the coordinates of the corner points.
+    """
+
+    return [(-width / 2 + center_x, -height / 2 + center_y),
+            (-width / 2 + center_x, height / 2 + center_y),
+            (width / 2 + center_x, height / 2 + center_y),
+            (width / 2 + center_x, -height / 2 + center_y)]
+
+
+def is_point_in_polygon(x: float, y: float, polygon: PointList) -> bool:
+    """
+    Use ray-tracing to check if a point is inside a polygon.
+    Gives the same outcome as arcade.is_point_in_polygon.
+
+    :param x: the x coordinate of the point.
+    :param y: the y coordinate of the point.
+    :param polygon: the points of the polygon.
+    :return: True if the point is inside the polygon.
+    """
+
+    num_points = len(polygon)
+    inside = False
+    if num_points == 0:
+        return False
+
+    p1x, p1y = polygon[0]
+    for i in range(num_points + 1):
+        p2x, p2y = polygon[i % num_points]
+        if min(p1y, p2y) < y <= max(p1y, p2y) and x <= max(p1x, p2x):
+            if p1x == p2x or x <= (y - p1y) * (p2x - p1x) / (p2y - p1y) + p1x:
+                inside = not inside
+        p1x, p1y = p2x, p2y
+
+    return inside
+
+
 def distance_between_points(x_of_point1: float, y_of_point1: float, x_of_point2: float, y_of_point2: float) -> float:
     """
     Calculate the distance between two points in 2D space.
@@ -93,18 +142,28 @@ def get_inch_multiplier() -> float:
     return 0.254
 
 
-def to_color_code(color: _arcade.Color) -> int:
+# the rgb values of the colors of the world by their ev3dev color code
+COLOR_CODES = {
+    (59, 60, 54): 1,  # Black
+    (58, 166, 221): 2,  # Blue
+    (122, 182, 72): 3,  # Green
+    (252, 227, 3): 4,  # Yellow
+    (201, 45, 57): 5,  # Red
+    (235, 235, 235): 6,  # White
+    (255, 255, 255): 6  # White
+}
+
+
+def to_color_code(color: Color) -> int:
     """
     Convert rgb tuple to ev3dev color
     """
-    switcher = {
-        (59, 60, 54): 1,  # Black
-        (58, 166, 221): 2,  # Blue
-        (122, 182, 72): 3,  # Green
-        (252, 227, 3): 4,  # Yellow
-        (201, 45, 57): 5,  # Red
-        (235, 235, 235): 6,  # White
-        (255, 255, 255): 6  # White
-    }
-
-    return switcher.get(color, 0)
+    return COLOR_CODES.get(color, 0)
+
+
+def to_nearest_color_code(color: Color) -> int:
+    """
+    Convert any rgb tuple to the ev3dev color of the nearest color of the world.
+    """
+    nearest = min(COLOR_CODES, key=lambda rgb: sum((a - b) ** 2 for a, b in zip(rgb, color)))
+    return COLOR_CODES[nearest]
@@ -9,18 +9,17 @@ class RobotPartSprite(_arcade.Sprite):
     """
     Class used to display all robot parts. Keeps the required textures and its scale.
     Only uses width, since height is scaled automatically based on the height found in the textures.
+    The sprite is sized in mm, the window projects mm to pixels when drawing it.
     """
 
     def __init__(self,
                  src_list,
                  start_sprite=0,
-                 width_mm=0,
-                 scale=1,):
+                 width_mm=0):
         super().__init__()
         for texture in src_list:
             texture = _arcade.load_texture(texture)
             self.append_texture(texture)
         self.set_texture(start_sprite)
 
-        px_mm_scale = scale
-        self.scale = px_mm_scale * (width_mm / self.texture.width)  # required for draw
+        self.scale = width_mm / self.texture.width  # required for draw
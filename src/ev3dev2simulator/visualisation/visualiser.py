@@ -11,6 +11,7 @@ import pyglet
 
 from arcade.color import RED
 
+from ev3dev2simulator.state.physics_thread import PhysicsThread
 from ev3dev2simulator.state.world_simulator import WorldSimulator
 from ev3dev2simulator.state.world_state import WorldState
 from ev3dev2simulator.util.dimensions import Dimensions
@@ -49,6 +50,8 @@ class Visualiser(_arcade.Window):
         self.sidebar_width = get_simulation_settings()['screen_settings']['side_bar_width']
 
         self.sidebar = None
+        # simulates the world next to the window, unless the window simulates it between draws in on_update
+        self.physics_thread = None
 
 
         # Dimensions of drawing area of board and sidebar together
@@ -59,7 +62,8 @@ class Visualiser(_arcade.Window):
         # The dimensions can differ from window width and height.
         self.dimensions = None # initially not set
 
-        # determining the scale to draw board so it can be fitted in window width and height
+        # determining the scale to draw board so it can be fitted in window width and height, in pixels per mm.
+        # The world itself is defined in mm, the scale only projects it on the window when drawing
         # It calculates self.dimensions of the board+sidebar together which is scaled with scale
         self.scale = self.determine_scale(initial_width, initial_height,True)
 
@@ -91,9 +95,15 @@ class Visualiser(_arcade.Window):
     def setup(self):
 
         """Set up the simulation here."""
+        self.world_state.setup_pymunk_shapes()
+        self.world_state.setup_visuals()
+        # the sidebar shows sprites of the robots (the arm), so it is set up after the visuals of the world
         self.sidebar = self._setup_sidebar()
-        self.world_state.setup_pymunk_shapes(self.scale)
-        self.world_state.setup_visuals(self.scale)
+
+        self.world_simulator.enable_render_snapshots()
+        if get_simulation_settings()['exec_settings']['physics_thread']:
+            self.physics_thread = PhysicsThread(self.world_simulator)
+            self.physics_thread.start()
 
     @staticmethod
     def run():
@@ -136,8 +146,8 @@ class Visualiser(_arcade.Window):
         return scale
 
     def _change_scale(self, new_screen_width, new_screen_height):
+        # only the projection of the world changes, see on_draw
         self.scale = self.determine_scale(new_screen_width, new_screen_height)
-        self.world_state.rescale(self.scale)
 
     def _setup_sidebar(self):
         """ Create Sidebar with its widgets attached (for ARM)"""
@@ -154,13 +164,10 @@ class Visualiser(_arcade.Window):
         # Call the parent. Failing to do this will mess up the coordinates, and default to 0,0 at the center and the
         # edges being -1 to 1.
 
-        # deletes all and setup again with new scale
+        # the world is drawn at the new scale, only the sidebar is set up again
         self._change_scale(width, height)
         self.sidebar = self._setup_sidebar()
 
-        # sync physics and sprites (normally done in on_update, but also needed here otherwise during resize robot will blink)
-        self.world_simulator.update()
-
         super().on_resize(width, height)
 
     def on_draw(self):
@@ -169,17 +176,27 @@ class Visualiser(_arcade.Window):
         """
         # Clear the screen to the background color
         self.clear()
+
+        # the state of the world after the last frame, which is not changed while it is drawn
+        snapshot = self.world_simulator.render_snapshot
+        if snapshot is None:
+            self.world_simulator.publish_render_snapshot()
+            snapshot = self.world_simulator.render_snapshot
+        self.world_state.show_render_snapshot(snapshot)
         #_arcade.start_render()  # think old style
 
+        # the world is defined in mm, project it on the board at the current scale
+        self.set_viewport(0, self.width / self.scale, 0, self.height / self.scale)
+
         for obstacle_list in self.world_state.static_obstacles:
             for shape in obstacle_list.get_shapes():
-                if shape.line_width == 1:
+                if isinstance(shape, _arcade.SpriteList) or shape.line_width == 1:
                     shape.draw()
                 else:
                     print(shape)
         self.world_state.sprite_list.draw()
 
-        for robot in self.world_state.get_robots():
+        for robot, robot_snapshot in zip(self.world_state.get_robots(), snapshot.robots):
             robot.get_sprites().draw()
 
             if DEBUG:
@@ -191,11 +208,13 @@ class Visualiser(_arcade.Window):
                     robot.debug_shapes.clear()
 
             # display message robot is falling for 3 seconds (using msg_counter containing # frames for 3 seconds)
-            if robot.is_falling() and self.msg_counter <= 0:
+            if robot_snapshot.is_falling and self.msg_counter <= 0:
                 self.msg_counter = get_simulation_settings()['exec_settings']['frames_per_second'] * 3
 
-        for robot in self.world_state.get_robots():
-            self.sidebar.add_robot_info(robot.name, robot.get_values(), robot.sounds)
+        # the sidebar and messages are drawn in pixels
+        self.set_viewport(0, self.width, 0, self.height)
+        for robot_snapshot in snapshot.robots:
+            self.sidebar.add_robot_info(robot_snapshot.name, robot_snapshot.values, robot_snapshot.sounds)
 
         self.sidebar.draw()
 
@@ -209,11 +228,14 @@ class Visualiser(_arcade.Window):
         """
           update physical properties of all objects such as speed,position and angle
           (does not draw, which is done in on_draw)
+        The world is simulated with a fixed frame time, as many frames as fit in the time since the last update.
+        With a physics thread the world is simulated in that thread instead.
         """
-        self.world_simulator.update()
+        if self.physics_thread is None:
+            self.world_simulator.update(delta_time)
 
     def on_mouse_press(self, x: float, y: float, button: int, modifiers: int):
-        self.world_state.set_object_at_position_as_selected((x, y))
+        self.world_state.set_object_at_position_as_selected((x / self.scale, y / self.scale))
 
     def on_mouse_release(self, x: float, y: float, button: int,
                          modifiers: int):
@@ -221,7 +243,7 @@ class Visualiser(_arcade.Window):
 
     def on_mouse_drag(self, x: float, y: float, dx: float, dy: float, buttons: int, modifiers: int):
         if buttons == _arcade.MOUSE_BUTTON_LEFT:
-            self.world_state.move_selected_object(dx, dy)
+            self.world_state.move_selected_object(dx / self.scale, dy / self.scale)
         if buttons == _arcade.MOUSE_BUTTON_RIGHT:
             self.world_state.rotate_selected_object(dy)
 
@@ -271,7 +293,8 @@ class Visualiser(_arcade.Window):
 
         # Reset all obstacles in the world (except robots)
         elif symbol == _arcade.key.W:
-            self.world_state.reset()
+            with self.world_state.lock:
+                self.world_state.reset()
 
 
     def set_screen_to_display_simulator_at_startup(self, use_second_screen_to_show_simulator):
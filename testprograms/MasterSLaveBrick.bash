@@ -1,4 +1,4 @@
 #!/bin/bash
-python3 testprograms/MasterBrick.py & 
-sleep 1
-python3 testprograms/SlaveBrick.py
+# both bricks say which brick they are, so they can connect at the same time
+EV3DEV2SIMULATOR_BRICK=brick-left python3 testprograms/MasterBrick.py &
+EV3DEV2SIMULATOR_BRICK=brick-right python3 testprograms/SlaveBrick.py
@@ -2,8 +2,10 @@ import os
 import unittest
 
 from ruamel.yaml.scanner import ScannerError
+from strictyaml import load
 
 import ev3dev2simulator.config.config as config
+from ev3dev2simulator.config.config_checker import ConfigChecker
 
 from unittest.mock import patch, MagicMock
 
@@ -69,6 +71,27 @@ class TestConfig(unittest.TestCase):
             ConfigMock.return_value = str(os.path.dirname(__file__))
             self.assertRaises(ScannerError, conf._load_yaml_file, 'world_configurations', 'config_small_error')
 
+    def test_settings_added_later_are_optional(self):
+        with open(os.path.join(os.path.dirname(config.__file__), 'simulation_settings.yaml')) as settings_file:
+            lines = settings_file.read().split('\n')
+        new_keys = ('physics_substeps', 'max_catch_up_frames', 'physics_thread', 'lock_step_requests_per_frame',
+                    'resume_timeout', 'color_map_cell_size', 'distance_field_cell_size', 'use_spatial_hash',
+                    'eager_sensors', 'color_sensor_settings', 'footprint', 'ultrasonic_sensor_settings',
+                    'cone_angle', 'rays')
+        old_lines = [line for line in lines if line.strip().split(':')[0] not in new_keys]
+
+        settings = load('\n'.join(old_lines), ConfigChecker.get_settings_schema()).data
+        self.assertEqual(settings['exec_settings']['frames_per_second'], 30)
+        self.assertEqual(settings['exec_settings']['physics_substeps'], 1)
+        self.assertEqual(settings['exec_settings']['physics_thread'], True)
+        self.assertEqual(settings['exec_settings']['distance_field_cell_size'], 5.0)
+        self.assertEqual(settings['color_sensor_settings'], {'footprint': 8.0})
+        self.assertEqual(settings['ultrasonic_sensor_settings'], {'cone_angle': 0.0, 'rays': 1})
+
+        # the defaults are those of the shipped settings
+        shipped = load('\n'.join(lines), ConfigChecker.get_settings_schema()).data
+        self.assertEqual(settings, shipped)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,10 +1,16 @@
+import os
 import socket
 import threading
+import time
 import unittest
 
 
 from ev3dev2simulator.config.config import get_simulation_settings, load_config
+from ev3dev2simulator.connection.client_socket import ClientSocket, PORT_ENVIRONMENT_VARIABLE
+from ev3dev2simulator.connection.message.data_request import DataRequest
 from ev3dev2simulator.connection.message.rotate_command import RotateCommand
+from ev3dev2simulator.connection.message.time_request import TimeRequest
+from ev3dev2simulator.connection.wire_protocol import BinaryProtocol, JsonProtocol
 
 
 class TestClientSocket(unittest.TestCase):
@@ -59,7 +65,84 @@ class TestClientSocket(unittest.TestCase):
         sock.client.close()
         server_thread.join()
 
+        # the connection is closed, so do not let other tests use this instance
+        import ev3dev2simulator.connection.client_socket as client_socket
+        client_socket.CLIENT_SOCKET = None
 
 
+    def test_multiplexed_responses(self):
+        server_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server_sock.bind(('localhost', 0))
+        server_sock.listen(1)
+        os.environ[PORT_ENVIRONMENT_VARIABLE] = str(server_sock.getsockname()[1])
+
+        def run_fake_server():
+            # negotiate the binary protocol and answer two requests in reverse order
+            (client, _) = server_sock.accept()
+            json_protocol = JsonProtocol()
+            json_protocol.receive_message(client)
+            client.sendall(json_protocol.encode_response('binary'))
+
+            protocol = BinaryProtocol()
+            requests = [protocol.receive_message(client) for _ in range(2)]
+            for request_id, obj_dict in reversed(requests):
+                client.sendall(protocol.frame(protocol.encode_response(obj_dict['type']), request_id))
+            client.close()
+            server_sock.close()
+
+        server_thread = threading.Thread(target=run_fake_server)
+        server_thread.start()
+        try:
+            sock = ClientSocket()
+        finally:
+            del os.environ[PORT_ENVIRONMENT_VARIABLE]
+        self.assertEqual(sock.protocol.name, 'binary')
+
+        responses = {}
+
+        def request(command):
+            responses[type(command).__name__] = sock.send_command(command, True)
+
+        threads = [threading.Thread(target=request, args=(command,))
+                   for command in (TimeRequest(), DataRequest('ev3-ports:in1'))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        server_thread.join()
+        sock.close()
+
+        # every thread gets the response to its own request
+        self.assertEqual(responses, {'TimeRequest': 'TimeRequest', 'DataRequest': 'DataRequest'})
+        self.assertFalse(sock.pending)
+
+
+    def test_json_response_held_by_simulator(self):
+        server_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server_sock.bind(('localhost', 0))
+        server_sock.listen(1)
+        os.environ[PORT_ENVIRONMENT_VARIABLE] = str(server_sock.getsockname()[1])
+
+        def run_fake_server():
+            # answer a request only after a while, as in lock-step mode when other bricks hold up the next frame
+            (client, _) = server_sock.accept()
+            json_protocol = JsonProtocol()
+            json_protocol.receive_message(client)
+            time.sleep(0.5)
+            client.sendall(json_protocol.encode_response(1.5))
+            client.close()
+            server_sock.close()
+
+        server_thread = threading.Thread(target=run_fake_server)
+        server_thread.start()
+        try:
+            sock = ClientSocket(['json'])
+        finally:
+            del os.environ[PORT_ENVIRONMENT_VARIABLE]
+
+        self.assertEqual(sock.send_command(TimeRequest(), True), 1.5)
+        server_thread.join()
+        sock.close()
+
 if __name__ == '__main__':
     unittest.main()
@@ -6,7 +6,13 @@ from ev3dev2simulator.state.message_processor import MessageProcessor
 from ev3dev2simulator.connection.message.data_request import DataRequest
 from ev3dev2simulator.connection.message.led_command import LedCommand
 from ev3dev2simulator.connection.message.rotate_command import RotateCommand
+from ev3dev2simulator.connection.message.shared_state_request import SharedStateRequest
+from ev3dev2simulator.connection.message.snapshot_request import SnapshotRequest
+from ev3dev2simulator.connection.message.subscribe_request import SubscribeRequest
 from ev3dev2simulator.connection.message.sound_command import SoundCommand
+from ev3dev2simulator.connection.message.wait_request import WaitRequest
+from ev3dev2simulator.connection.shared_state_table import SharedStateTable
+from ev3dev2simulator.state.simulation_clock import SimulationClock
 
 from tests.ev3dev2.simulator.connection.test_ServerSocket import create_robot_sim
 
@@ -213,6 +219,90 @@ class MessageProcessorTest(unittest.TestCase):
 
         self.assertEqual(value, 10)
 
+    def test_process_time_and_wait_request(self):
+        robot_sim = create_robot_sim()
+        clock = SimulationClock(30)
+        for _ in range(60):
+            clock.tick()
+
+        message_processor = MessageProcessor(0, robot_sim, clock)
+        self.assertIsNone(message_processor.process_time_request())
+        self.assertIsNone(message_processor.process_wait_request(WaitRequest(1)))
+
+        clock.virtual = True
+        self.assertEqual(message_processor.process_time_request(), 2)
+        self.assertEqual(message_processor.process_wait_request(WaitRequest(1)), 2)
+
+    def test_process_snapshot_request(self):
+        robot_sim = create_robot_sim()
+        for address, value in (((0, 'ev3-ports:in1'), 5), ((0, 'ev3-ports:in2'), 20.5), ((1, 'ev3-ports:in1'), 7)):
+            robot_sim.robot.set_value(address, value)
+        clock = SimulationClock(30)
+        clock.tick()
+
+        message_processor = MessageProcessor(0, robot_sim, clock)
+        snapshot = message_processor.process_snapshot_request(SnapshotRequest())
+
+        # only the sensors of the brick itself
+        self.assertEqual(snapshot, {'frame': 1, 'values': {'ev3-ports:in1': 5, 'ev3-ports:in2': 20.5}})
+
+        # a frame simulated while reading the values does not make them look newer than they are
+        get_values = robot_sim.robot.get_values
+
+        def get_values_during_frame(*args):
+            values = get_values(*args)
+            clock.tick()
+            return values
+
+        robot_sim.robot.get_values = get_values_during_frame
+        self.assertEqual(message_processor.process_snapshot_request(SnapshotRequest())['frame'], 1)
+
+    def test_process_shared_state_request(self):
+        robot_sim = create_robot_sim()
+        clock = SimulationClock(30)
+
+        self.assertIsNone(MessageProcessor(0, robot_sim, clock).process_shared_state_request(SharedStateRequest()))
+
+        message_processor = MessageProcessor(0, robot_sim, clock, shared_state=True)
+        layout = message_processor.process_shared_state_request(SharedStateRequest())
+        self.assertEqual(layout['addresses'], ['ev3-ports:outA', 'ev3-ports:outD', 'ev3-ports:outB'])
+        table = SharedStateTable.attach(layout['name'], layout['addresses'])
+        self.assertEqual(table.read_with_frame('ev3-ports:outB'), (0, 0.0))
+
+        # motors hold the degrees of the last frame
+        message_processor.process_rotate_command(RotateCommand('ev3-ports:outB', 20, 100, 'hold'))
+        robot_sim.next_actuator_jobs()
+        clock.tick()
+        message_processor.publish_shared_state()
+        frame, value = table.read_with_frame('ev3-ports:outB')
+        self.assertEqual(frame, 1)
+        self.assertAlmostEqual(value, -0.667, 3)
+
+        table.close()
+        message_processor.close_shared_state()
+        self.assertIsNone(message_processor.shared_state_table)
+
+    def test_sensor_subscription(self):
+        robot_sim = create_robot_sim()
+        for address in ((0, 'ev3-ports:in1'), (0, 'ev3-ports:in2')):
+            robot_sim.robot.set_value(address, 5)
+        clock = SimulationClock(30)
+
+        message_processor = MessageProcessor(0, robot_sim, clock)
+        self.assertIsNone(message_processor.get_sensor_updates())
+
+        updates = message_processor.process_subscribe_request(SubscribeRequest(['ev3-ports:in1', 'ev3-ports:in2']))
+        self.assertEqual(updates, {'frame': 0, 'values': {'ev3-ports:in1': 5, 'ev3-ports:in2': 5}})
+
+        # only changed values are returned
+        robot_sim.robot.set_value((0, 'ev3-ports:in2'), 8)
+        clock.tick()
+        self.assertEqual(message_processor.get_sensor_updates(), {'frame': 1, 'values': {'ev3-ports:in2': 8}})
+        self.assertEqual(message_processor.get_sensor_updates(), {'frame': 1, 'values': {}})
+
+        message_processor.reset_subscription()
+        self.assertIsNone(message_processor.get_sensor_updates())
+
 
 if __name__ == '__main__':
     unittest.main()
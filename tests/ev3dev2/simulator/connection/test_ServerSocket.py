@@ -1,4 +1,7 @@
+import asyncio
 import json
+import queue
+import socket
 import threading
 import unittest
 # based on scaling_multiplier: 0.60
@@ -6,6 +9,8 @@ from typing import Any
 
 from ev3dev2simulator.config.config import get_simulation_settings, load_config
 from ev3dev2simulator.connection.client_socket_handler import ClientSocketHandler
+from ev3dev2simulator.connection.wire_protocol import BinaryProtocol, JsonProtocol
+from ev3dev2simulator.state.simulation_clock import SimulationClock
 from ev3dev2simulator.state.robot_simulator import RobotState, RobotSimulator
 
 load_config(None)
@@ -57,6 +62,29 @@ def create_client_socket_handler():
     return ClientSocketHandler(robot_sim, 0, 'left_brick')
 
 
+def handle_in_background(handler: ClientSocketHandler) -> (socket.socket, threading.Thread):
+    """
+    Let the given handler handle a connection in an event loop of its own and negotiate the binary protocol.
+    :return: the socket of the client and the thread running the event loop.
+    """
+    client, server_client = socket.socketpair()
+
+    async def handle():
+        loop = asyncio.get_running_loop()
+        disconnected = loop.create_future()
+        handler.on_disconnect = lambda: disconnected.set_result(True)
+        await loop.connect_accepted_socket(lambda: handler, sock=server_client)
+        await disconnected
+
+    thread = threading.Thread(target=asyncio.run, args=(handle(),), daemon=True)
+    thread.start()
+
+    json_protocol = JsonProtocol()
+    client.sendall(json_protocol.encode_message({'type': 'ProtocolRequest', 'protocols': ['binary']}))
+    assert json_protocol.receive_response(client) == (0, 'binary')
+    return client, thread
+
+
 class ServerSocketTest(unittest.TestCase):
 
     def test_process_drive_command_degrees(self):
@@ -139,6 +167,80 @@ class ServerSocketTest(unittest.TestCase):
 
         self.assertEqual(val, 10)
 
+    def test_process_protocol_request(self):
+        d = {
+            'type': 'ProtocolRequest',
+            'protocols': ['unknown', 'binary', 'json']
+        }
+
+        server = create_client_socket_handler()
+        data = server.process(d)
+
+        # the response is still in JSON, after it the negotiated protocol is used
+        self.assertEqual(self._deserialize(data), 'binary')
+        self.assertEqual(server.message_handler.protocol.name, 'binary')
+
+        data = server.process({'type': 'RotateCommand', 'address': 'ev3-ports:outA', 'speed': 10.0,
+                               'distance': 100.0, 'stop_action': 'hold'})
+        self.assertEqual(server.message_handler.protocol.decode_response(data), 10)
+
+    def test_answer_out_of_order(self):
+        clock = SimulationClock(30, virtual=True)
+        server = ClientSocketHandler(create_robot_sim(), 0, 'left_brick', clock)
+        client, thread = handle_in_background(server)
+
+        protocol = BinaryProtocol()
+        client.sendall(protocol.encode_message({'type': 'WaitRequest', 'until': 1.0}, 1))
+        client.sendall(protocol.encode_message({'type': 'TimeRequest'}, 2))
+
+        # the time request is answered while the wait request waits for the next frame
+        self.assertEqual(protocol.receive_response(client), (2, 0.0))
+        clock.tick()
+        self.assertEqual(protocol.receive_response(client), (1, 0.033333))
+
+        client.close()
+        thread.join()
+        self.assertFalse(server.is_connected)
+
+    def test_commands_are_queued(self):
+        command_queue = queue.SimpleQueue()
+        server = ClientSocketHandler(create_robot_sim(), 0, 'left_brick', command_queue=command_queue)
+        client, thread = handle_in_background(server)
+
+        protocol = BinaryProtocol()
+        client.sendall(protocol.encode_message({'type': 'RotateCommand', 'address': 'ev3-ports:outB', 'speed': 10.0,
+                                                'distance': 100.0, 'stop_action': 'hold'}, 1))
+        self.assertEqual(protocol.receive_response(client), (1, 10))
+
+        # the motor only moves once the thread simulating the world executed the command
+        def motor_job():
+            return [i[1] for i in server.robot_sim.next_actuator_jobs() if i[0] == (0, 'ev3-ports:outB')][0]
+        self.assertIsNone(motor_job())
+        command_queue.get_nowait()()
+        self.assertIsNotNone(motor_job())
+
+        client.close()
+        thread.join()
+
+    def test_push_sensor_updates(self):
+        clock = SimulationClock(30, virtual=True)
+        server = ClientSocketHandler(create_robot_sim(), 0, 'left_brick', clock)
+        server.robot_sim.robot.set_value((0, 'ev3-ports:in1'), 5)
+        client, thread = handle_in_background(server)
+
+        protocol = BinaryProtocol()
+        client.sendall(protocol.encode_message({'type': 'SubscribeRequest', 'addresses': ['ev3-ports:in1']}, 1))
+        self.assertEqual(protocol.receive_response(client), (1, {'frame': 0, 'values': {'ev3-ports:in1': 5}}))
+
+        # a changed value is pushed at the end of the next frame
+        server.robot_sim.robot.set_value((0, 'ev3-ports:in1'), 7)
+        clock.tick()
+        clock.tick()
+        self.assertEqual(protocol.receive_response(client), (0, {'frame': 1, 'values': {'ev3-ports:in1': 7}}))
+
+        client.close()
+        thread.join()
+
     @staticmethod
     def _deserialize(data: bytes) -> Any:
         """
@@ -1,9 +1,102 @@
+import socket
+import time
 import unittest
 
+from ev3dev2simulator.config.config import load_config, get_world_config
+from ev3dev2simulator.connection.message.hello_request import HelloRequest
+from ev3dev2simulator.connection.message.time_request import TimeRequest
+from ev3dev2simulator.connection.server_sockets import ServerSockets
+from ev3dev2simulator.connection.wire_protocol import JsonProtocol
+from ev3dev2simulator.headless_runner import HeadlessRunner
+from ev3dev2simulator.state.world_simulator import WorldSimulator
+from ev3dev2simulator.state.world_state import WorldState
 
-class ServerSockets(unittest.TestCase):
-    def test_something(self):
-        self.assertEqual(True, True)
+
+def wait_until(predicate, timeout: float = 5) -> bool:
+    deadline = time.perf_counter() + timeout
+    while not predicate():
+        if time.perf_counter() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class TestServerSockets(unittest.TestCase):
+
+    def start_server(self, world: str) -> ServerSockets:
+        load_config(world)
+        world_state = WorldState(get_world_config())
+        self.world_simulator = WorldSimulator(world_state)
+        HeadlessRunner(self.world_simulator, world_state).setup()
+
+        server = ServerSockets(self.world_simulator, port=0)
+        server.daemon = True
+        server.start()
+        server.is_listening.wait()
+        return server
+
+    def connect(self, server: ServerSockets, hello: HelloRequest = None) -> (socket.socket, bool):
+        """
+        Connect a brick, saying hello if given, and wait until the simulator handles its requests.
+        :return: the socket and whether the simulator accepted the hello.
+        """
+        client = socket.create_connection(('localhost', server.port))
+        client.settimeout(5)
+        self.addCleanup(client.close)
+        protocol = JsonProtocol()
+        accepted = True
+        if hello is not None:
+            client.sendall(protocol.encode_message(hello.serialize()))
+            _, accepted = protocol.receive_response(client)
+        if accepted:
+            client.sendall(protocol.encode_message(TimeRequest().serialize()))
+            self.assertEqual(protocol.receive_response(client), (0, None))
+        return client, accepted
+
+    def test_bricks_connect_in_any_order(self):
+        server = self.start_server('config_large')
+        left = server.brick_sockets[('robot0', 'brick-left')]
+        right = server.brick_sockets[('robot0', 'brick-right')]
+
+        self.connect(server, HelloRequest('robot0', 'brick-right'))
+        self.assertTrue(right.is_connected)
+        self.assertFalse(left.is_connected)
+
+        self.connect(server, HelloRequest(None, 'brick-left'))
+        self.assertTrue(left.is_connected)
+
+        # a brick can only be connected once
+        _, accepted = self.connect(server, HelloRequest('robot0', 'brick-left'))
+        self.assertFalse(accepted)
+
+    def test_resume_without_reset(self):
+        server = self.start_server('config_small')
+        server.resume_timeout = 10
+        brick = server.brick_sockets[('robot0', 'brick1')]
+
+        # a brick without hello gets the first brick that is not connected
+        client, _ = self.connect(server)
+        self.assertTrue(brick.is_connected)
+        client.close()
+        self.assertTrue(wait_until(lambda: server.pending_reset is not None))
+
+        # the brick resumes within the timeout, so the world is not reset
+        client, _ = self.connect(server, HelloRequest('robot0', 'brick1', resume=True))
+        self.assertIsNone(server.pending_reset)
+        self.assertFalse(self.world_simulator.should_reset)
+        client.close()
+        self.assertTrue(wait_until(lambda: server.pending_reset is not None))
+
+        # a new run only starts once the world has been reset
+        client = socket.create_connection(('localhost', server.port))
+        client.settimeout(5)
+        self.addCleanup(client.close)
+        protocol = JsonProtocol()
+        client.sendall(protocol.encode_message(TimeRequest().serialize()))
+        self.assertTrue(wait_until(lambda: self.world_simulator.should_reset))
+        self.assertIsNone(brick.transport)
+        self.world_simulator.update()
+        self.assertEqual(protocol.receive_response(client), (0, None))
 
 
 if __name__ == '__main__':
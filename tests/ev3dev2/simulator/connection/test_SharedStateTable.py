@@ -0,0 +1,58 @@
+import threading
+import unittest
+
+from ev3dev2simulator.connection.shared_state_table import SharedStateTable
+
+
+class TestSharedStateTable(unittest.TestCase):
+
+    def test_publish_and_read(self):
+        table = SharedStateTable.create(['ev3-ports:in1', 'ev3-ports:in2', 'ev3-ports:outA'])
+        reader = SharedStateTable.attach(table.name, table.addresses)
+
+        self.assertEqual(reader.read_with_frame('ev3-ports:in1'), (None, 0.0))
+
+        table.publish(3, [True, 2550, None])
+        self.assertEqual(reader.read_with_frame('ev3-ports:in1'), (3, 1.0))
+        self.assertEqual(reader.read('ev3-ports:in2'), 2550.0)
+        self.assertNotEqual(reader.read('ev3-ports:outA'), reader.read('ev3-ports:outA'))
+
+        reader.close()
+        table.close()
+
+    def test_no_torn_reads(self):
+        table = SharedStateTable.create(['ev3-ports:in1', 'ev3-ports:in2'])
+        reader = SharedStateTable.attach(table.name, table.addresses)
+        done = threading.Event()
+
+        def write():
+            for frame in range(2000):
+                table.publish(frame, [frame, -frame])
+            done.set()
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        while not done.is_set():
+            frame, value = reader.read_with_frame('ev3-ports:in2')
+            if frame is not None:
+                self.assertEqual(value, -frame)
+        writer.join()
+
+        reader.close()
+        table.close()
+
+
+    def test_writer_stopped_while_writing(self):
+        table = SharedStateTable.create(['ev3-ports:in1'])
+        reader = SharedStateTable.attach(table.name, table.addresses)
+
+        # the sequence number of a table being written is odd
+        table.HEADER.pack_into(table.buf, 0, 1, 0)
+        with self.assertRaises(RuntimeError):
+            reader.read('ev3-ports:in1')
+
+        reader.close()
+        table.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import socket
+import unittest
+
+from ev3dev2simulator.config.config import load_config
+from ev3dev2simulator.connection.message.config_request import ConfigRequest
+from ev3dev2simulator.connection.message.data_request import DataRequest
+from ev3dev2simulator.connection.message.led_command import LedCommand
+from ev3dev2simulator.connection.message.rotate_command import RotateCommand
+from ev3dev2simulator.connection.message.stop_command import StopCommand
+from ev3dev2simulator.connection.message.time_request import TimeRequest
+from ev3dev2simulator.connection.message.wait_request import WaitRequest
+from ev3dev2simulator.connection.wire_protocol import BinaryProtocol, JsonProtocol, create_protocol
+
+
+class TestWireProtocol(unittest.TestCase):
+
+    def setUp(self) -> None:
+        load_config(None)
+
+    def test_binary_messages(self):
+        protocol = BinaryProtocol()
+        messages = [DataRequest('ev3-ports:in4'),
+                    DataRequest('ev3-ports:in4', with_frame=True),
+                    RotateCommand('ev3-ports:outA', 500.0, 100.5, 'coast'),
+                    StopCommand('ev3-ports:outB', -20.0, 'hold'),
+                    LedCommand('led0:green:brick-status', 0.5),
+                    TimeRequest(),
+                    WaitRequest(1.033333),
+                    ConfigRequest({'driver_name': 'lego-ev3-l-motor'}, None)]
+
+        for request_id, message in enumerate(messages):
+            data = protocol.encode_message(message.serialize(), request_id)
+            self.assertEqual(protocol.HEADER.unpack(data[:8]), (len(data) - 8, request_id))
+            self.assertEqual(protocol.decode_message(data[8:]), message.serialize())
+
+    def test_binary_message_without_opcode_values(self):
+        protocol = BinaryProtocol()
+        message = RotateCommand('ev3-ports:outA', 500.0, 100.0, 'unknown').serialize()
+
+        data = protocol.encode_message(message)
+        self.assertEqual(data[8], BinaryProtocol.OP_JSON)
+        self.assertEqual(protocol.decode_message(data[8:]), message)
+
+    def test_binary_is_smaller(self):
+        message = DataRequest('ev3-ports:in4').serialize()
+        self.assertLess(len(BinaryProtocol().encode_message(message)),
+                        len(JsonProtocol().encode_message(message)) / 10)
+
+    def test_binary_responses(self):
+        protocol = BinaryProtocol()
+        for value in (None, 15, -3, 0.0666, True, 'dev_not_connected', [1, 2, 3], 'a' * 100):
+            data = protocol.encode_response(value)
+            self.assertEqual(protocol.decode_response(data), value)
+
+    def test_receive_frames(self):
+        protocol = BinaryProtocol()
+        sender, receiver = socket.socketpair()
+        messages = [DataRequest('ev3-ports:in1').serialize(), WaitRequest(2.5).serialize()]
+
+        # frames may arrive split and joined
+        data = b''.join(protocol.encode_message(message, request_id) for request_id, message in enumerate(messages))
+        sender.sendall(data[:3])
+        sender.sendall(data[3:])
+        self.assertEqual(protocol.receive_message(receiver), (0, messages[0]))
+        self.assertEqual(protocol.receive_message(receiver), (1, messages[1]))
+
+        sender.sendall(protocol.frame(protocol.encode_response(0.25), 7))
+        self.assertEqual(protocol.receive_response(receiver), (7, 0.25))
+
+        sender.close()
+        self.assertIsNone(protocol.receive_message(receiver))
+        receiver.close()
+
+    def test_json_messages(self):
+        protocol = JsonProtocol()
+        message = StopCommand('ev3-ports:outB', 20.0, 'coast').serialize()
+
+        data = protocol.encode_message(message)
+        self.assertEqual(len(data), protocol.message_size)
+        self.assertEqual(protocol.decode_message(data), message)
+        self.assertEqual(protocol.decode_response(protocol.encode_response(0.5)), 0.5)
+
+    def test_create_protocol(self):
+        self.assertIsInstance(create_protocol('binary'), BinaryProtocol)
+        self.assertIsInstance(create_protocol('json'), JsonProtocol)
+
+
+if __name__ == '__main__':
+    unittest.main()
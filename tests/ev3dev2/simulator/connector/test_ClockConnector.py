@@ -0,0 +1,65 @@
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from ev3dev2simulator.connector.clock_connector import ClockConnector
+
+
+class ClockConnectorTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.get_client_socketPatcher = patch(
+            'ev3dev2simulator.connector.clock_connector.get_client_socket')
+        self.get_client_socketMock = self.get_client_socketPatcher.start()
+        self.addCleanup(self.get_client_socketPatcher.stop)
+
+        self.clientSocketMock = MagicMock()
+
+    def test_clock_decided_once(self):
+        self.get_client_socketMock.return_value = self.clientSocketMock
+        self.clientSocketMock.send_command.side_effect = [12.5, 12.5, 12.533333]
+
+        clock = ClockConnector()
+        self.assertEqual(clock.time(), 12.5)
+        self.assertEqual(clock.time(), 12.533333)
+        self.assertTrue(clock.is_virtual)
+        self.get_client_socketMock.assert_called_once()
+
+    def test_wall_clock_when_simulating_real_time(self):
+        self.get_client_socketMock.return_value = self.clientSocketMock
+        self.clientSocketMock.send_command.return_value = None
+
+        clock = ClockConnector()
+        before = time.time()
+        self.assertTrue(before <= clock.time() <= time.time())
+        clock.sleep(0.01)
+        self.assertFalse(clock.is_virtual)
+        self.assertEqual(len(self.clientSocketMock.mock_calls), 1)
+
+    def test_virtual_time(self):
+        self.get_client_socketMock.return_value = self.clientSocketMock
+        self.clientSocketMock.send_command.return_value = 12.5
+
+        clock = ClockConnector()
+        self.assertEqual(clock.time(), 12.5)
+        self.assertTrue(clock.is_virtual)
+
+        fn_name, args, kwargs = self.clientSocketMock.mock_calls[-1]
+        self.assertEqual(fn_name, 'send_command')
+        self.assertDictEqual(args[0].serialize(), {'type': 'TimeRequest'})
+
+    def test_virtual_sleep(self):
+        self.get_client_socketMock.return_value = self.clientSocketMock
+        # first two responses are time requests, followed by a wait request per frame
+        self.clientSocketMock.send_command.side_effect = [1.0, 1.0, 1.033333, 1.066667, 1.1]
+
+        clock = ClockConnector()
+        clock.sleep(0.1)
+
+        self.assertEqual(len(self.clientSocketMock.mock_calls), 5)
+        for _, args, _ in self.clientSocketMock.mock_calls[2:]:
+            self.assertDictEqual(args[0].serialize(), {'type': 'WaitRequest', 'until': 1.1})
+
+
+if __name__ == '__main__':
+    unittest.main()
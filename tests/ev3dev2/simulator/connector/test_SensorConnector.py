@@ -1,11 +1,12 @@
 import sys
 import unittest
-from time import sleep
 
 from unittest.mock import MagicMock, patch
 
 from ev3dev2._platform.ev3 import INPUT_2, INPUT_1
 from ev3dev2simulator.config.config import load_config
+from ev3dev2simulator.connection.shared_state_table import SharedStateTable
+from ev3dev2simulator.connector.sensor_hub import get_sensor_hub
 from ev3dev2.sensor.lego import ColorSensor, TouchSensor
 
 load_config(None)
@@ -27,8 +28,15 @@ class SensorConnectorTest(unittest.TestCase):
         self.get_device_client_socketMock.return_value = self.deviceClientSocketMock
 
         self.clientSocketMock = MagicMock()
+        self.clientSocketMock.protocol.framed = False
         self.get_client_socketMock.return_value = self.clientSocketMock
 
+        # the simulator uses the wall clock
+        self.get_clock_client_socketPatcher = patch('ev3dev2simulator.connector.clock_connector.get_client_socket')
+        self.get_clock_client_socketMock = self.get_clock_client_socketPatcher.start()
+        self.addCleanup(self.get_clock_client_socketPatcher.stop)
+        self.get_clock_client_socketMock.return_value.send_command.return_value = None
+
     def test_color_sensor(self):
         self.deviceClientSocketMock.send_command.return_value = 'ev3-ports:in2'
         self.clientSocketMock.send_command.return_value = 3
@@ -46,20 +54,24 @@ class SensorConnectorTest(unittest.TestCase):
         self.assertEqual(len(self.clientSocketMock.mock_calls), 1)
         self.assertEqual(val, val2)
 
+        # the rgb values are sensed by the simulator
+        self.clientSocketMock.send_command.return_value = [0, 255, 0]
         val = sensor.rgb
         self.assertEqual(val, (0, 216, 0))  # assumes 400 is max val, but we use 255 as max
-        self.clientSocketMock.send_command.return_value = 6
-        sleep(0.1)  # sleep to wait for cache
+        fn_name, args, kwargs = self.clientSocketMock.mock_calls[-1]
+        self.assertDictEqual(args[0].serialize(),
+                             {'type': 'ValuesRequest', 'address': 'ev3-ports:in2', 'mode': 'RGB-RAW'})
 
+        self.clientSocketMock.send_command.return_value = [255, 255, 255]
         sensor.calibrate_white()
 
-        sleep(0.1)  # sleep to wait for cache
-
-        self.clientSocketMock.send_command.return_value = 3
-        sleep(0.1)  # sleep to wait for cache
+        self.clientSocketMock.send_command.return_value = [0, 255, 0]
         val = sensor.rgb
         self.assertEqual((0, 255, 0), val)  # Now calibrated to 255
 
+        self.clientSocketMock.send_command.return_value = [40.0]
+        self.assertEqual(sensor.reflected_light_intensity, 40.0)
+
 
 
     def test_touch_sensor(self):
@@ -80,6 +92,125 @@ class SensorConnectorTest(unittest.TestCase):
         self.assertEqual(len(self.clientSocketMock.mock_calls), 1)
         self.assertEqual(val, val2)
 
+    def test_touch_sensor_bump(self):
+        self.deviceClientSocketMock.send_command.return_value = 'ev3-ports:in1'
+        # a press and a release between two checks still make a bump
+        self.clientSocketMock.send_command.side_effect = [{'frame': 5, 'events': [[3, True], [4, False]]},
+                                                          {'frame': 9, 'events': []},
+                                                          {'frame': 12, 'events': [[10, True], [12, False]]}]
+
+        sensor = TouchSensor(INPUT_1)
+        self.assertTrue(sensor.wait_for_bump(sleep_ms=0))
+        requests = [args[0].serialize() for _, args, _ in self.clientSocketMock.send_command.mock_calls]
+        self.assertEqual([request['after_frame'] for request in requests], [-1, 5, 9])
+        self.assertEqual(requests[0], {'type': 'EventsRequest', 'address': 'ev3-ports:in1', 'after_frame': -1})
+
+    def test_sensor_snapshot(self):
+        self.deviceClientSocketMock.send_command.side_effect = ['ev3-ports:in1', 'ev3-ports:in2']
+        self.clientSocketMock.protocol.framed = True
+        self.clientSocketMock.protocol.multiplexed = False
+        # the simulator does not share memory
+        self.clientSocketMock.send_command.side_effect = [None, {'frame': 10, 'values': {'ev3-ports:in1': True,
+                                                                                         'ev3-ports:in2': 5}}]
+
+        with patch('ev3dev2simulator.connector.sensor_hub.get_client_socket') as get_hub_client_socketMock, \
+                patch('ev3dev2simulator.connector.sensor_hub.THIS.SENSOR_HUB', None):
+            get_hub_client_socketMock.return_value = self.clientSocketMock
+            touch_sensor = TouchSensor(INPUT_1)
+            color_sensor = ColorSensor(INPUT_2)
+
+            self.assertEqual(touch_sensor.value(), 1)
+            self.assertEqual(color_sensor.color, 5)
+
+        # both sensors share a single snapshot
+        self.assertEqual(len(self.clientSocketMock.send_command.mock_calls), 2)
+        fn_name, args, kwargs = self.clientSocketMock.send_command.mock_calls[1]
+        self.assertDictEqual(args[0].serialize(), {'type': 'SnapshotRequest'})
+
+    def test_streamed_sensor(self):
+        self.deviceClientSocketMock.send_command.side_effect = ['ev3-ports:in1', 'ev3-ports:in2']
+        self.clientSocketMock.protocol.framed = True
+        self.clientSocketMock.protocol.multiplexed = True
+        self.clientSocketMock.send_command.side_effect = [None,
+                                                          {'frame': 10, 'values': {'ev3-ports:in1': True}},
+                                                          {'frame': 10, 'values': {'ev3-ports:in1': True,
+                                                                                   'ev3-ports:in2': 5}}]
+
+        with patch('ev3dev2simulator.connector.sensor_hub.get_client_socket') as get_hub_client_socketMock, \
+                patch('ev3dev2simulator.connector.sensor_hub.THIS.SENSOR_HUB', None):
+            get_hub_client_socketMock.return_value = self.clientSocketMock
+            touch_sensor = TouchSensor(INPUT_1)
+            color_sensor = ColorSensor(INPUT_2)
+
+            self.assertEqual(touch_sensor.value(), 1)
+            self.assertEqual(color_sensor.color, 5)
+
+            # the simulator pushes the values that changed
+            push_handler = self.clientSocketMock.start_receiver.call_args[0][0]
+            push_handler({'frame': 11, 'values': {'ev3-ports:in2': 2}})
+            self.assertEqual(color_sensor.color, 2)
+            self.assertEqual(touch_sensor.value(), 1)
+
+            # a value of an earlier frame arriving later is ignored
+            push_handler({'frame': 10, 'values': {'ev3-ports:in2': 5}})
+            self.assertEqual(color_sensor.color, 2)
+
+        # only subscribing costs a request, reading does not
+        self.assertEqual(len(self.clientSocketMock.send_command.mock_calls), 3)
+        fn_name, args, kwargs = self.clientSocketMock.send_command.mock_calls[2]
+        self.assertDictEqual(args[0].serialize(), {'type': 'SubscribeRequest',
+                                                   'addresses': ['ev3-ports:in1', 'ev3-ports:in2']})
+
+    def test_sensor_requested_with_simulator_clock(self):
+        self.deviceClientSocketMock.send_command.return_value = 'ev3-ports:in2'
+        self.clientSocketMock.protocol.framed = True
+        self.clientSocketMock.protocol.multiplexed = True
+        self.clientSocketMock.send_command.side_effect = [{'frame': 10, 'values': {'ev3-ports:in2': 5}},
+                                                          {'frame': 11, 'values': {'ev3-ports:in2': 2}}]
+        # the simulator has a virtual clock, as in lock-step mode
+        self.get_clock_client_socketMock.return_value.send_command.side_effect = [0.0, 0.333333, 0.366667]
+
+        with patch('ev3dev2simulator.connector.sensor_hub.get_client_socket') as get_hub_client_socketMock, \
+                patch('ev3dev2simulator.connector.sensor_hub.THIS.SENSOR_HUB', None), \
+                patch('ev3dev2simulator.connector.clock_connector.THIS.CLOCK_CONNECTOR', None):
+            get_hub_client_socketMock.return_value = self.clientSocketMock
+            color_sensor = ColorSensor(INPUT_2)
+
+            # every read is a request, so a program busy reading a sensor lets the simulation advance
+            self.assertEqual(color_sensor.color, 5)
+            self.assertEqual(color_sensor.color, 2)
+
+        # neither the shared state table nor a subscription is requested
+        self.clientSocketMock.start_receiver.assert_not_called()
+        for _, args, _ in self.clientSocketMock.send_command.mock_calls:
+            self.assertDictEqual(args[0].serialize(), {'type': 'SnapshotRequest'})
+
+    def test_shared_state_sensor(self):
+        self.deviceClientSocketMock.send_command.side_effect = ['ev3-ports:in1', 'ev3-ports:in2']
+        self.clientSocketMock.protocol.framed = True
+        table = SharedStateTable.create(['ev3-ports:in1', 'ev3-ports:in2', 'ev3-ports:outA'])
+        self.addCleanup(table.close)
+        table.publish(10, [True, 5, 0.0])
+        self.clientSocketMock.send_command.return_value = {'name': table.name, 'addresses': table.addresses}
+
+        with patch('ev3dev2simulator.connector.sensor_hub.get_client_socket') as get_hub_client_socketMock, \
+                patch('ev3dev2simulator.connector.sensor_hub.THIS.SENSOR_HUB', None):
+            get_hub_client_socketMock.return_value = self.clientSocketMock
+            touch_sensor = TouchSensor(INPUT_1)
+            color_sensor = ColorSensor(INPUT_2)
+
+            self.assertEqual(touch_sensor.value(), 1)
+            self.assertEqual(color_sensor.color, 5)
+
+            table.publish(11, [False, 2, 0.0])
+            self.assertEqual(touch_sensor.value(), 0)
+            self.assertEqual(color_sensor.color, 2)
+            get_sensor_hub().shared_state_table.close()
+
+        # only the table is requested, reading does not cost any request
+        self.assertEqual(len(self.clientSocketMock.send_command.mock_calls), 1)
+        self.clientSocketMock.start_receiver.assert_not_called()
+
 
 if __name__ == '__main__':
     unittest.main()
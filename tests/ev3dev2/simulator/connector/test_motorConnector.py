@@ -23,6 +23,12 @@ class MotorConnectorTest(unittest.TestCase):
         self.clientSocketMock = MagicMock()
         self.get_client_socketMock.return_value = self.clientSocketMock
 
+        # the simulator uses the wall clock
+        self.get_clock_client_socketPatcher = patch('ev3dev2simulator.connector.clock_connector.get_client_socket')
+        self.get_clock_client_socketMock = self.get_clock_client_socketPatcher.start()
+        self.addCleanup(self.get_clock_client_socketPatcher.stop)
+        self.get_clock_client_socketMock.return_value.send_command.return_value = None
+
     def test_run_timed(self):
         self.clientSocketMock.send_command.return_value = 1
         motor = Motor(OUTPUT_A)
@@ -20,17 +20,14 @@ class BorderTest(unittest.TestCase):
 
         large_board_height = 1273
         large_board_width = 1273
-        scale = 0.60
 
         border = Border.from_config(large_board_width, large_board_height, config)
-        border.create_shape(scale)
-
-        top = [(13.800000000000011, 741.0), (13.800000000000011, 750.0), (750.0, 750.0), (750.0, 741.0)]
-        right = [(741.0, 13.800000000000011), (741.0, 750.0), (750.0, 750.0), (750.0, 13.800000000000011)]
-        bottom = [(13.800000000000011, 13.799999999999997), (13.800000000000011, 22.799999999999997),
-                  (750.0, 22.799999999999997), (750.0, 13.799999999999997)]
-        left = [(13.799999999999997, 13.800000000000011), (13.799999999999997, 750.0), (22.799999999999997, 750.0),
-                (22.799999999999997, 13.800000000000011)]
+        border.create_shape()
+
+        top = [(23.0, 1235.0), (23.0, 1250.0), (1250.0, 1250.0), (1250.0, 1235.0)]
+        right = [(1235.0, 23.0), (1235.0, 1250.0), (1250.0, 1250.0), (1250.0, 23.0)]
+        bottom = [(23.0, 23.0), (23.0, 38.0), (1250.0, 38.0), (1250.0, 23.0)]
+        left = [(23.0, 23.0), (23.0, 1250.0), (38.0, 1250.0), (38.0, 23.0)]
 
         self.assertEqual(border.top_points, top)
         self.assertEqual(border.right_points, right)
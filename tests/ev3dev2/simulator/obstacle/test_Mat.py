@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from PIL import Image
+
+from ev3dev2simulator.config.config import load_config
+from ev3dev2simulator.obstacle.mat import Mat
+from ev3dev2simulator.state.world_state import WorldState
+
+
+class MatTest(unittest.TestCase):
+
+    def setUp(self):
+        load_config(None)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.image_path = os.path.join(directory.name, 'mat.png')
+
+        # a white mat of 200 by 100 pixels with a black line on the left half, 20 pixels wide
+        self.image = np.full((100, 200, 3), 255, dtype=np.uint8)
+        self.image[:, 40:60] = (0, 0, 0)
+        Image.fromarray(self.image).save(self.image_path)
+
+    def test_sample_averages_the_footprint(self):
+        # the mat is twice as large as its image and lies in the lower left corner of the board
+        mat = Mat.from_config(1000, 1000, {'image': self.image_path, 'x': 200, 'y': 100, 'width': 400, 'height': 200})
+        mat.calc_points()
+
+        self.assertTrue(mat.collided_with(100, 100))
+        self.assertFalse(mat.collided_with(500, 100))
+
+        # the center of the line, at 100 mm from the left
+        self.assertEqual(mat.sample(100, 50, 20), (1, (0, 0, 0)))
+        self.assertEqual(mat.sample(300, 50, 20), (6, (255, 255, 255)))
+
+        # half of the footprint on the line, the same as the mean of the pixels
+        _, rgb = mat.sample(120, 50, 40)
+        self.assertEqual(rgb, tuple(np.round(self.image[15:35, 50:70].mean(axis=(0, 1))).astype(int)))
+        self.assertEqual(rgb, (128, 128, 128))
+
+        # a footprint over the edge of the mat only averages the part on the mat
+        self.assertEqual(mat.sample(0, 0, 20)[1], (255, 255, 255))
+
+    def test_rows_from_bottom_to_top(self):
+        self.image[:50] = (201, 45, 57)
+        mat = Mat('mat.png', np.flipud(self.image), 100, 50, 200, 100)
+        mat.calc_points()
+
+        self.assertEqual(mat.sample(150, 90, 4), (5, (201, 45, 57)))
+        self.assertEqual(mat.sample(150, 10, 4), (6, (255, 255, 255)))
+
+    def test_color_sensor_on_mat(self):
+        motor = {'type': 'motor', 'y_offset': 0, 'brick': 0}
+        world_state = WorldState({
+            'board_width': 400,
+            'board_height': 200,
+            'board_color': [235, 235, 235],
+            'robots': [{'name': 'robot', 'center_x': 100, 'center_y': 100, 'orientation': 0, 'parts': [
+                {'name': 'brick', 'type': 'brick', 'brick': 0, 'x_offset': 0, 'y_offset': 0},
+                dict(motor, name='motor-left', x_offset=-60, port='ev3-ports:outA'),
+                dict(motor, name='motor-right', x_offset=60, port='ev3-ports:outD'),
+                {'name': 'color-sensor', 'type': 'color_sensor', 'brick': 0, 'x_offset': 0, 'y_offset': 0,
+                 'port': 'ev3-ports:in2'}]}],
+            'obstacles': [{'name': 'mat', 'type': 'mat', 'image': self.image_path}]})
+        world_state.setup_pymunk_shapes()
+        robot = world_state.robots[0]
+        address = (0, 'ev3-ports:in2')
+
+        robot.update_sensors()
+        self.assertEqual(robot.get_value(address), 1)
+        self.assertEqual(robot.get_mode_values(address, 'RGB-RAW'), [0, 0, 0])
+        self.assertEqual(robot.get_mode_values(address, 'COL-REFLECT'), [0])
+
+        robot.body.position = (300, 100)
+        robot.update_sensors()
+        self.assertEqual(robot.get_value(address), 6)
+        self.assertEqual(robot.get_mode_values(address, 'COL-REFLECT'), [100])
+        self.assertIsNone(robot.get_mode_values(address, 'US-DIST-CM'))
+
+
+if __name__ == '__main__':
+    unittest.main()
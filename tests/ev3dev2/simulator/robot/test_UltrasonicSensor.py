@@ -1,7 +1,7 @@
 import unittest
 from unittest.mock import MagicMock
 
-from pymunk import Space
+from pymunk import Body, Circle, Space
 
 from ev3dev2simulator.config.config import load_config
 from ev3dev2simulator.robotpart.ultrasonic_sensor_top import UltrasonicSensor
@@ -10,7 +10,8 @@ load_config(None)
 
 
 class TestUltraSonicSensor(unittest.TestCase):
-    def test_distance_no_obstacle(self):
+    @staticmethod
+    def create_sensor():
         config = {
             'name': 'ultrasonic-sensor-front',
             'type': 'ultrasonic_sensor',
@@ -21,13 +22,49 @@ class TestUltraSonicSensor(unittest.TestCase):
         }
         robot = MagicMock()
         us = UltrasonicSensor(config, robot)
-        us.setup_pymunk_shape(1, None)
-        us.sprite = MagicMock()
-        us.sprite.angle = 0
+        body = Body(body_type=Body.KINEMATIC)
+        body.position = (500, 500)
+        us.setup_pymunk_shape(body)
+        return us
+
+    @staticmethod
+    def create_space(x, y):
+        space = Space()
+        body = Body(body_type=Body.STATIC)
+        body.position = (x, y)
+        space.add(body, Circle(body, 30))
+        return space
+
+    def test_distance_no_obstacle(self):
+        us = self.create_sensor()
         space = Space()
         val = us.distance(space)
         self.assertEqual(val, 2550)
 
+    def test_distance_to_obstacle(self):
+        us = self.create_sensor()
+        # straight ahead, the eyes are 18 to the sides of the sensor at 408.5, the obstacle is hit at about 575
+        val = us.distance(self.create_space(500, 600))
+        self.assertAlmostEqual(val, 575 - 408.5 - 22.5, delta=2)
+
+    def test_cone(self):
+        us = self.create_sensor()
+        # next to the rays straight ahead, but within a cone of 20 degrees
+        space = self.create_space(570, 900)
+        self.assertEqual(us.distance(space), 2550)
+
+        us.cone_angle = 20
+        us.rays = 5
+        self.assertLess(us.distance(space), 500)
+
+    def test_rays_end_at_the_board(self):
+        us = self.create_sensor()
+        space = self.create_space(500, 1500)
+        self.assertLess(us.distance(space), 2550)
+
+        us.set_board_size(1000, 1000)
+        self.assertEqual(us.distance(space), 2550)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,52 @@
+import random
+import unittest
+
+from ev3dev2simulator.config.config import load_config, get_world_config
+from ev3dev2simulator.state.color_map import ColorMap, UNKNOWN
+from ev3dev2simulator.state.world_state import WorldState
+
+
+class TestColorMap(unittest.TestCase):
+
+    @staticmethod
+    def color_obstacles(world: str):
+        load_config(world)
+        world_state = WorldState(get_world_config())
+        for obstacle in world_state.static_obstacles:
+            obstacle.calc_points()
+        return world_state
+
+    @staticmethod
+    def expected_obstacle(obstacles, x, y):
+        for obstacle in obstacles:
+            if obstacle.collided_with(x, y):
+                return obstacle
+        return None
+
+    def test_same_obstacles_as_checking_obstacles(self):
+        rand = random.Random(3)
+        for world, cell_size in [('config_small', 1), ('config_large', 3.7), ('config_large', 0.6)]:
+            world_state = self.color_obstacles(world)
+            width, height = world_state.board_width, world_state.board_height
+            color_map = ColorMap(world_state.color_obstacles, width, height, cell_size)
+
+            # random points, points on the corners of the cells and points off the board
+            points = [(rand.uniform(-10, width + 10), rand.uniform(-10, height + 10)) for _ in range(20000)]
+            points += [(column * cell_size, row * cell_size) for column in range(0, 400, 7) for row in range(0, 300, 3)]
+            for x, y in points:
+                self.assertIs(color_map.get_obstacle(x, y),
+                              self.expected_obstacle(world_state.color_obstacles, x, y), (world, x, y))
+
+    def test_most_cells_have_a_single_obstacle(self):
+        world_state = self.color_obstacles('config_large')
+        color_map = ColorMap(world_state.color_obstacles, world_state.board_width, world_state.board_height, 1)
+
+        self.assertIs(color_map.obstacles[color_map.lookup(100.5, 100.5)], world_state.color_obstacles[-1])
+        self.assertEqual(color_map.lookup(-1, 100), UNKNOWN)
+        self.assertLess(sum(color_map.lookup(x + 0.5, y + 0.5) == UNKNOWN
+                            for x in range(0, world_state.board_width, 10)
+                            for y in range(0, world_state.board_height, 10)), 1000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import math
+import random
+import unittest
+
+import numpy as np
+import pymunk
+
+from ev3dev2simulator.state.distance_field import DistanceField, signed_distance
+from ev3dev2simulator.util.util import distance_between_points
+
+
+class TestDistanceField(unittest.TestCase):
+
+    def shapes(self, rand: random.Random):
+        space = self.space = pymunk.Space()
+        shapes = []
+        for _ in range(30):
+            body = pymunk.Body(body_type=pymunk.Body.KINEMATIC)
+            body.position = (rand.uniform(0, 1000), rand.uniform(0, 600))
+            body.angle = rand.uniform(0, 2 * math.pi)
+            kind = rand.randrange(3)
+            if kind == 0:
+                shape = pymunk.Circle(body, rand.uniform(2, 40))
+            elif kind == 1:
+                shape = pymunk.Segment(body, (-rand.uniform(5, 50), 0), (rand.uniform(5, 50), 0), rand.uniform(0, 5))
+            else:
+                shape = pymunk.Poly.create_box(body, (rand.uniform(2, 80), rand.uniform(2, 80)))
+            space.add(body, shape)
+            shapes.append(shape)
+        space.reindex_static()
+        return shapes
+
+    @staticmethod
+    def expected_hit(shapes, start, end):
+        hits = [distance_between_points(start[0], start[1], query.point.x, query.point.y)
+                for query in (shape.segment_query(start, end, 1) for shape in shapes) if query.shape is not None]
+        return min(hits) if hits else None
+
+    def test_same_hits_as_checking_shapes(self):
+        rand = random.Random(5)
+        for cell_size in (1, 5, 13.3):
+            shapes = self.shapes(rand)
+            field = DistanceField(shapes, 1000, 600, cell_size)
+
+            for _ in range(2000):
+                start = (rand.uniform(-20, 1020), rand.uniform(-20, 620))
+                angle = rand.uniform(0, 2 * math.pi)
+                length = rand.uniform(0, 1500)
+                end = (start[0] + length * math.cos(angle), start[1] + length * math.sin(angle))
+
+                expected = self.expected_hit(shapes, start, end)
+                hit = field.trace(start, end)
+                if expected is None:
+                    self.assertIsNone(hit, (cell_size, start, end))
+                else:
+                    self.assertAlmostEqual(hit, expected, 6, (cell_size, start, end))
+
+    def test_invalidate_after_moving_a_shape(self):
+        body = pymunk.Body(body_type=pymunk.Body.KINEMATIC)
+        body.position = (100, 50)
+        shape = pymunk.Circle(body, 10)
+        space = pymunk.Space()
+        space.add(body, shape)
+        field = DistanceField([shape], 200, 100, 5)
+        self.assertAlmostEqual(field.trace((0, 50), (200, 50)), 90)
+
+        body.position = (150, 50)
+        space.reindex_shape(shape)
+        field.invalidate()
+        self.assertAlmostEqual(field.trace((0, 50), (200, 50)), 140)
+        self.assertIsNone(field.trace((0, 10), (200, 10)))
+
+    def test_signed_distance(self):
+        body = pymunk.Body(body_type=pymunk.Body.KINEMATIC)
+        body.position = (50, 50)
+        body.angle = math.pi / 4
+        box = pymunk.Poly.create_box(body, (20, 20))
+        space = pymunk.Space()
+        space.add(body, box)
+
+        xs = np.array([50, 55, 50 + 10 * math.sqrt(2), 80])
+        distances = signed_distance(box, xs, np.full(4, 50))
+        np.testing.assert_allclose(distances, [-10, -10 + 5 / math.sqrt(2), 0, 30 - 10 * math.sqrt(2)],
+                                   atol=1e-9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import random
+import unittest
+
+from ev3dev2simulator.config.config import load_config, get_world_config
+from ev3dev2simulator.state.world_state import WorldState
+
+
+class TestFloorIndex(unittest.TestCase):
+
+    def tearDown(self):
+        load_config(None)
+
+    def test_same_obstacles_as_checking_obstacles(self):
+        rand = random.Random(4)
+        for world in ('config_small', 'config_large'):
+            load_config(world)
+            world_state = WorldState(get_world_config())
+            world_state.setup_pymunk_shapes()
+            floor_index = world_state.floor_index
+            self.assertGreater(len(floor_index.indexed), 1, world)
+
+            width, height = world_state.board_width, world_state.board_height
+            for _ in range(5000):
+                x, y = rand.uniform(-10, width + 10), rand.uniform(-10, height + 10)
+                for obstacles in (world_state.falling_obstacles, world_state.color_obstacles):
+                    expected = [obstacle for obstacle in obstacles if obstacle.collided_with(x, y)]
+                    near = floor_index.get_near_obstacles(x, y, obstacles)
+                    self.assertEqual([obstacle for obstacle in near if obstacle.collided_with(x, y)], expected,
+                                     (world, x, y))
+
+    def test_far_obstacles_are_left_out(self):
+        load_config('config_large')
+        world_state = WorldState(get_world_config())
+        world_state.setup_pymunk_shapes()
+
+        # in the middle of the board only the obstacles without shapes, such as the board itself, are near
+        x, y = world_state.board_width / 2, world_state.board_height / 2
+        near = world_state.floor_index.get_near_obstacles(x, y, world_state.falling_obstacles)
+        self.assertEqual(near, [obstacle for obstacle in world_state.falling_obstacles
+                                if obstacle not in world_state.floor_index.indexed])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import threading
+import unittest
+
+from ev3dev2simulator.state.lock_step import LockStep
+
+
+class TestLockStep(unittest.TestCase):
+
+    def test_no_bricks_connected(self):
+        lock_step = LockStep(2)
+        self.assertFalse(lock_step.start_frame(0))
+
+    def test_acknowledge_by_requests(self):
+        lock_step = LockStep(2)
+        lock_step.connect('brick')
+        self.assertFalse(lock_step.start_frame(0))
+
+        lock_step.start_request('brick')
+        lock_step.end_request('brick')
+        self.assertFalse(lock_step.start_frame(0))
+
+        lock_step.start_request('brick')
+        # the brick is still processing its last request of the frame
+        self.assertFalse(lock_step.start_frame(0))
+        lock_step.end_request('brick')
+        self.assertTrue(lock_step.start_frame(0))
+
+        # the third request is only processed in the next frame
+        requested = threading.Event()
+        requester = threading.Thread(target=lambda: (lock_step.start_request('brick'), requested.set()))
+        requester.start()
+        self.assertFalse(requested.wait(0.05))
+
+        lock_step.end_frame()
+        self.assertTrue(requested.wait(1))
+        requester.join()
+        self.assertEqual(lock_step.requests['brick'], 1)
+
+    def test_acknowledge_by_waiting(self):
+        lock_step = LockStep(2)
+        lock_step.connect('brick1')
+        lock_step.connect('brick2')
+
+        waiter = threading.Thread(target=lock_step.wait_for_next_frame, args=('brick1',))
+        waiter.start()
+        # brick2 did not acknowledge the frame yet
+        self.assertFalse(lock_step.start_frame(0.05))
+
+        lock_step.disconnect('brick2')
+        self.assertTrue(lock_step.start_frame(1))
+        lock_step.end_frame()
+        waiter.join(1)
+        self.assertFalse(waiter.is_alive())
+        self.assertEqual(lock_step.frame, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+
+from ev3dev2simulator.state.motion_segment import MotionSegment
+
+
+def _coast_jobs(job, frames, coasting_sub):
+    """
+    The coasting jobs as they were put in the job queue one by one.
+    """
+    jobs = []
+    for _ in range(frames):
+        if job > 0:
+            job = max(job - coasting_sub, 0)
+        else:
+            job = min(job + coasting_sub, 0)
+        jobs.append(job)
+    return jobs
+
+
+def _all_jobs(segment):
+    jobs = []
+    while not segment.is_done():
+        jobs.append(segment.next_job())
+    return jobs
+
+
+class TestMotionSegment(unittest.TestCase):
+
+    def test_constant_jobs(self):
+        segment = MotionSegment(1.5, 3)
+        self.assertEqual(_all_jobs(segment), [1.5, 1.5, 1.5])
+        self.assertIsNone(segment.next_job())
+
+    def test_coasting_identical_to_queue(self):
+        for job, coasting_sub in ((0.6666666, 0.0157), (-0.43333, 0.0157), (-2.2, 0.3)):
+            segment = MotionSegment(job, 2, 12, coasting_sub)
+            self.assertEqual(_all_jobs(segment), [job, job] + _coast_jobs(job, 12, coasting_sub))
+
+    def test_stop_without_frames(self):
+        segment = MotionSegment(0, 0, 0, 0.1)
+        self.assertTrue(segment.is_done())
+        self.assertIsNone(segment.next_job())
+
+    def test_message_jobs(self):
+        segment = MotionSegment('Hello', 2)
+        self.assertEqual(_all_jobs(segment), ['Hello', 'Hello'])
+
+
+if __name__ == '__main__':
+    unittest.main()
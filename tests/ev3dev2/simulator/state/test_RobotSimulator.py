@@ -1,5 +1,4 @@
 import unittest
-from unittest.mock import MagicMock
 
 from ev3dev2simulator.state.robot_simulator import RobotSimulator
 from ev3dev2simulator.state.robot_state import RobotState
@@ -10,15 +9,13 @@ class TestRobotSimulator(unittest.TestCase):
     def test_constructor_and_reset(self):
         conf = TestRobotState.default_config()
         state = RobotState(conf)
-        state.setup_pymunk_shapes(1)
+        state.setup_pymunk_shapes()
         for arm in state.side_bar_sprites:
             arm.rotate_x = 0  # this is set in setup visuals
             arm.rotate_y = 0  # this is set in setup visuals
         sim = RobotSimulator(state)
-        sim._sync_physics_sprites = MagicMock()
         sim.update()
 
-        sim._sync_physics_sprites.assert_called_once()
         sim.should_reset = True
         self.assertEqual(sim.should_reset, True)
         sim.reset()
@@ -28,12 +25,11 @@ class TestRobotSimulator(unittest.TestCase):
     def test_get_value_and_locks(self):
         conf = TestRobotState.default_config()
         state = RobotState(conf)
-        state.setup_pymunk_shapes(1)
+        state.setup_pymunk_shapes()
         for arm in state.side_bar_sprites:
             arm.rotate_x = 0  # this is set in setup visuals
             arm.rotate_y = 0  # this is set in setup visuals
         sim = RobotSimulator(state)
-        sim._sync_physics_sprites = MagicMock()
         val = sim.get_value((0, 'ev3-ports:in4'))
         self.assertEqual(val, 2550)
         self.assertEqual(sim.locks[(0, 'ev3-ports:in4')].locked(), True)
@@ -90,7 +90,7 @@ class TestRobotState(unittest.TestCase):
 
     def test_setup_pymunk_shapes(self):
         state = RobotState(self.default_config())
-        state.setup_pymunk_shapes(1)
+        state.setup_pymunk_shapes()
         self.assertEqual(state.wheel_distance, 120)
         self.assertEqual(state.body.angle, pi)
 
@@ -101,16 +101,16 @@ class TestRobotState(unittest.TestCase):
             'type': 'type_that_does_not_exist',
         })
         state = RobotState(config_with_one_wheel)
-        self.assertRaises(RuntimeError, state.setup_pymunk_shapes, 1)
+        self.assertRaises(RuntimeError, state.setup_pymunk_shapes)
 
     def test_reset(self):
         state = RobotState(self.default_config())
-        state.setup_pymunk_shapes(1)
+        state.setup_pymunk_shapes()
         for arm in state.side_bar_sprites:
             arm.rotate_x = 0  # this is set in setup visuals
             arm.rotate_y = 0  # this is set in setup visuals
-        x = state._get_orig_position().x * state.scale
-        y = state._get_orig_position().y * state.scale
+        x = state._get_orig_position().x
+        y = state._get_orig_position().y
         state.body.position = Vec2d(5, 5)  # 5 per sec
         state._move_position(Vec2d(5, 5))
         self.assertEqual(state.body.position, Vec2d(5, 5))
@@ -121,9 +121,14 @@ class TestRobotState(unittest.TestCase):
         self.assertEqual(state.body.position, Vec2d(x, y))
         self.assertEqual(state.body.velocity, Vec2d(0, 0))
 
+        # the sensors can still be read and updated after a reset
+        address = (0, 'ev3-ports:in4')
+        self.assertEqual(state.get_value(address), state.get_sensor(address).get_default_value())
+        state.update_sensors()
+
     def test_execute_movement(self):
         state = RobotState(self.default_config())
-        state.setup_pymunk_shapes(1)
+        state.setup_pymunk_shapes()
         for arm in state.side_bar_sprites:
             arm.rotate_x = 0  # this is set in setup visuals
             arm.rotate_y = 0  # this is set in setup visuals
@@ -146,7 +151,7 @@ class TestRobotState(unittest.TestCase):
         with patch('ev3dev2simulator.robotpart.arm.ArmLarge') as ArmLargeMock:
             arm_instance = ArmLargeMock.return_value
             state = RobotState(self.default_config())
-            state.setup_pymunk_shapes(1)
+            state.setup_pymunk_shapes()
 
             state.execute_arm_movement((0, 'ev3-ports:outB'), 15)
             state.actuators[(0, 'ev3-ports:outB')].side_bar_arm.degrees = 15
@@ -177,7 +182,7 @@ class TestRobotState(unittest.TestCase):
             'port': 'ev3-ports:in3'
         })
         state = RobotState(config)
-        state.setup_pymunk_shapes(1)
+        state.setup_pymunk_shapes()
         for arm in state.side_bar_sprites:
             arm.rotate_x = 0  # this is set in setup visuals
 
@@ -195,7 +200,7 @@ class TestRobotState(unittest.TestCase):
 
     def test_setters_getters(self):
         state = RobotState(self.default_config())
-        state.setup_pymunk_shapes(1)
+        state.setup_pymunk_shapes()
 
         self.assertEqual(state.get_sensor((0, 'ev3-ports:in4')).get_ev3type(), 'ultrasonic_sensor')
         self.assertEqual(len(state.get_sensors()), 1)
@@ -203,6 +208,67 @@ class TestRobotState(unittest.TestCase):
         del state.bricks[0]
         self.assertEqual(state.get_anchor(), None)
 
+    def test_sensors_are_evaluated_when_read(self):
+        state = RobotState(self.default_config())
+        state.setup_pymunk_shapes()
+        address = (0, 'ev3-ports:in4')
+        sensor = state.get_sensor(address)
+        sensor.get_latest_value = MagicMock(return_value=20)
+
+        # sensors keep their default value until the first frame
+        self.assertEqual(state.get_value(address), sensor.get_default_value())
+
+        # a sensor is not evaluated until it is read, and only once in a frame
+        state.update_sensors()
+        sensor.get_latest_value.assert_not_called()
+        snapshot = state.sensor_snapshot
+        self.assertEqual(state.get_value(address), 20)
+        self.assertEqual(state.get_values(), {address: 20})
+        self.assertEqual(sensor.get_latest_value.call_count, 1)
+
+        # the value is published in a new snapshot, only the read evaluating the sensor took the lock
+        self.assertEqual(snapshot.values[address], sensor.get_default_value())
+        self.assertEqual(state.sensor_snapshot.frames[address], 1)
+        self.assertEqual(state.evaluating_reads, 1)
+        with self.assertRaises(TypeError):
+            state.sensor_snapshot.values[address] = 30
+
+        state.update_sensors()
+        state.update_sensors()
+        self.assertEqual(state.get_values(0), {address: 20})
+        self.assertEqual(state.get_values(1), {})
+        self.assertEqual(sensor.get_latest_value.call_count, 2)
+
+        # eager sensors are evaluated every frame
+        state.eager_sensors = True
+        state.update_sensors()
+        state.update_sensors()
+        self.assertEqual(sensor.get_latest_value.call_count, 4)
+
+    def test_sample_rate(self):
+        config = self.default_config()
+        config['parts'][-1]['sample_rate_hz'] = 10
+        config['parts'].append(dict(config['parts'][-1], port='ev3-ports:in3', sample_rate_hz=10))
+        first = RobotState(config)
+        second = RobotState(config)
+        self.assertEqual(second.stagger_sensors(first.stagger_sensors(0)), 4)
+
+        # at 30 frames per second the sensors take a sample every third frame, each in a different frame
+        first.setup_pymunk_shapes()
+        sampled = {address: [] for address in first.sensors}
+        for address, sensor in first.sensors.items():
+            sensor.get_latest_value = MagicMock(side_effect=lambda: first.frame * 10)
+
+        for _ in range(6):
+            first.update_sensors()
+            for address in first.sensors:
+                frame, value = first.get_sample(address)
+                self.assertEqual(value, frame * 10 if frame else first.sensors[address].get_default_value())
+                sampled[address].append(frame)
+
+        self.assertEqual(sampled, {(0, 'ev3-ports:in4'): [0, 0, 3, 3, 3, 6],
+                                   (0, 'ev3-ports:in3'): [1, 1, 1, 4, 4, 4]})
+
 
 if __name__ == '__main__':
     unittest.main()
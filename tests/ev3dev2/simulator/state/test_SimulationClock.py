@@ -0,0 +1,50 @@
+import threading
+import unittest
+
+from ev3dev2simulator.state.simulation_clock import SimulationClock
+
+
+class TestSimulationClock(unittest.TestCase):
+
+    def test_tick(self):
+        clock = SimulationClock(30)
+        self.assertEqual(clock.get_time(), 0)
+        for _ in range(45):
+            clock.tick()
+        self.assertEqual(clock.frame, 45)
+        self.assertAlmostEqual(clock.get_time(), 1.5)
+
+    def test_tick_listener(self):
+        clock = SimulationClock(30)
+        frames = []
+        clock.add_tick_listener(lambda: frames.append(clock.frame))
+        clock.tick()
+        clock.tick()
+        self.assertEqual(frames, [1, 2])
+
+    def test_virtual_time(self):
+        clock = SimulationClock(30)
+        clock.tick()
+        self.assertIsNone(clock.get_virtual_time())
+
+        clock.virtual = True
+        self.assertEqual(clock.get_virtual_time(), 0.033333)
+
+    def test_wait_until_reached(self):
+        clock = SimulationClock(30, virtual=True)
+        for _ in range(30):
+            clock.tick()
+        # the time has been reached, so there is no need to wait for a frame
+        self.assertEqual(clock.wait_until(0.5, timeout=0), 1)
+
+    def test_wait_until_waits_single_frame(self):
+        clock = SimulationClock(30, virtual=True)
+        ticker = threading.Timer(0.05, clock.tick)
+        ticker.start()
+
+        self.assertEqual(clock.wait_until(1), 0.033333)
+        ticker.join()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,11 @@
+import dataclasses
 import unittest
 from unittest.mock import MagicMock
 
-from ev3dev2simulator.config.config import load_config
+from ev3dev2simulator.config.config import load_config, get_world_config
+from ev3dev2simulator.state.physics_thread import PhysicsThread
 from ev3dev2simulator.state.world_simulator import WorldSimulator
+from ev3dev2simulator.state.world_state import WorldState
 
 load_config(None)
 
@@ -21,6 +24,86 @@ class TestWorldSimulator(unittest.TestCase):
         world_simulator.update()
         self.assertEqual(world_simulator.robot_simulators[0].update.call_count, 1)
 
+    def test_commands_before_frame(self):
+        world_state_mock = MagicMock()
+        world_state_mock.robots = [MagicMock()]
+        world_simulator = WorldSimulator(world_state_mock)
+        world_simulator.robot_simulators[0].update = MagicMock()
+
+        executed = []
+        world_simulator.command_queue.put(lambda: executed.append(world_simulator.clock.frame))
+        world_simulator.command_queue.put(lambda: executed.append('second'))
+        world_simulator.update()
+        world_simulator.update()
+        self.assertEqual(executed, [0, 'second'])
+
+    def test_update_with_fixed_frame_time(self):
+        world_state_mock = MagicMock()
+        world_state_mock.robots = [MagicMock()]
+        world_simulator = WorldSimulator(world_state_mock)
+        world_simulator.robot_simulators[0].update = MagicMock()
+        world_simulator.physics_substeps = 2
+
+        # frames of 1/30 second are simulated as the wall time passes, independent of how often it is updated
+        self.assertEqual(world_simulator.update(0.02), 0)
+        self.assertEqual(world_simulator.update(0.02), 1)
+        self.assertEqual(world_simulator.update(0.1), 3)
+        self.assertEqual(world_simulator.clock.frame, 4)
+        self.assertEqual(world_simulator.robot_simulators[0].update.call_count, 4)
+        self.assertEqual(world_state_mock.space.step.call_count, 8)
+        world_state_mock.space.step.assert_called_with(1 / 60)
+
+        # after a long pause the simulation does not try to catch up all frames
+        self.assertEqual(world_simulator.update(2), world_simulator.max_catch_up_frames)
+        self.assertLess(world_simulator.accumulated_time, world_simulator.clock.frame_time)
+
+    def test_render_snapshot(self):
+        load_config('config_small')
+        self.addCleanup(load_config, None)
+        world_state = WorldState(get_world_config())
+        world_state.setup_pymunk_shapes()
+        world_simulator = WorldSimulator(world_state)
+        robot = world_state.robots[0]
+
+        world_simulator.update()
+        self.assertIsNone(world_simulator.render_snapshot)
+        world_simulator.enable_render_snapshots()
+        snapshot = world_simulator.render_snapshot
+        self.assertEqual(snapshot.frame, 1)
+
+        robot.body.position = (500, 300)
+        world_simulator.update()
+        self.assertEqual(world_simulator.render_snapshot.frame, 2)
+
+        # a published snapshot does not change with the world
+        robot_snapshot = world_simulator.render_snapshot.robots[0]
+        self.assertEqual(robot_snapshot.name, robot.name)
+        self.assertEqual(len(robot_snapshot.part_poses), len(robot.parts))
+        self.assertEqual(robot_snapshot.values[(0, 'ev3-ports:in2')], 6)
+        self.assertFalse(robot_snapshot.is_falling)
+        self.assertNotEqual(snapshot.robots[0].part_poses, robot_snapshot.part_poses)
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            snapshot.frame = 3
+        with self.assertRaises(TypeError):
+            robot_snapshot.values[(0, 'ev3-ports:in2')] = 1
+
+    def test_physics_thread(self):
+        world_state_mock = MagicMock()
+        world_state_mock.robots = []
+        world_simulator = WorldSimulator(world_state_mock)
+        world_simulator.clock.frame_time = 0.001
+
+        thread = PhysicsThread(world_simulator)
+        thread.start()
+        # the clock only waits a frame at a time
+        for _ in range(1000):
+            if world_simulator.clock.wait_until(0.02) >= 0.02:
+                break
+        thread.stop()
+        thread.join(1)
+        self.assertFalse(thread.is_alive())
+        self.assertGreaterEqual(world_simulator.clock.frame, 20)
+
 
 if __name__ == '__main__':
     unittest.main()
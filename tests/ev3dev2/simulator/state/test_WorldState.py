@@ -1,6 +1,10 @@
 import unittest
 
+import pymunk
+
+from ev3dev2simulator.batch_runner import RunRecorder
 from ev3dev2simulator.config.config import load_config
+from ev3dev2simulator.state.world_simulator import WorldSimulator
 from ev3dev2simulator.state.world_state import WorldState
 
 load_config(None)
@@ -86,7 +90,7 @@ class TestWorldState(unittest.TestCase):
 
     def test_reset(self):
         world_state = WorldState(self.default_config())
-        world_state.setup_pymunk_shapes(1)
+        world_state.setup_pymunk_shapes()
         bottle = world_state.obstacles[1]
         orig_pos = bottle.body.position
         bottle.body.position = (5, 5)
@@ -96,26 +100,118 @@ class TestWorldState(unittest.TestCase):
 
     def test_setup_pymunk_shapes(self):
         world_state = WorldState(self.default_config())
-        world_state.setup_pymunk_shapes(0.5)
+        world_state.setup_pymunk_shapes()
         self.assertEqual(len(world_state.space.bodies), 3)  # 1 robot + 1 bottle + 1 rock
         bottle = world_state.obstacles[1]
-        self.assertEqual(bottle.body.position, (500, 150))
+        self.assertEqual(bottle.body.position, (1000, 300))
 
 
     def test_set_object_at_position_as_selected(self):
         world_state = WorldState(self.default_config())
-        world_state.setup_pymunk_shapes(0.5)
+        world_state.setup_pymunk_shapes()
         self.assertEqual(len(world_state.space.bodies), 3)  # 1 robot + 1 bottle + 1 rock
         bottle = world_state.obstacles[1]
-        self.assertEqual(bottle.body.position, (500, 150))
+        self.assertEqual(bottle.body.position, (1000, 300))
 
-        world_state.set_object_at_position_as_selected((500, 150))
+        world_state.set_object_at_position_as_selected((1000, 300))
         self.assertEqual(world_state.selected_object, bottle.body)
         world_state.unselect_object()
         self.assertEqual(world_state.selected_object, None)
         world_state.set_object_at_position_as_selected((25000, 25000))  # this should not exist
         self.assertEqual(world_state.selected_object, None)
 
+    def test_touch_sensor_contacts(self):
+        config = self.default_config()
+        config['robots'][0].update(center_x=600, center_y=600)
+        config['robots'][0]['parts'].append({'name': 'touch-sensor', 'type': 'touch_sensor', 'side': 'left',
+                                             'x_offset': 0, 'y_offset': 100, 'brick': 0, 'port': 'ev3-ports:in1'})
+        world_state = WorldState(config)
+        world_state.setup_pymunk_shapes()
+        world_simulator = WorldSimulator(world_state)
+        robot = world_state.robots[0]
+        address = (0, 'ev3-ports:in1')
+        bottle = world_state.obstacles[1]
+
+        world_simulator.update()
+        self.assertFalse(robot.get_value(address))
+
+        # the bottle is put on the sensor in the second frame and taken away in the fourth
+        bottle.body.position = robot.get_sensor(address).get_world_position()
+        world_simulator.update()
+        self.assertTrue(robot.get_value(address))
+        world_simulator.update()
+        bottle.body.position = (100, 100)
+        world_simulator.update()
+        self.assertFalse(robot.get_value(address))
+
+        self.assertEqual(robot.get_events(address, 0), {'frame': 4, 'events': [[2, True], [4, False]]})
+        self.assertEqual(robot.get_events(address, 2), {'frame': 4, 'events': [[4, False]]})
+
+    def test_touch_sensor_with_recorder(self):
+        config = self.default_config()
+        config['robots'][0].update(center_x=600, center_y=600)
+        config['robots'][0]['parts'].append({'name': 'touch-sensor', 'type': 'touch_sensor', 'side': 'left',
+                                             'x_offset': 0, 'y_offset': 100, 'brick': 0, 'port': 'ev3-ports:in1'})
+        world_state = WorldState(config)
+        world_state.setup_pymunk_shapes()
+        world_simulator = WorldSimulator(world_state)
+        recorder = RunRecorder(world_simulator, 1)
+        robot = world_state.robots[0]
+        address = (0, 'ev3-ports:in1')
+        bottle = world_state.obstacles[1]
+
+        # the robot drives forward, with the sensor in front, into the bottle 40 mm ahead of the sensor
+        bottle.body.position = robot.get_sensor(address).get_world_position() + (0, -100)
+        for _ in range(20):
+            robot.execute_movement(5, 5)
+            world_simulator.update()
+            recorder.record()
+
+        self.assertTrue(robot.get_value(address))
+        self.assertEqual([event[1] for event in robot.get_events(address, 0)['events']], [True])
+        # the recorder sees the collision of the touch sensor without taking it over
+        self.assertEqual([(collision['robot'], collision['other']) for collision in recorder.collisions],
+                         [('test_bot', 'bottle')])
+
+    def test_floor_obstacles_do_not_touch(self):
+        config = self.default_config()
+        config['robots'][0]['parts'].append({'name': 'touch-sensor', 'type': 'touch_sensor', 'side': 'left',
+                                             'x_offset': 0, 'y_offset': 100, 'brick': 0, 'port': 'ev3-ports:in1'})
+        world_state = WorldState(config)
+        world_state.setup_pymunk_shapes()
+        world_simulator = WorldSimulator(world_state)
+        robot = world_state.robots[0]
+        address = (0, 'ev3-ports:in1')
+
+        # the touch sensor lies on the border of the lake, which is a static shape of the space
+        robot.body.position += pymunk.Vec2d(397, 232 - 52) - robot.get_sensor(address).get_world_position()
+        lake = world_state.static_obstacles[2]
+        self.assertTrue(lake.collided_with(*robot.get_sensor(address).get_world_position()))
+        world_simulator.update()
+        world_simulator.update()
+        self.assertFalse(robot.get_value(address))
+        world_state.set_object_at_position_as_selected((397 - 52, 232))
+        self.assertIsNone(world_state.selected_object)
+
+    def test_fixed_rock_is_static(self):
+        config = self.default_config()
+        config['obstacles'][0]['movable'] = False
+        world_state = WorldState(config)
+        world_state.setup_pymunk_shapes()
+        rock = world_state.obstacles[0]
+        self.assertEqual(rock.body.body_type, pymunk.Body.STATIC)
+
+        # the static shape is found at the place it has been moved to by hand, and at its place after a reset
+        world_state.set_object_at_position_as_selected((825, 1050))
+        world_state.move_selected_object(-300, 0)
+        world_state.unselect_object()
+        self.assertEqual(world_state.space.point_query_nearest((525, 1050), 0, pymunk.ShapeFilter()).shape,
+                         rock.shape)
+        self.assertIsNone(world_state.space.point_query_nearest((825, 1050), 0, pymunk.ShapeFilter()))
+        world_state.reset()
+        self.assertEqual(world_state.space.point_query_nearest((825, 1050), 0, pymunk.ShapeFilter()).shape,
+                         rock.shape)
+
 
 
 
@@ -0,0 +1,100 @@
+import json
+import os
+import tempfile
+import textwrap
+import unittest
+
+from ev3dev2simulator.batch_runner import parse_args, simulate, write_report
+
+
+class TestBatchRunner(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def _write_program(self, source: str) -> str:
+        path = os.path.join(self.directory.name, 'program.py')
+        with open(path, 'w') as program:
+            program.write(textwrap.dedent(source))
+        return path
+
+    def test_parsing(self):
+        args = vars(parse_args(['-p', 'a.py', 'b.py', '-w', 'config_large', '-j', '2']))
+        self.assertEqual(args['programs'], ['a.py', 'b.py'])
+        self.assertEqual(args['worlds'], ['config_large'])
+        self.assertEqual(args['jobs'], 2)
+        self.assertEqual(args['output'], 'report.json')
+
+    def test_exit_status(self):
+        program = self._write_program("""
+            import sys
+            print('hello')
+            sys.exit(3)
+        """)
+        result = simulate(program, 'config_small', timeout=20)
+
+        self.assertEqual(result.exit_status, 3)
+        self.assertFalse(result.timed_out)
+        self.assertEqual(result.stdout, 'hello\n')
+        self.assertEqual(result.robots[0].name, 'robot0')
+        self.assertEqual((result.robots[0].x, result.robots[0].y), (250, 322.5))
+
+    def test_large_output(self):
+        program = self._write_program("""
+            for line in range(10000):
+                print(f'{line:041d}')
+        """)
+        result = simulate(program, 'config_small', timeout=20)
+
+        self.assertEqual(result.exit_status, 0, result.stderr)
+        self.assertFalse(result.timed_out)
+        self.assertEqual(len(result.stdout), 420000)
+
+    def test_drive(self):
+        program = self._write_program("""
+            from ev3dev2.motor import MoveTank, OUTPUT_A, OUTPUT_D
+            MoveTank(OUTPUT_A, OUTPUT_D).on_for_seconds(20, 20, 2)
+        """)
+        result = simulate(program, 'config_small', timeout=20, trace_period=1)
+
+        self.assertEqual(result.exit_status, 0, result.stderr)
+        self.assertGreater(result.sim_time, 2)
+        self.assertGreater(result.robots[0].y, 322.5)
+        self.assertEqual(result.robots[0].x, 250)
+        self.assertIn('0:ev3-ports:in2', result.sensor_traces['robot0'])
+
+        report = os.path.join(self.directory.name, 'report.json')
+        write_report([result], report)
+        with open(report) as file:
+            self.assertEqual(json.load(file)[0]['exit_status'], 0)
+
+    def test_max_sim_time(self):
+        program = self._write_program("""
+            from ev3dev2.motor import MoveTank, OUTPUT_A, OUTPUT_D
+            MoveTank(OUTPUT_A, OUTPUT_D).on_for_seconds(20, 20, 60)
+        """)
+        result = simulate(program, 'config_small', timeout=20, max_sim_time=1)
+
+        self.assertTrue(result.timed_out)
+        self.assertAlmostEqual(result.sim_time, 1, 1)
+
+
+    def test_busy_reading_sensor(self):
+        program = self._write_program("""
+            from ev3dev2.motor import MoveTank, OUTPUT_A, OUTPUT_D
+            from ev3dev2.sensor.lego import UltrasonicSensor
+            MoveTank(OUTPUT_A, OUTPUT_D).on(20, 20)
+            sensor = UltrasonicSensor()
+            while sensor.distance_centimeters >= 0:
+                pass
+        """)
+        result = simulate(program, 'config_small', timeout=20, max_sim_time=1)
+
+        # reading the sensor acknowledges the frames in lock-step, so the simulation does not freeze
+        self.assertTrue(result.timed_out)
+        self.assertAlmostEqual(result.sim_time, 1, 1)
+        self.assertGreater(result.robots[0].y, 322.5)
+
+if __name__ == '__main__':
+    unittest.main()
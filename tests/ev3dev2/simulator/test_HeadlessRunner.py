@@ -0,0 +1,78 @@
+import subprocess
+import sys
+import unittest
+
+from ev3dev2simulator.config.config import load_config, get_world_config
+from ev3dev2simulator.headless_runner import HeadlessRunner
+from ev3dev2simulator.state.world_simulator import WorldSimulator
+from ev3dev2simulator.state.world_state import WorldState
+
+
+class TestHeadlessRunner(unittest.TestCase):
+
+    def setUp(self) -> None:
+        load_config('config_small')
+        self.world_state = WorldState(get_world_config())
+        self.world_simulator = WorldSimulator(self.world_state)
+        self.runner = HeadlessRunner(self.world_simulator, self.world_state)
+        self.runner.frame_time = 0
+
+    def test_run_frames_without_sprites(self):
+        self.runner.setup()
+        self.runner.run(10)
+
+        robot = self.world_state.robots[0]
+        self.assertIsNone(robot.get_sprites())
+        self.assertIsNone(self.world_state.sprite_list)
+        self.assertFalse(self.runner.is_running)
+        self.assertFalse(robot.is_falling())
+
+        values = robot.get_values()
+        self.assertEqual(values[(0, 'ev3-ports:in2')], 6)  # white board below the color sensor
+        self.assertEqual(values[(0, 'ev3-ports:in3')], 2550)  # nothing in front of the ultrasonic sensor
+
+    def test_run_counts_simulated_frames(self):
+        self.runner.setup()
+        update = self.world_simulator.update
+        updates = []
+
+        def wait_every_other_update():
+            # like an update in lock-step mode waiting for the bricks to acknowledge the previous frame
+            updates.append(None)
+            return update() if len(updates) % 2 else 0
+
+        self.world_simulator.update = wait_every_other_update
+        self.runner.run(10)
+
+        self.assertEqual(len(updates), 19)
+        self.assertEqual(self.world_simulator.clock.frame, 10)
+
+    def test_sensor_positions_follow_body(self):
+        self.runner.setup()
+        robot = self.world_state.robots[0]
+        color_sensor = robot.get_sensor((0, 'ev3-ports:in2'))
+
+        robot.body.position = (500, 170 + 38 + 10 - 81)  # color sensor on the border of the blue lake
+        self.runner.run(1)
+
+        x, y = color_sensor.get_world_position()
+        self.assertAlmostEqual(x, 500)
+        self.assertAlmostEqual(y, 170 + 38 + 10)
+        self.assertEqual(robot.get_value((0, 'ev3-ports:in2')), 2)
+
+    def test_does_not_import_arcade(self):
+        code = ('import sys\n'
+                'from ev3dev2simulator.config.config import load_config, get_world_config\n'
+                'from ev3dev2simulator import simulator\n'
+                'load_config("config_small")\n'
+                'world_state = simulator.WorldState(get_world_config())\n'
+                'runner = simulator.HeadlessRunner(simulator.WorldSimulator(world_state), world_state)\n'
+                'runner.setup()\n'
+                'runner.run(2)\n'
+                'assert "arcade" not in sys.modules and "pyglet" not in sys.modules\n')
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True)
+        self.assertEqual(result.returncode, 0, result.stderr.decode())
+
+
+if __name__ == '__main__':
+    unittest.main()
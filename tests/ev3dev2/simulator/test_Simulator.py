@@ -27,7 +27,11 @@ class TestSimulator(unittest.TestCase):
                               'simulation_file': 'config_small',
                               'show_on_second_monitor': False,
                               'fullscreen': False,
-                              'maximized': False
+                              'maximized': False,
+                              'headless': False,
+                              'turbo': False,
+                              'lockstep': False,
+                              'shared_memory': False
                               })
 
     def test_single_dash_parsing(self):
@@ -37,7 +41,11 @@ class TestSimulator(unittest.TestCase):
                               'simulation_file': 'config_test',
                               'show_on_second_monitor': True,
                               'fullscreen': True,
-                              'maximized': True
+                              'maximized': True,
+                              'headless': False,
+                              'turbo': False,
+                              'lockstep': False,
+                              'shared_memory': False
                               })
 
     def test_double_dash_parsing(self):
@@ -48,7 +56,11 @@ class TestSimulator(unittest.TestCase):
                               'simulation_file': 'config_test',
                               'show_on_second_monitor': True,
                               'fullscreen': True,
-                              'maximized': True
+                              'maximized': True,
+                              'headless': False,
+                              'turbo': False,
+                              'lockstep': False,
+                              'shared_memory': False
                               })
 
     def test_main_print_version(self):
@@ -63,7 +75,7 @@ class TestSimulator(unittest.TestCase):
     def test_main(self):
         testargs = ['name']
         with patch.object(sys, 'argv', testargs):
-            with patch('ev3dev2simulator.simulator.Visualiser') as VisualiserMock:
+            with patch('ev3dev2simulator.visualisation.visualiser.Visualiser') as VisualiserMock:
                 with patch('ev3dev2simulator.simulator.ServerSockets') as serverSocketsMock:
                     sockets_instance = serverSocketsMock.return_value
                     main(None)
@@ -83,6 +95,36 @@ class TestSimulator(unittest.TestCase):
                     self.assertEqual(fn_name, 'start')
                     self.assertEqual(args, ())
 
+    def test_headless_parsing(self):
+        args = vars(parse_args(['--headless']))
+        self.assertTrue(args['headless'])
+
+    def test_main_headless(self):
+        testargs = ['name', '--headless']
+        with patch.object(sys, 'argv', testargs):
+            with patch('ev3dev2simulator.simulator.HeadlessRunner') as HeadlessRunnerMock:
+                with patch('ev3dev2simulator.simulator.ServerSockets') as serverSocketsMock:
+                    runner_instance = HeadlessRunnerMock.return_value
+                    sockets_instance = serverSocketsMock.return_value
+                    main(None)
+
+                    runner_instance.setup.assert_called_once_with()
+                    runner_instance.run.assert_called_once_with()
+                    sockets_instance.start.assert_called_once_with()
+                    self.assertTrue(sockets_instance.daemon)
+
+    def test_main_turbo(self):
+        testargs = ['name', '--turbo']
+        with patch.object(sys, 'argv', testargs):
+            with patch('ev3dev2simulator.simulator.HeadlessRunner') as HeadlessRunnerMock:
+                with patch('ev3dev2simulator.simulator.ServerSockets') as serverSocketsMock:
+                    main(None)
+
+                    world_simulator, _, turbo = HeadlessRunnerMock.call_args[0]
+                    self.assertTrue(turbo)
+                    self.assertTrue(world_simulator.clock.virtual)
+                    HeadlessRunnerMock.return_value.run.assert_called_once_with()
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,38 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from ev3dev2simulator.util.instance_checker import InstanceChecker
+
+
+class InstanceCheckerTest(unittest.TestCase):
+
+    def test_second_instance_exits(self):
+        with tempfile.TemporaryDirectory() as directory:
+            first = InstanceChecker(MagicMock(), directory)
+            first.check_for_unique_instance()
+            self.addCleanup(first.lock_file.close)
+
+            second = InstanceChecker(MagicMock(), directory)
+            with self.assertRaises(SystemExit):
+                second.check_for_unique_instance()
+            second.lock_file.close()
+
+            # the second instance wrote its pid, for the first one to activate its window
+            with open(os.path.join(directory, 'ev3dev2simulator.pid')) as pid_file:
+                self.assertEqual(pid_file.read(), str(os.getpid()))
+
+    def test_lock_released_on_exit(self):
+        with tempfile.TemporaryDirectory() as directory:
+            first = InstanceChecker(MagicMock(), directory)
+            first.check_for_unique_instance()
+            first.lock_file.close()
+
+            second = InstanceChecker(MagicMock(), directory)
+            second.check_for_unique_instance()
+            second.lock_file.close()
+
+
+if __name__ == '__main__':
+    unittest.main()